@@ -1,40 +1,717 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import JSONResponse, Response, StreamingResponse, FileResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
+from urllib.parse import urlencode
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 import random
-from emergentintegrations.llm.chat import LlmChat, UserMessage
-from emergentintegrations.payments.stripe.checkout import StripeCheckout, CheckoutSessionResponse, CheckoutStatusResponse, CheckoutSessionRequest
+import asyncio
+import hashlib
+import json
+import re
+import signal
+import copy
+import queue
+import zlib
+import math
+import time
+import itertools
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from bson import Binary
+from bson.binary import UUID_SUBTYPE
+from pymongo import monitoring, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.read_preferences import ReadPreference, Secondary, SecondaryPreferred, Nearest
+from pyroaring import BitMap
+import numpy as np
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Logging
+# Records are put on an in-memory queue by the calling code and written by a
+# QueueListener thread, so handler I/O never runs on the event loop. Each
+# record carries the request/user/task ids from log_context, sensitive values
+# (OTPs, phone numbers, passwords, tokens) are redacted before the record
+# leaves the caller, and LOG_SAMPLE_RATES (e.g. "hospitalityhub.access=0.1")
+# keeps only a fraction of a noisy logger's INFO and DEBUG records
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, _, rate in (item.partition("=") for item in os.environ.get('LOG_SAMPLE_RATES', '').split(",") if item.strip())
+}
+SENSITIVE_LOG_FIELDS = {"otp", "password", "token", "access_token", "authorization", "phone"}
+PHONE_PATTERN = re.compile(r"(?<![\w.])\+?\d[\d ]{6,12}(\d{2})(?![\w.])")
+# In text that mentions a one-time code, every standalone 4-8 digit run is
+# masked, wherever it sits ("OTP for +91...: 482913")
+SECRET_KEYWORD_PATTERN = re.compile(r"(?i)\b(otp|code|pin|passcode|password)\b")
+SECRET_DIGITS_PATTERN = re.compile(r"(?<![\w.])\d{4,8}(?![\w.])")
+# Attributes every LogRecord has; anything else came from extra={...}
+STANDARD_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id", "user_id", "task_id"}
+
+log_context: ContextVar[Optional[dict]] = ContextVar("log_context", default=None)
+
+def redact(text: str) -> str:
+    if SECRET_KEYWORD_PATTERN.search(text):
+        text = SECRET_DIGITS_PATTERN.sub("******", text)
+    return PHONE_PATTERN.sub(r"********\1", text)
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context.get() or {}
+        record.request_id = context.get("request_id")
+        record.user_id = context.get("user_id")
+        record.task_id = context.get("task_id")
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps a LOG_SAMPLE_RATES fraction of INFO/DEBUG records per logger (and its children)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
+
+class RedactingQueueHandler(QueueHandler):
+    """QueueHandler that renders and redacts the message in the caller, leaving I/O to the listener."""
+
+    exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = redact(record.getMessage())
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        for field, value in list(vars(record).items()):
+            if field in STANDARD_RECORD_FIELDS:
+                continue
+            if field in SENSITIVE_LOG_FIELDS:
+                setattr(record, field, redact(str(value)) if field == "phone" else "[REDACTED]")
+            elif isinstance(value, str):
+                setattr(record, field, redact(value))
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "user_id", "task_id"):
+            if getattr(record, field, None):
+                entry[field] = getattr(record, field)
+        entry.update({k: v for k, v in vars(record).items() if k not in STANDARD_RECORD_FIELDS})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+@contextmanager
+def queued_logging():
+    """Route the root logger (and uvicorn's) through the queue while the
+    process serves; on exit, flush and stop the listener and restore the
+    previous handlers."""
+    output = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'))
+    handler = RedactingQueueHandler(queue.SimpleQueue())
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+    root = logging.getLogger()
+    previous = root.handlers, root.level
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    # Replaced by the RequestObservabilityMiddleware access log, which carries the request id
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    try:
+        yield listener
+    finally:
+        listener.stop()
+        root.handlers, level = previous
+        root.setLevel(level)
+
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/jose and the emergentintegrations LLM/Stripe SDKs are imported on
+# first use (and warmed in lifespan) to keep module import fast for cold starts
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 security = HTTPBearer()
 
 # MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Per-server connection pool counters, exposed at /api/metrics/db-pools."""
+
+    def __init__(self):
+        self.pools: Dict[str, Dict[str, int]] = {}
+
+    def _pool(self, address) -> Dict[str, int]:
+        key = f"{address[0]}:{address[1]}"
+        if key not in self.pools:
+            self.pools[key] = {
+                "open": 0, "in_use": 0, "waiting": 0, "created": 0, "closed": 0,
+                "checkouts": 0, "checkout_failures": 0, "cleared": 0,
+            }
+        return self.pools[key]
+
+    def pool_created(self, event):
+        self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._pool(event.address)["cleared"] += 1
+
+    def pool_closed(self, event):
+        self.pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        pool = self._pool(event.address)
+        pool["created"] += 1
+        pool["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pool = self._pool(event.address)
+        pool["closed"] += 1
+        pool["open"] -= 1
+
+    def connection_check_out_started(self, event):
+        self._pool(event.address)["waiting"] += 1
+
+    def connection_check_out_failed(self, event):
+        pool = self._pool(event.address)
+        pool["waiting"] -= 1
+        pool["checkout_failures"] += 1
+
+    def connection_checked_out(self, event):
+        pool = self._pool(event.address)
+        pool["waiting"] -= 1
+        pool["in_use"] += 1
+        pool["checkouts"] += 1
+
+    def connection_checked_in(self, event):
+        self._pool(event.address)["in_use"] -= 1
+
+class DbTrace:
+    """Timings of the Mongo commands issued while serving one request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.pending: Dict[int, tuple] = {}
+        self.commands: List[tuple] = []  # (started, ended, command, collection)
+
+    def start(self, request_id: int, command_name: str, collection: Any):
+        self.pending[request_id] = (time.perf_counter(), command_name, collection if isinstance(collection, str) else None)
+
+    def finish(self, request_id: int):
+        pending = self.pending.pop(request_id, None)
+        if pending is not None:
+            started, command_name, collection = pending
+            self.commands.append((started, time.perf_counter(), command_name, collection))
+
+    def sequential_round_trips(self) -> int:
+        """Longest chain of commands where each starts after the previous ended."""
+        chain = 0
+        last_end = float("-inf")
+        for started, ended, _, _ in sorted(self.commands, key=lambda c: c[1]):
+            if started >= last_end:
+                chain += 1
+                last_end = ended
+        return chain
+
+db_trace: ContextVar[Optional[DbTrace]] = ContextVar("db_trace", default=None)
+
+class CommandTraceListener(monitoring.CommandListener):
+    """Feeds command timings into the current request's DbTrace, if any.
+
+    Motor runs commands in executor threads with a copy of the caller's
+    context, so the request's ContextVar is visible here.
+    """
+
+    def started(self, event):
+        trace = db_trace.get()
+        if trace is not None:
+            trace.start(event.request_id, event.command_name, event.command.get(event.command_name))
+
+    def succeeded(self, event):
+        trace = db_trace.get()
+        if trace is not None:
+            trace.finish(event.request_id)
+
+    def failed(self, event):
+        trace = db_trace.get()
+        if trace is not None:
+            trace.finish(event.request_id)
+
+def read_preference_from_env(name: str, default: str):
+    """Build a read preference from e.g. MONGO_PUBLIC_READ_PREFERENCE=secondaryPreferred."""
+    mode = os.environ.get(name, default)
+    max_staleness = int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', 90))
+    preferences = {
+        "primary": lambda: ReadPreference.PRIMARY,
+        "primaryPreferred": lambda: ReadPreference.PRIMARY_PREFERRED,
+        "secondary": lambda: Secondary(max_staleness=max_staleness),
+        "secondaryPreferred": lambda: SecondaryPreferred(max_staleness=max_staleness),
+        "nearest": lambda: Nearest(max_staleness=max_staleness),
+    }
+    if mode not in preferences:
+        raise ValueError(f"{name} must be one of {', '.join(preferences)}")
+    return preferences[mode]()
+
+pool_metrics = PoolMetricsListener()
+command_trace = CommandTraceListener()
+# Adds X-DB-Round-Trips / X-DB-Commands response headers (see backend_test.py)
+DB_TRACE_HEADERS = os.environ.get('DB_TRACE_HEADERS', 'false').lower() == 'true'
+
+# Storage layout
+# Timestamps are native BSON dates, and a document's UUID is stored once, as
+# a 16-byte binary _id, instead of a 36-char "id" string beside an ObjectId.
+# References to other documents (job_id, worker_id, ...) use the same binary
+# form. Handlers keep seeing the API shape: StoredDatabase encodes filters,
+# writes and projections on the way in and decodes documents on the way out.
+# While STORAGE_DUAL_READ is on, filters also match the legacy layout, until
+# `python server.py migrate-storage` has converted existing documents
+STORAGE_DUAL_READ = os.environ.get('STORAGE_DUAL_READ', 'true').lower() == 'true'
+TIMESTAMP_FIELDS = {"created_at", "updated_at", "applied_at"}
+REFERENCE_FIELDS = {"user_id", "worker_id", "restaurant_id", "job_id", "application_id"}
+# Collections whose documents carry an "id"; application_event_daily only has references
+COMPACT_COLLECTIONS = {
+    "users", "worker_profiles", "restaurant_profiles", "jobs", "applications",
+    "application_events", "reviews", "notifications", "payment_transactions", "job_alerts",
+    "worker_documents",
+}
+STORED_COLLECTIONS = COMPACT_COLLECTIONS | {"application_event_daily"}
+
+def encode_id(value):
+    if isinstance(value, str):
+        try:
+            return Binary.from_uuid(uuid.UUID(value))
+        except ValueError:
+            pass
+    return value
+
+def parse_timestamp(value):
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return value
+
+def legacy_timestamp(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def is_uuid_binary(value) -> bool:
+    return isinstance(value, Binary) and value.subtype == UUID_SUBTYPE
+
+def to_storage(doc: dict, compact: bool = True) -> dict:
+    stored = {}
+    for key, value in doc.items():
+        if key in TIMESTAMP_FIELDS:
+            value = parse_timestamp(value)
+        elif key in REFERENCE_FIELDS:
+            value = encode_id(value)
+        stored[key] = value
+    if compact and "id" in stored and "_id" not in stored:
+        return {"_id": encode_id(stored.pop("id")), **stored}
+    return stored
+
+def from_storage(value, hide_id: bool = False):
+    """Decode a stored document (or any nested value) back to the API shape."""
+    if isinstance(value, dict):
+        stored_id = value.get("_id")
+        compact = is_uuid_binary(stored_id)
+        doc = {"id": str(stored_id.as_uuid())} if compact else {}
+        for key, item in value.items():
+            if key == "_id" and (compact or hide_id):
+                continue
+            if key in TIMESTAMP_FIELDS:
+                item = parse_timestamp(item)
+            doc[key] = from_storage(item)
+        return doc
+    if isinstance(value, list):
+        return [from_storage(item) for item in value]
+    if is_uuid_binary(value):
+        return str(value.as_uuid())
+    return value
+
+def encode_condition(condition, encode, dual: bool):
+    """Apply encode to the operand(s) of a query condition; with dual, also keep the originals."""
+    def values(value):
+        encoded = encode(value)
+        return [encoded, value] if dual and encoded != value else [encoded]
+
+    if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+        encoded = {}
+        for op, operand in condition.items():
+            if op in ("$in", "$nin"):
+                encoded[op] = [v for item in operand for v in values(item)]
+            elif op == "$eq":
+                encoded["$in"] = values(operand)
+            elif op == "$ne":
+                encoded["$nin"] = values(operand)
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                encoded[op] = encode(operand)
+            else:
+                encoded[op] = operand
+        return encoded
+    candidates = values(condition)
+    return candidates[0] if len(candidates) == 1 else {"$in": candidates}
+
+def encode_filter(query: Optional[dict], compact: bool, dual: bool = None) -> dict:
+    dual = STORAGE_DUAL_READ if dual is None else dual
+    encoded, either = {}, []
+    for key, condition in (query or {}).items():
+        if key in ("$and", "$or", "$nor"):
+            encoded[key] = [encode_filter(q, compact, dual) for q in condition]
+        elif key == "id" and compact:
+            by_id = {"_id": encode_condition(condition, encode_id, False)}
+            if dual:
+                either.append([by_id, {"id": condition}])
+            else:
+                encoded.update(by_id)
+        elif key in REFERENCE_FIELDS:
+            encoded[key] = encode_condition(condition, encode_id, dual)
+        elif key in TIMESTAMP_FIELDS and dual and isinstance(condition, dict):
+            # Range over dates, or over legacy ISO strings (BSON never compares the two)
+            either.append([
+                {key: encode_condition(condition, parse_timestamp, False)},
+                {key: encode_condition(condition, legacy_timestamp, False)},
+            ])
+        elif key in TIMESTAMP_FIELDS:
+            encoded[key] = encode_condition(condition, parse_timestamp, False)
+        else:
+            encoded[key] = condition
+    if not either:
+        return encoded
+    # Each $or branch repeats the rest of the filter, so that every branch can
+    # use an index on its own (_id or the sparse legacy id index; a field's
+    # index for both date and string ranges)
+    branches = []
+    for combination in itertools.product(*either):
+        branch = dict(encoded)
+        for clause in combination:
+            if branch.keys() & clause.keys():
+                branch = {"$and": [branch, clause]}
+            else:
+                branch.update(clause)
+        branches.append(branch)
+    return {"$or": branches}
+
+def encode_projection(projection, compact: bool):
+    """Returns the stored projection and whether the caller excluded _id."""
+    if projection is None:
+        return None, False
+    projection = dict(projection)
+    hide_id = projection.get("_id", 1) in (0, False)
+    if compact and hide_id:
+        inclusion = any(v not in (0, False) for k, v in projection.items() if k != "_id")
+        if not inclusion or "id" in projection:
+            # The binary _id is the document's id
+            projection.pop("_id")
+    return projection, hide_id
+
+def encode_update(update, compact: bool, by_id: bool = False):
+    if isinstance(update, list):
+        return update
+    encoded = {}
+    for op, fields in update.items():
+        if op in ("$set", "$setOnInsert"):
+            fields = to_storage(fields, compact=False)
+            if compact and "id" in fields:
+                # An upsert keyed by id already takes its _id from the filter
+                stored_id = encode_id(fields.pop("id"))
+                if op == "$setOnInsert" and not by_id:
+                    fields["_id"] = stored_id
+        encoded[op] = fields
+    return encoded
+
+def encode_pipeline(pipeline: List[dict], compact: bool) -> List[dict]:
+    encoded = []
+    for stage in pipeline:
+        if "$match" in stage:
+            stage = {"$match": encode_filter(stage["$match"], compact)}
+        elif "$lookup" in stage and "pipeline" in stage["$lookup"]:
+            lookup = stage["$lookup"]
+            stage = {"$lookup": {**lookup, "pipeline": encode_pipeline(lookup["pipeline"], lookup["from"] in COMPACT_COLLECTIONS)}}
+        encoded.append(stage)
+    return encoded
+
+class StoredCursor:
+    def __init__(self, cursor, hide_id: bool, compact: bool):
+        self._cursor = cursor
+        self._hide_id = hide_id
+        self._compact = compact
+
+    def sort(self, key, direction=None):
+        if isinstance(key, str):
+            key = [(key, direction if direction is not None else 1)]
+        self._cursor = self._cursor.sort([("_id" if k == "id" and self._compact else k, d) for k, d in key])
+        return self
+
+    def limit(self, limit: int):
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    def skip(self, skip: int):
+        self._cursor = self._cursor.skip(skip)
+        return self
+
+    def batch_size(self, size: int):
+        self._cursor = self._cursor.batch_size(size)
+        return self
+
+    async def to_list(self, length):
+        return [from_storage(doc, self._hide_id) for doc in await self._cursor.to_list(length)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return from_storage(await self._cursor.__anext__(), self._hide_id)
+
+class StoredCollection:
+    """Motor collection wrapper translating between the API and stored document layouts."""
+
+    def __init__(self, collection):
+        self.raw = collection
+        self.compact = collection.name in COMPACT_COLLECTIONS
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def find(self, filter=None, projection=None, **kwargs):
+        projection, hide_id = encode_projection(projection, self.compact)
+        return StoredCursor(self.raw.find(encode_filter(filter, self.compact), projection, **kwargs), hide_id, self.compact)
+
+    async def find_one(self, filter=None, projection=None, **kwargs):
+        projection, hide_id = encode_projection(projection, self.compact)
+        doc = await self.raw.find_one(encode_filter(filter, self.compact), projection, **kwargs)
+        return from_storage(doc, hide_id) if doc is not None else None
+
+    async def count_documents(self, filter, **kwargs):
+        return await self.raw.count_documents(encode_filter(filter, self.compact), **kwargs)
+
+    async def insert_one(self, document: dict, **kwargs):
+        return await self.raw.insert_one(to_storage(document, self.compact), **kwargs)
+
+    async def insert_many(self, documents: List[dict], **kwargs):
+        return await self.raw.insert_many([to_storage(doc, self.compact) for doc in documents], **kwargs)
+
+    async def update_one(self, filter, update, upsert: bool = False, **kwargs):
+        # An upsert must derive the new document's _id from the filter
+        query = encode_filter(filter, self.compact, dual=False if upsert else None)
+        return await self.raw.update_one(query, encode_update(update, self.compact, "id" in filter), upsert=upsert, **kwargs)
+
+    async def find_one_and_update(self, filter, update, projection=None, upsert: bool = False, **kwargs):
+        query = encode_filter(filter, self.compact, dual=False if upsert else None)
+        projection, hide_id = encode_projection(projection, self.compact)
+        doc = await self.raw.find_one_and_update(
+            query, encode_update(update, self.compact, "id" in filter), projection=projection, upsert=upsert, **kwargs
+        )
+        return from_storage(doc, hide_id) if doc is not None else None
+
+    async def bulk_write(self, updates: List[tuple], **kwargs):
+        """Run (filter, update, upsert) tuples as one bulk write of UpdateOne operations."""
+        return await self.raw.bulk_write([
+            UpdateOne(
+                encode_filter(filter, self.compact, dual=False if upsert else None),
+                encode_update(update, self.compact, "id" in filter),
+                upsert=upsert
+            )
+            for filter, update, upsert in updates
+        ], **kwargs)
+
+    async def update_many(self, filter, update, **kwargs):
+        return await self.raw.update_many(encode_filter(filter, self.compact), encode_update(update, self.compact), **kwargs)
+
+    async def delete_one(self, filter, **kwargs):
+        return await self.raw.delete_one(encode_filter(filter, self.compact), **kwargs)
+
+    async def delete_many(self, filter, **kwargs):
+        return await self.raw.delete_many(encode_filter(filter, self.compact), **kwargs)
+
+    def aggregate(self, pipeline: List[dict], **kwargs):
+        return StoredCursor(self.raw.aggregate(encode_pipeline(pipeline, self.compact), **kwargs), False, self.compact)
+
+class StoredDatabase:
+    """Motor database wrapper; collections in STORED_COLLECTIONS use the storage layout."""
+
+    def __init__(self, database):
+        self.raw = database
+
+    def __getitem__(self, name: str):
+        return StoredCollection(self.raw[name]) if name in STORED_COLLECTIONS else self.raw[name]
+
+    def __getattr__(self, name: str):
+        return StoredCollection(self.raw[name]) if name in STORED_COLLECTIONS else getattr(self.raw, name)
+
+async def migrate_storage(names: Optional[List[str]] = None, batch_size: int = 500):
+    """Convert legacy documents to the storage layout, in _id order and resumably.
+
+    A compact collection's legacy documents are the ones whose _id is still an
+    ObjectId; each batch inserts the converted copies and deletes the
+    originals (in one transaction on a replica set). Progress is checkpointed
+    in storage_migrations, so an interrupted run picks up where it stopped.
+    application_event_daily is rebuilt from the migrated events at the end.
+    """
+    raw = db.raw
+    replica_set = "setName" in await client.admin.command("hello")
+    for name in names or sorted(COMPACT_COLLECTIONS):
+        collection = raw[name]
+        checkpoint = await raw.storage_migrations.find_one({"_id": name}) or {}
+        converted = checkpoint.get("converted", 0)
+        legacy = {"_id": {"$type": "objectId"}}
+        remaining = await collection.count_documents(legacy)
+        logging.info("%s: %s legacy documents, %s converted previously", name, remaining, converted)
+        while True:
+            query = {"_id": {"$type": "objectId", "$gt": checkpoint["last_id"]}} if checkpoint.get("last_id") else legacy
+            batch = await collection.find(query).sort("_id", 1).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+            documents = [to_storage({k: v for k, v in doc.items() if k != "_id"}) for doc in batch]
+            async with await client.start_session() as session:
+                async with (session.start_transaction() if replica_set else nullcontext()):
+                    # Skip copies left by a run interrupted between insert and delete
+                    # (standalone only); inserting them would raise a duplicate key
+                    # error, which aborts the whole transaction on a replica set
+                    new_ids = [doc["_id"] for doc in documents if "_id" in doc]
+                    existing = {
+                        doc["_id"] for doc in await collection.find(
+                            {"_id": {"$in": new_ids}}, {"_id": 1}, session=session
+                        ).to_list(None)
+                    }
+                    documents = [doc for doc in documents if doc.get("_id") not in existing]
+                    if documents:
+                        await collection.insert_many(documents, ordered=False, session=session)
+                    await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}}, session=session)
+            converted += len(batch)
+            checkpoint = {"last_id": batch[-1]["_id"], "converted": converted}
+            await raw.storage_migrations.update_one(
+                {"_id": name},
+                {"$set": {**checkpoint, "updated_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+            logging.info("%s: %s converted, %s remaining", name, converted, max(remaining - len(batch), 0))
+            remaining -= len(batch)
+        await raw.storage_migrations.update_one(
+            {"_id": name}, {"$set": {"completed_at": datetime.now(timezone.utc)}}, upsert=True
+        )
+
+    if not names or "application_events" in names:
+        buckets = await raw.application_events.aggregate([
+            {"$group": {"_id": {"job_id": "$job_id", "day": "$day"}}}
+        ]).to_list(None)
+        for bucket in buckets:
+            await refresh_application_rollup(from_storage(bucket["_id"]["job_id"]), bucket["_id"]["day"])
+        await raw.application_event_daily.delete_many({"_id.job_id": {"$type": "string"}})
+        logging.info("application_event_daily: rebuilt %s buckets", len(buckets))
+
+# Bound by connect_mongo() when the app (or a maintenance command) starts.
+# Writes and user-facing reads use the primary; public listings and analytics
+# may be served by secondaries within MONGO_MAX_STALENESS_SECONDS
+client: Optional[AsyncIOMotorClient] = None
+db = None
+db_public = None
+db_analytics = None
+
+def connect_mongo() -> AsyncIOMotorClient:
+    global client, db, db_public, db_analytics
+    client = AsyncIOMotorClient(
+        os.environ['MONGO_URL'],
+        maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 100)),
+        minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 0)),
+        maxIdleTimeMS=int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', 300000)),
+        waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000)),
+        connectTimeoutMS=int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 5000)),
+        serverSelectionTimeoutMS=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000)),
+        socketTimeoutMS=int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', 20000)),
+        event_listeners=[pool_metrics, command_trace],
+        tz_aware=True
+    )
+    db_name = os.environ['DB_NAME']
+    db = StoredDatabase(client[db_name])
+    db_public = StoredDatabase(client.get_database(db_name, read_preference=read_preference_from_env('MONGO_PUBLIC_READ_PREFERENCE', 'secondaryPreferred')))
+    db_analytics = StoredDatabase(client.get_database(db_name, read_preference=read_preference_from_env('MONGO_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')))
+    return client
+
+# Idempotency-Key support for retried POSTs; stored responses expire after the TTL
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400))
+IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', 60))
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', 30))
+IDEMPOTENT_ROUTES = [
+    re.compile(r"^/api/applications/[^/]+$"),
+    re.compile(r"^/api/jobs$"),
+    re.compile(r"^/api/reviews$"),
+    re.compile(r"^/api/payments/create-checkout$"),
+]
+idempotency_inflight: Dict[str, asyncio.Event] = {}
+
+# On-demand request profiling: per request with X-Profile: 1 plus a valid
+# X-Admin-Key, or for a random PROFILE_SAMPLE_RATE fraction of requests
+ADMIN_API_KEY = os.environ.get('ADMIN_API_KEY')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_RETENTION_SECONDS = int(os.environ.get('PROFILE_RETENTION_SECONDS', 7 * 86400))
+
+# Read-your-writes: a user's reads stay on the primary, in a causally
+# consistent session, for this long after their last write. The write's
+# cluster/operation time goes back to the client in a signed X-Causal-Token
+# header and is replayed on later requests, so the guarantee holds whichever
+# API process serves the read; recent_writes covers clients that don't
+# replay it, within one process
+READ_YOUR_WRITES_WINDOW_SECONDS = float(os.environ.get('MONGO_READ_YOUR_WRITES_WINDOW_SECONDS', 120))
+CAUSAL_TOKEN_HEADER = "X-Causal-Token"
+recent_writes: Dict[str, dict] = {}
+# Per request: the token the client sent and the write made while serving it
+causal_context: ContextVar[Optional[dict]] = ContextVar("causal_context", default=None)
 
 # JWT Settings
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', 10080))
 
-# Create the main app
-app = FastAPI()
 api_router = APIRouter(prefix="/api")
 
 # Mock OTP Storage (in production, use Redis or similar)
@@ -62,7 +739,9 @@ class WorkerProfile(BaseModel):
     languages: List[str]
     availability: str  # 'immediate', 'within_week', 'within_month'
     skills: List[str] = []
+    document_skills: List[str] = []  # found in uploaded documents, maintained by process_worker_document
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class RestaurantProfile(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -91,6 +770,10 @@ class Job(BaseModel):
     description: str
     requirements: List[str] = []
     benefits: List[str] = []
+    headcount: int = 1  # positions to fill
+    # Maintained with $inc as applications arrive and move; see reconcile_applicant_counts()
+    applicant_count: int = 0
+    applicant_status_counts: Dict[str, int] = {}
     is_active: bool = True
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -104,6 +787,32 @@ class Application(BaseModel):
     applied_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Allowed application status transitions; 'accepted' and 'rejected' are terminal
+APPLICATION_STATUS_TRANSITIONS = {
+    "applied": ["shortlisted", "interview", "rejected"],
+    "shortlisted": ["interview", "offered", "rejected"],
+    "interview": ["offered", "rejected"],
+    "offered": ["accepted", "rejected"],
+    "accepted": [],
+    "rejected": [],
+}
+FUNNEL_STAGES = ["applied", "shortlisted", "interview", "offered", "accepted"]
+
+class ApplicationEvent(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    application_id: str
+    job_id: str
+    restaurant_id: str
+    worker_id: str
+    from_status: Optional[str] = None
+    to_status: str
+    stages_entered: List[str] = []  # to_status, plus any funnel stages the transition skipped
+    seconds_in_previous_status: Optional[float] = None
+    seconds_since_applied: float = 0
+    day: str  # 'YYYY-MM-DD' (UTC), rollup bucket
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class Review(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -119,6 +828,36 @@ class Review(BaseModel):
     is_verified: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class WorkerDocument(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    kind: str = "resume"  # 'resume', 'certificate' or 'other'
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    storage_key: str  # content-addressed, shared by identical uploads
+    thumbnail_key: Optional[str] = None
+    status: str = "processing"  # 'processing' or 'ready'
+    skills_found: List[str] = []
+    text_excerpt: str = ""
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class JobAlert(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    name: str = ""
+    source: str = "explicit"  # 'explicit' or 'profile' (kept in sync with the worker profile)
+    roles: List[str] = []  # empty means any
+    cities: List[str] = []
+    shifts: List[str] = []
+    min_wage: Optional[float] = None
+    is_active: bool = True
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class PaymentTransaction(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -142,73 +881,2227 @@ class LoginRequest(BaseModel):
     phone: str
     password: str
 
-class OTPRequest(BaseModel):
-    phone: str
+class OTPRequest(BaseModel):
+    phone: str
+
+class OTPVerifyRequest(BaseModel):
+    phone: str
+    otp: str
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    user_id: str
+    role: str
+
+class JobCreateRequest(BaseModel):
+    title: str
+    role: str
+    location_city: str
+    shift_timing: str
+    experience_required: str
+    wage_min: float
+    wage_max: float
+    description: str
+    requirements: List[str] = []
+    benefits: List[str] = []
+    headcount: int = Field(1, ge=1)
+
+class ApplicationStatusUpdate(BaseModel):
+    status: str
+
+class StaffingPlanRequest(BaseModel):
+    job_ids: List[str] = []  # empty means all of the restaurant's active jobs
+    min_score: float = 0.0
+    dry_run: bool = False
+
+class ReviewCreateRequest(BaseModel):
+    restaurant_id: str
+    overall_rating: float
+    wage_accuracy: float
+    work_environment: float
+    career_growth: float
+    compliance: float
+    comment: str = ""
+
+class WorkerProfileRequest(BaseModel):
+    location_city: str
+    experience_years: int
+    preferred_roles: List[str]
+    preferred_shifts: List[str]
+    languages: List[str]
+    availability: str
+    skills: List[str] = []
+
+class JobAlertRequest(BaseModel):
+    name: str = ""
+    roles: List[str] = []
+    cities: List[str] = []
+    shifts: List[str] = []
+    min_wage: Optional[float] = None
+
+class RestaurantProfileRequest(BaseModel):
+    company_name: str
+    number_of_outlets: int
+    manager_name: str
+    location_cities: List[str]
+    description: str = ""
+
+# Helper functions
+def get_password_hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def create_access_token(data: dict) -> str:
+    from jose import jwt
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+def entered_stages(from_status: Optional[str], to_status: str) -> List[str]:
+    """Funnel stages an application enters with a transition, counting any it
+    skips (applied -> interview also enters shortlisted)."""
+    if to_status not in FUNNEL_STAGES:
+        return [to_status]
+    end = FUNNEL_STAGES.index(to_status)
+    start = FUNNEL_STAGES.index(from_status) + 1 if from_status in FUNNEL_STAGES else end
+    return FUNNEL_STAGES[start:end + 1]
+
+def build_application_event(application: dict, restaurant_id: str, to_status: str, now: datetime) -> ApplicationEvent:
+    from_status = application.get("status") if to_status != "applied" else None
+    applied_at = parse_timestamp(application["applied_at"])
+    previous_at = parse_timestamp(application["updated_at"])
+    return ApplicationEvent(
+        application_id=application["id"],
+        job_id=application["job_id"],
+        restaurant_id=restaurant_id,
+        worker_id=application["worker_id"],
+        from_status=from_status,
+        to_status=to_status,
+        stages_entered=entered_stages(from_status, to_status),
+        seconds_in_previous_status=(now - previous_at).total_seconds() if from_status else None,
+        seconds_since_applied=(now - applied_at).total_seconds(),
+        day=now.strftime("%Y-%m-%d"),
+        created_at=now
+    )
+
+async def record_application_event(application: dict, restaurant_id: str, to_status: str, now: datetime):
+    """Append a status transition to application_events and add it to that day's rollup."""
+    event = build_application_event(application, restaurant_id, to_status, now)
+    event_dict = event.model_dump()
+    await db.application_events.insert_one(event_dict)
+    await update_application_rollups([event])
+    return event
+
+async def update_application_rollups(events: List[ApplicationEvent]):
+    """Fold new events into their (job, day) buckets of application_event_daily with $inc."""
+    buckets: Dict[tuple, dict] = {}
+    for event in events:
+        bucket = buckets.setdefault((event.job_id, event.day), {"restaurant_id": event.restaurant_id, "inc": {}})
+        increments = [(f"transitions.{event.to_status}", 1)]
+        increments += [(f"stages_entered.{stage}", 1) for stage in event.stages_entered]
+        if event.to_status == "accepted":
+            increments.append(("time_to_hire_seconds", event.seconds_since_applied))
+        if event.from_status:
+            increments.append((f"stage_seconds.{event.from_status}", event.seconds_in_previous_status or 0))
+            increments.append((f"stage_exits.{event.from_status}", 1))
+        for field, value in increments:
+            bucket["inc"][field] = bucket["inc"].get(field, 0) + value
+    if not buckets:
+        return
+    await db.application_event_daily.bulk_write([
+        (
+            {"_id": {"job_id": encode_id(job_id), "day": day}},
+            {
+                "$inc": bucket["inc"],
+                "$setOnInsert": {"restaurant_id": bucket["restaurant_id"], "job_id": job_id, "day": day},
+            },
+            True
+        )
+        for (job_id, day), bucket in buckets.items()
+    ], ordered=False)
+
+async def refresh_application_rollup(job_id: str, day: str):
+    """Rebuild one (job, day) bucket of application_event_daily from its events.
+
+    Status writes update buckets incrementally (update_application_rollups);
+    this full recompute is for rebuilding them, after migrate-storage or by
+    reconcile_application_rollups.
+    Only the events of a single job on a single day are read.
+    """
+    pipeline = [
+        {"$match": {"job_id": job_id, "day": day}},
+        {"$group": {
+            "_id": {"restaurant_id": "$restaurant_id", "status": "$to_status"},
+            "count": {"$sum": 1},
+            "seconds_since_applied": {"$sum": "$seconds_since_applied"},
+        }},
+        {"$group": {
+            "_id": {"job_id": {"$literal": encode_id(job_id)}, "day": {"$literal": day}},
+            "restaurant_id": {"$first": "$_id.restaurant_id"},
+            "transitions": {"$push": {"k": "$_id.status", "v": "$count"}},
+            "time_to_hire_seconds": {"$sum": {
+                "$cond": [{"$eq": ["$_id.status", "accepted"]}, "$seconds_since_applied", 0]
+            }},
+        }},
+        {"$lookup": {
+            "from": "application_events",
+            "pipeline": [
+                {"$match": {"job_id": job_id, "day": day, "from_status": {"$ne": None}}},
+                {"$group": {"_id": "$from_status", "seconds": {"$sum": "$seconds_in_previous_status"}, "count": {"$sum": 1}}},
+            ],
+            "as": "stages",
+        }},
+        {"$lookup": {
+            "from": "application_events",
+            "pipeline": [
+                {"$match": {"job_id": job_id, "day": day}},
+                # Events recorded before stages_entered only count their own status
+                {"$project": {"stage": {"$ifNull": ["$stages_entered", ["$to_status"]]}}},
+                {"$unwind": "$stage"},
+                {"$group": {"_id": "$stage", "count": {"$sum": 1}}},
+            ],
+            "as": "entered",
+        }},
+        {"$project": {
+            "restaurant_id": 1,
+            "job_id": {"$literal": encode_id(job_id)},
+            "day": {"$literal": day},
+            "transitions": {"$arrayToObject": "$transitions"},
+            "stages_entered": {"$arrayToObject": {"$map": {
+                "input": "$entered", "as": "s", "in": {"k": "$$s._id", "v": "$$s.count"}
+            }}},
+            "time_to_hire_seconds": 1,
+            "stage_seconds": {"$arrayToObject": {"$map": {
+                "input": "$stages", "as": "s", "in": {"k": "$$s._id", "v": "$$s.seconds"}
+            }}},
+            "stage_exits": {"$arrayToObject": {"$map": {
+                "input": "$stages", "as": "s", "in": {"k": "$$s._id", "v": "$$s.count"}
+            }}},
+        }},
+        {"$merge": {"into": "application_event_daily", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+    await db.application_events.aggregate(pipeline).to_list(None)
+
+async def reconcile_application_rollups(days: int = 2, dry_run: bool = False) -> int:
+    """Rebuild the recent buckets of application_event_daily that miss events; returns how many.
+
+    An event is inserted before its $inc reaches the bucket, so a crash in
+    between leaves the bucket short. Each (job, day) bucket of the last
+    `days` days whose transitions don't add up to its events is recomputed
+    with refresh_application_rollup.
+    """
+    since = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+    counted = {}
+    async for row in db.application_events.aggregate([
+        {"$match": {"day": {"$gte": since}}},
+        {"$group": {"_id": {"job_id": "$job_id", "day": "$day"}, "count": {"$sum": 1}}}
+    ]):
+        counted[row["_id"]["job_id"], row["_id"]["day"]] = row["count"]
+    recorded = {}
+    async for bucket in db.application_event_daily.find({"day": {"$gte": since}}, {"_id": 1, "transitions": 1}):
+        recorded[bucket["_id"]["job_id"], bucket["_id"]["day"]] = sum((bucket.get("transitions") or {}).values())
+    
+    drifted = [key for key, count in counted.items() if recorded.get(key) != count]
+    for job_id, day in drifted:
+        logging.warning("Rollup of job %s on %s drifted: %s events, %s in the bucket", job_id, day, counted[job_id, day], recorded.get((job_id, day), 0))
+        if not dry_run:
+            await refresh_application_rollup(job_id, day)
+    logging.info("Checked %s application rollups since %s; %s %s", len(counted), since, "would rebuild" if dry_run else "rebuilt", len(drifted))
+    return len(drifted)
+
+def parse_day_range(start: Optional[str], end: Optional[str], default_days: int = 30):
+    try:
+        end_day = datetime.strptime(end, "%Y-%m-%d").date() if end else datetime.now(timezone.utc).date()
+        start_day = datetime.strptime(start, "%Y-%m-%d").date() if start else end_day - timedelta(days=default_days - 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    if start_day > end_day:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start_day.isoformat(), end_day.isoformat()
+
+class TDigest:
+    """Merging t-digest for streaming quantile estimates.
+
+    Values are buffered and periodically merged into at most ~compression
+    centroids, so the digest stays a few KB however many values it has seen
+    and can be stored on a single rollup document.
+    """
+
+    def __init__(self, compression: float = 100, centroids: Optional[List[List[float]]] = None,
+                 min_value: Optional[float] = None, max_value: Optional[float] = None):
+        self.compression = compression
+        self.centroids = [list(c) for c in (centroids or [])]
+        self.min = min_value
+        self.max = max_value
+        self._buffer: List[List[float]] = []
+
+    @property
+    def count(self) -> float:
+        return sum(w for _, w in self.centroids) + sum(w for _, w in self._buffer)
+
+    def add(self, value: float, weight: float = 1):
+        self._buffer.append([value, weight])
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.compression:
+            self.compress()
+
+    def _scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def compress(self):
+        items = sorted(self.centroids + self._buffer)
+        self._buffer = []
+        if not items:
+            return
+        total = sum(w for _, w in items)
+        merged = []
+        cumulative = 0.0
+        k_left = self._scale(0.0)
+        mean, weight = items[0]
+        for value, w in items[1:]:
+            # Merge while the centroid spans at most one unit of the k1 scale
+            if self._scale((cumulative + weight + w) / total) - k_left <= 1:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                merged.append([mean, weight])
+                cumulative += weight
+                k_left = self._scale(cumulative / total)
+                mean, weight = value, w
+        merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        self.compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        total = sum(w for _, w in self.centroids)
+        target = q * total
+        cumulative = 0.0
+        for i, (mean, weight) in enumerate(self.centroids):
+            if cumulative + weight / 2 >= target:
+                if i == 0:
+                    lower, lower_center = self.min, 0.0
+                else:
+                    lower = self.centroids[i - 1][0]
+                    lower_center = cumulative - self.centroids[i - 1][1] / 2
+                upper_center = cumulative + weight / 2
+                if upper_center == lower_center:
+                    return mean
+                return lower + (mean - lower) * (target - lower_center) / (upper_center - lower_center)
+            cumulative += weight
+        last_mean, last_weight = self.centroids[-1]
+        last_center = total - last_weight / 2
+        return last_mean + (self.max - last_mean) * (target - last_center) / (total - last_center)
+
+    def to_dict(self) -> dict:
+        self.compress()
+        return {"compression": self.compression, "centroids": self.centroids, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "TDigest":
+        data = data or {}
+        return cls(data.get("compression", 100), data.get("centroids"), data.get("min"), data.get("max"))
+
+WAGE_PERCENTILES = [10, 25, 50, 75, 90]
+
+def wage_benchmark_key(role: str, city: str, shift: str) -> str:
+    return f"{role}|{city}|{shift}"
+
+def add_job_to_wage_benchmark(benchmark: dict, job: dict) -> dict:
+    digest_min = TDigest.from_dict(benchmark.get("wage_min_digest"))
+    digest_max = TDigest.from_dict(benchmark.get("wage_max_digest"))
+    digest_min.add(float(job["wage_min"]))
+    digest_max.add(float(job["wage_max"]))
+    benchmark.update({
+        "role": job["role"],
+        "location_city": job["location_city"],
+        "shift_timing": job["shift_timing"],
+        "job_count": benchmark.get("job_count", 0) + 1,
+        "wage_min_digest": digest_min.to_dict(),
+        "wage_max_digest": digest_max.to_dict(),
+    })
+    return benchmark
+
+class WageBenchmarkConflict(Exception):
+    """Concurrent writers kept replacing the benchmark before this update could land."""
+
+async def update_wage_benchmark(job: dict, max_attempts: int = 5):
+    """Fold a new job into its role x city x shift benchmark with optimistic concurrency.
+
+    Raises WageBenchmarkConflict if every attempt lost the race.
+    """
+    key = wage_benchmark_key(job["role"], job["location_city"], job["shift_timing"])
+    for _ in range(max_attempts):
+        benchmark = await db.wage_benchmarks.find_one({"_id": key})
+        if benchmark is None:
+            try:
+                await db.wage_benchmarks.insert_one(add_job_to_wage_benchmark({"_id": key, "version": 1}, job))
+                return
+            except DuplicateKeyError:
+                continue
+        version = benchmark.get("version", 0)
+        benchmark = add_job_to_wage_benchmark(benchmark, job)
+        benchmark["version"] = version + 1
+        result = await db.wage_benchmarks.replace_one({"_id": key, "version": version}, benchmark)
+        if result.modified_count:
+            return
+    raise WageBenchmarkConflict(f"Wage benchmark {key} still contended after {max_attempts} attempts")
+
+async def rebuild_wage_benchmarks(batch_size: int = 1000):
+    """Rebuild wage_benchmarks from all active jobs and swap it in atomically."""
+    benchmarks: Dict[str, dict] = {}
+    projection = {"_id": 0, "role": 1, "location_city": 1, "shift_timing": 1, "wage_min": 1, "wage_max": 1}
+    async for job in db.jobs.find({"is_active": True}, projection).batch_size(batch_size):
+        key = wage_benchmark_key(job["role"], job["location_city"], job["shift_timing"])
+        add_job_to_wage_benchmark(benchmarks.setdefault(key, {"_id": key, "version": 1}), job)
+    
+    staging = db.wage_benchmarks_rebuild
+    await staging.drop()
+    if benchmarks:
+        await staging.insert_many(list(benchmarks.values()))
+        await staging.rename("wage_benchmarks", dropTarget=True)
+    else:
+        await db.wage_benchmarks.delete_many({})
+    logging.info("Rebuilt %s wage benchmarks", len(benchmarks))
+
+def applicant_count_update(from_status: Optional[str], to_status: str) -> dict:
+    """$inc moving one application between statuses (from_status None: a new application)."""
+    inc = {f"applicant_status_counts.{to_status}": 1}
+    if from_status is None:
+        inc["applicant_count"] = 1
+    else:
+        inc[f"applicant_status_counts.{from_status}"] = -1
+    return {"$inc": inc}
+
+async def reconcile_applicant_counts(batch_size: int = 500, dry_run: bool = False) -> int:
+    """Recount applications per job and repair jobs whose counters drifted; returns the number repaired.
+    
+    A repair only applies if the job's counters are still the ones read, so
+    a concurrent $inc wins and the job is rechecked on the next run.
+    """
+    repaired = checked = 0
+    
+    async def reconcile(jobs: List[dict]):
+        nonlocal repaired
+        counted = {job["id"]: {} for job in jobs}
+        async for row in db.applications.aggregate([
+            {"$match": {"job_id": {"$in": list(counted)}}},
+            {"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "count": {"$sum": 1}}}
+        ]):
+            key = row["_id"]
+            counted[key["job_id"]][key["status"]] = row["count"]
+        repairs = []
+        for job in jobs:
+            actual = counted[job["id"]]
+            stored = {status: n for status, n in job.get("applicant_status_counts", {}).items() if n}
+            if "applicant_count" in job and stored == actual and job["applicant_count"] == sum(actual.values()):
+                continue
+            if "applicant_count" in job:
+                logging.warning("Applicant counts of job %s drifted: stored %s %s, actual %s", job["id"], job["applicant_count"], stored, actual)
+            # Jobs posted before counters existed are backfilled the same way
+            observed = {"id": job["id"]}
+            for field in ("applicant_count", "applicant_status_counts"):
+                observed[field] = job[field] if field in job else {"$exists": False}
+            repairs.append((observed, {"$set": {"applicant_count": sum(actual.values()), "applicant_status_counts": actual}}, False))
+        if repairs and not dry_run:
+            result = await db.jobs.bulk_write(repairs, ordered=False)
+            repaired += result.modified_count
+        elif dry_run:
+            repaired += len(repairs)
+    
+    batch = []
+    projection = {"_id": 0, "id": 1, "applicant_count": 1, "applicant_status_counts": 1}
+    async for job in db.jobs.find({}, projection).batch_size(batch_size):
+        batch.append(job)
+        if len(batch) == batch_size:
+            await reconcile(batch)
+            checked += len(batch)
+            batch = []
+    if batch:
+        await reconcile(batch)
+        checked += len(batch)
+    logging.info("Checked applicant counts of %s jobs; %s %s", checked, "would repair" if dry_run else "repaired", repaired)
+    return repaired
+
+def format_wage_benchmark(benchmark: dict) -> dict:
+    digest_min = TDigest.from_dict(benchmark.get("wage_min_digest"))
+    digest_max = TDigest.from_dict(benchmark.get("wage_max_digest"))
+    return {
+        "role": benchmark["role"],
+        "location_city": benchmark["location_city"],
+        "shift_timing": benchmark["shift_timing"],
+        "job_count": benchmark["job_count"],
+        "wage_min_percentiles": {f"p{p}": round(digest_min.quantile(p / 100), 2) for p in WAGE_PERCENTILES},
+        "wage_max_percentiles": {f"p{p}": round(digest_max.quantile(p / 100), 2) for p in WAGE_PERCENTILES},
+    }
+
+def causal_token_signature(body: str) -> str:
+    import hmac
+    return hmac.new(JWT_SECRET_KEY.encode(), body.encode(), hashlib.sha256).hexdigest()
+
+def encode_causal_token(user_id: str, write: dict) -> str:
+    """Signed, user-bound token carrying a write's cluster/operation time back to the client."""
+    import base64
+    import bson
+    payload = bson.encode({"user_id": user_id, **write})
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{causal_token_signature(body)}"
+
+def decode_causal_token(token: str, user_id: str) -> Optional[dict]:
+    import base64
+    import bson
+    import hmac
+    body, _, signature = token.partition(".")
+    if not hmac.compare_digest(signature, causal_token_signature(body)):
+        return None
+    try:
+        write = bson.decode(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    except Exception:
+        return None
+    if write.pop("user_id", None) != user_id:
+        return None
+    return write
+
+def user_writes(user_id: str) -> List[dict]:
+    """The user's writes still inside the read-your-writes window: from this
+    request, from the client's X-Causal-Token, or seen by this process."""
+    writes = []
+    context = causal_context.get()
+    if context is not None:
+        if context.get("write") and context["write"][0] == user_id:
+            writes.append(context["write"][1])
+        if context.get("token"):
+            decoded = context.setdefault("decoded", {})
+            if user_id not in decoded:
+                decoded[user_id] = decode_causal_token(context["token"], user_id)
+            if decoded[user_id]:
+                writes.append(decoded[user_id])
+    if user_id in recent_writes:
+        writes.append(recent_writes[user_id])
+    cutoff = time.time() - READ_YOUR_WRITES_WINDOW_SECONDS
+    return [write for write in writes if write["at"] >= cutoff]
+
+@asynccontextmanager
+async def causal_session(user_id: str, wrote: bool = False):
+    """Causally consistent session that carries the user's last write forward.
+
+    Sessions opened with wrote=True record their cluster/operation time, in
+    this process and in the response's X-Causal-Token, so that the user's
+    later reads observe the write even after a failover or on another process.
+    """
+    async with await client.start_session(causal_consistency=True) as session:
+        for last in user_writes(user_id):
+            session.advance_cluster_time(last["cluster_time"])
+            session.advance_operation_time(last["operation_time"])
+        yield session
+        if wrote and session.operation_time is not None:
+            if len(recent_writes) > 10000:
+                cutoff = time.time() - READ_YOUR_WRITES_WINDOW_SECONDS
+                for stale in [u for u, w in recent_writes.items() if w["at"] < cutoff]:
+                    del recent_writes[stale]
+            write = {
+                "at": time.time(),
+                "cluster_time": session.cluster_time,
+                "operation_time": session.operation_time,
+            }
+            recent_writes[user_id] = write
+            context = causal_context.get()
+            if context is not None:
+                context["write"] = (user_id, write)
+
+def user_reader(user_id: str):
+    """Database handle for a user's own data: primary right after their writes."""
+    if user_writes(user_id):
+        return db
+    recent_writes.pop(user_id, None)
+    return db_public
+
+@dataclass
+class FieldSelection:
+    """A parsed `fields=` parameter: which fields of a list item to return."""
+    fields: Optional[List[str]]  # None: every field
+    embedded: Dict[str, Optional[List[str]]]  # embedded documents to attach, with their fields (None: all)
+
+    def projection(self, required: List[str] = ()) -> dict:
+        """Mongo projection for the item, plus fields needed to join the embedded documents."""
+        if self.fields is None:
+            return {"_id": 0}
+        return {"_id": 0, **{field: 1 for field in [*self.fields, *required]}}
+
+    def trim(self, doc: dict) -> dict:
+        """Drop join fields that were fetched but not asked for."""
+        if self.fields is None:
+            return doc
+        return {k: v for k, v in doc.items() if k in self.fields or k in self.embedded}
+
+def parse_fields(fields: Optional[str], model, embedded: Dict[str, Any] = None) -> FieldSelection:
+    """Validate a comma-separated `fields=` list (e.g. "title,wage_min,job_details.title") against
+    the item's model and the models of its embedded documents. "id" is always returned."""
+    embedded = embedded or {}
+    if not fields:
+        return FieldSelection(None, {name: None for name in embedded})
+    top, nested = ["id"], {}
+    for field in (f.strip() for f in fields.split(",")):
+        if not field:
+            continue
+        name, _, sub = field.partition(".")
+        if name in embedded:
+            if sub and sub not in embedded[name].model_fields:
+                raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+            if not sub:
+                nested[name] = None
+            elif name not in nested or nested[name] is not None:
+                nested.setdefault(name, []).append(sub)
+        elif sub or name not in model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+        elif name not in top:
+            top.append(name)
+    return FieldSelection(top, nested)
+
+class DataLoader:
+    """Request-scoped batching and de-duplication of lookups by key.
+
+    Keys requested in the same event-loop tick (e.g. from one asyncio.gather)
+    are fetched with a single $in query; repeated keys resolve from the
+    request's cache. Reads follow the same routing as user_reader().
+    """
+
+    def __init__(self, collection: str, key_field: str, user_id: Optional[str] = None, fields: Optional[List[str]] = None):
+        self.collection = collection
+        self.key_field = key_field
+        self.user_id = user_id
+        self.projection = {"_id": 0}
+        if fields is not None:
+            self.projection.update({field: 1 for field in [key_field, *fields]})
+        self._cache: Dict[Any, asyncio.Future] = {}
+        self._queue: List[Any] = []
+        self._dispatches: set = set()
+
+    async def load(self, key) -> Optional[dict]:
+        if key not in self._cache:
+            loop = asyncio.get_running_loop()
+            self._cache[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                task = loop.create_task(self._dispatch())
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+        # Shielded so a cancelled caller (e.g. a failed sibling in gather)
+        # doesn't cancel the result other callers share
+        return await asyncio.shield(self._cache[key])
+
+    async def load_many(self, keys: List[Any]) -> List[Optional[dict]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def _dispatch(self):
+        # Let the other coroutines scheduled in this tick enqueue their keys
+        await asyncio.sleep(0)
+        keys, self._queue = self._queue, []
+        try:
+            reader = user_reader(self.user_id) if self.user_id else db_public
+            async with (causal_session(self.user_id) if self.user_id else nullcontext()) as session:
+                docs = await reader[self.collection].find(
+                    {self.key_field: {"$in": keys}}, self.projection, session=session
+                ).to_list(None)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key)
+                future.set_exception(e)
+                # Mark retrieved so unawaited failures don't log as never-retrieved
+                future.exception()
+            return
+        found = {doc[self.key_field]: doc for doc in docs}
+        for key in keys:
+            self._cache[key].set_result(found.get(key))
+
+    def only(self, fields: Optional[List[str]]) -> "DataLoader":
+        """This loader, or (for a field subset) one that fetches only those fields."""
+        if fields is None:
+            return self
+        return DataLoader(self.collection, self.key_field, self.user_id, fields)
+
+class RequestLoaders:
+    def __init__(self, user_id: Optional[str] = None):
+        self.users = DataLoader("users", "id", user_id)
+        self.jobs = DataLoader("jobs", "id", user_id)
+        self.worker_profiles = DataLoader("worker_profiles", "user_id", user_id)
+        self.restaurant_profiles = DataLoader("restaurant_profiles", "user_id", user_id)
+
+# In-process search indexes
+INDEX_SYNC_SECONDS = float(os.environ.get('INDEX_SYNC_SECONDS', os.environ.get('CANDIDATE_INDEX_SYNC_SECONDS', 5)))
+
+class SyncedIndex:
+    """Base for in-process indexes that load from Mongo and then poll for changes.
+
+    Subclasses implement sync(), which must be idempotent; writes made by this
+    process are also applied directly so they are searchable immediately.
+    """
+
+    name = "index"
+
+    def __init__(self):
+        self.loaded = False
+        self.watermark: Optional[datetime] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    async def sync(self):
+        raise NotImplementedError
+
+    def advance(self, timestamp: Optional[datetime]):
+        if timestamp and (self.watermark is None or timestamp > self.watermark):
+            self.watermark = timestamp
+
+    async def run(self):
+        while True:
+            try:
+                await self.sync()
+                if not self.loaded:
+                    logging.info("%s loaded", self.name)
+                self.loaded = True
+            except Exception as e:
+                logging.error("%s sync failed: %s", self.name, e)
+            await asyncio.sleep(INDEX_SYNC_SECONDS)
+
+    def start(self):
+        self._sync_task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._sync_task:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+
+class CandidateIndex(SyncedIndex):
+    """In-process inverted index of worker profiles over roaring bitmaps.
+
+    Every profile gets a slot; each (field, value) pair keeps a compressed
+    bitmap of the slots that have it. Filters are bitmap unions (OR within a
+    field) and intersections (AND across fields), and facet counts are
+    intersection cardinalities, so no profile documents are touched until
+    the requested page is fetched.
+    """
+
+    FIELDS = ["preferred_roles", "preferred_shifts", "languages", "skills", "availability", "location_city"]
+    name = "Candidate index"
+
+    def __init__(self):
+        super().__init__()
+        self.slots: List[str] = []
+        self.slot_of: Dict[str, int] = {}
+        self.terms_of: Dict[int, List[tuple]] = {}
+        self.bitmaps: Dict[str, Dict[str, BitMap]] = {field: {} for field in self.FIELDS}
+        self.live = BitMap()
+
+    @staticmethod
+    def normalize(value: Any) -> str:
+        return str(value).strip().lower()
+
+    def _terms(self, profile: dict) -> List[tuple]:
+        terms = set()
+        for field in self.FIELDS:
+            values = profile.get(field) or []
+            for value in (values if isinstance(values, list) else [values]):
+                terms.add((field, self.normalize(value)))
+        # Skills found in uploaded resumes and certificates
+        for value in profile.get("document_skills") or []:
+            terms.add(("skills", self.normalize(value)))
+        return list(terms)
+
+    def upsert(self, profile: dict):
+        user_id = profile["user_id"]
+        slot = self.slot_of.get(user_id)
+        if slot is None:
+            slot = len(self.slots)
+            self.slots.append(user_id)
+            self.slot_of[user_id] = slot
+        else:
+            self._clear(slot)
+        terms = self._terms(profile)
+        for field, value in terms:
+            self.bitmaps[field].setdefault(value, BitMap()).add(slot)
+        self.terms_of[slot] = terms
+        self.live.add(slot)
+
+    def remove(self, user_id: str):
+        slot = self.slot_of.get(user_id)
+        if slot is not None:
+            self._clear(slot)
+            self.live.discard(slot)
+
+    def _clear(self, slot: int):
+        for field, value in self.terms_of.pop(slot, []):
+            bitmap = self.bitmaps[field].get(value)
+            if bitmap is not None:
+                bitmap.discard(slot)
+                if not bitmap:
+                    del self.bitmaps[field][value]
+
+    def search(self, filters: Dict[str, List[str]], match_all: Optional[List[str]] = None) -> BitMap:
+        result = BitMap(self.live)
+        for field, values in filters.items():
+            bitmaps = [self.bitmaps[field].get(self.normalize(v), BitMap()) for v in values]
+            if field in (match_all or []):
+                result &= BitMap.intersection(*bitmaps)
+            else:
+                result &= BitMap.union(*bitmaps)
+        return result
+
+    def facets(self, result: BitMap, limit: int = 20) -> Dict[str, List[dict]]:
+        facets = {}
+        for field, values in self.bitmaps.items():
+            counts = [(value, result.intersection_cardinality(bitmap)) for value, bitmap in values.items()]
+            counts = sorted((c for c in counts if c[1]), key=lambda c: -c[1])[:limit]
+            facets[field] = [{"value": value, "count": count} for value, count in counts]
+        return facets
+
+    @classmethod
+    def projection(cls) -> dict:
+        """The profile fields upsert() reads."""
+        return {"_id": 0, "user_id": 1, "updated_at": 1, "document_skills": 1, **{field: 1 for field in cls.FIELDS}}
+
+    def page(self, result: BitMap, offset: int, limit: int) -> List[str]:
+        """User ids for one page, most recently indexed profiles first."""
+        total = len(result)
+        return [self.slots[result[total - 1 - i]] for i in range(offset, min(offset + limit, total))]
+
+    async def sync(self):
+        """Fold in profiles created or updated since the last sync (by any process)."""
+        query = {"updated_at": {"$gte": self.watermark}} if self.watermark else {}
+        async for profile in db.worker_profiles.find(query, self.projection()).batch_size(5000):
+            self.upsert(profile)
+            self.advance(profile.get("updated_at"))
+
+candidate_index = CandidateIndex()
+
+# Semantic job matching
+# Role vocabulary folded into a shared concept token, so e.g. "coffee maker"
+# in a profile lands near a "barista" posting even with the hashing embedder
+ROLE_SYNONYMS = {
+    "barista": ["barista", "coffee", "coffee maker", "espresso", "latte", "cappuccino", "brewer"],
+    "waiter": ["waiter", "waitress", "server", "steward", "service staff", "table service", "food service"],
+    "counter_staff": ["counter staff", "counter_staff", "cashier", "billing", "order taker", "front counter"],
+    "cook": ["cook", "chef", "line cook", "commis", "kitchen", "sous chef"],
+    "host": ["host", "hostess", "greeter", "front of house"],
+    "cleaner": ["cleaner", "dishwasher", "housekeeping", "steward kitchen"],
+}
+
+class HashingEmbedder:
+    """Offline text embedding: signed feature hashing of words, bigrams and role concepts."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[tuple]:
+        lowered = text.lower()
+        words = re.findall(r"[a-z0-9]+", lowered)
+        features = [(w, 1.0) for w in words]
+        features += [(f"{a} {b}", 0.7) for a, b in zip(words, words[1:])]
+        padded = f" {' '.join(words)} "
+        for role, phrases in ROLE_SYNONYMS.items():
+            if any(f" {phrase.replace('_', ' ')} " in padded for phrase in phrases):
+                features.append((f"__role_{role}__", 4.0))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += weight if (h >> 31) & 1 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+@lru_cache(maxsize=None)
+def get_embedder():
+    """EMBEDDING_MODEL (a local sentence-transformers model) if usable, else feature hashing."""
+    model_name = os.environ.get('EMBEDDING_MODEL')
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            logging.warning("Embedding model %s unavailable, using hashing embedder: %s", model_name, e)
+    return HashingEmbedder()
+
+def job_text(job: dict) -> str:
+    return " ".join([
+        job.get("title", ""), job.get("role", "").replace("_", " "), job.get("description", ""),
+        " ".join(job.get("requirements", [])), " ".join(job.get("benefits", []))
+    ])
+
+def worker_text(profile: dict) -> str:
+    return " ".join([
+        " ".join(r.replace("_", " ") for r in profile.get("preferred_roles", [])),
+        " ".join(profile.get("skills", [])),
+        " ".join(profile.get("preferred_shifts", [])),
+    ])
+
+class VectorIndex:
+    """Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+    Below brute_force_below items every search is exact. Past that, spherical
+    k-means centroids partition the vectors and a query scans only the
+    n_probe closest lists; the partition is retrained when the index has
+    grown 4x since the last training. Filtered searches that come up short
+    fall back to an exact scan of the rows passing the filter.
+    """
+
+    def __init__(self, n_lists: int = 64, n_probe: int = 8, brute_force_below: int = 5000):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.brute_force_below = brute_force_below
+        self.ids: List[str] = []
+        self.row_of: Dict[str, int] = {}
+        self.meta: List[Optional[dict]] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.size = 0
+        self.centroids: Optional[np.ndarray] = None
+        self.assignment: List[int] = []
+        self.lists: List[set] = []
+        self.trained_size = 0
+
+    def add(self, item_id: str, vector: np.ndarray, meta: dict):
+        if self.vectors is None:
+            self.vectors = np.zeros((1024, len(vector)), dtype=np.float32)
+        row = self.row_of.get(item_id)
+        if row is None:
+            if self.size == len(self.vectors):
+                self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+            row = self.size
+            self.size += 1
+            self.row_of[item_id] = row
+            self.ids.append(item_id)
+            self.meta.append(meta)
+            self.assignment.append(-1)
+        else:
+            self._unassign(row)
+            self.meta[row] = meta
+        self.vectors[row] = vector
+        if self.centroids is not None:
+            self._assign(row, int(np.argmax(self.centroids @ vector)))
+        if self.size >= self.brute_force_below and self.size >= 4 * self.trained_size:
+            self.train()
+
+    def remove(self, item_id: str):
+        row = self.row_of.get(item_id)
+        if row is not None:
+            self._unassign(row)
+            self.meta[row] = None
+
+    def _assign(self, row: int, cluster: int):
+        self.assignment[row] = cluster
+        self.lists[cluster].add(row)
+
+    def _unassign(self, row: int):
+        if self.centroids is not None and self.assignment[row] >= 0:
+            self.lists[self.assignment[row]].discard(row)
+        self.assignment[row] = -1
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        data = self.vectors[:self.size]
+        rng = np.random.default_rng(seed)
+        sample = data[rng.choice(self.size, min(self.size, self.n_lists * 256), replace=False)]
+        centroids = sample[rng.choice(len(sample), self.n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(self.n_lists):
+                members = sample[labels == cluster]
+                if len(members):
+                    mean = members.sum(axis=0)
+                    centroids[cluster] = mean / (np.linalg.norm(mean) or 1)
+        self.centroids = centroids
+        self.lists = [set() for _ in range(self.n_lists)]
+        for start in range(0, self.size, 65536):
+            labels = np.argmax(data[start:start + 65536] @ centroids.T, axis=1)
+            for offset, cluster in enumerate(labels):
+                if self.meta[start + offset] is not None:
+                    self._assign(start + offset, int(cluster))
+        self.trained_size = self.size
+
+    def _matches(self, row: int, filters: Optional[dict]) -> bool:
+        meta = self.meta[row]
+        return meta is not None and all(meta.get(field) == value for field, value in (filters or {}).items())
+
+    def _top(self, rows: np.ndarray, query: np.ndarray, k: int) -> List[tuple]:
+        if len(rows) == 0:
+            return []
+        scores = self.vectors[rows] @ query
+        top = np.argpartition(-scores, min(k, len(rows)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[rows[i]], float(scores[i])) for i in top]
+
+    def search(self, query: np.ndarray, k: int = 10, filters: Optional[dict] = None, exact: bool = False) -> List[tuple]:
+        if self.size == 0:
+            return []
+        if self.centroids is None or exact:
+            rows = np.array([row for row in range(self.size) if self._matches(row, filters)], dtype=np.int64)
+            return self._top(rows, query, k)
+        probes = np.argsort(-(self.centroids @ query))[:self.n_probe]
+        rows = np.array([row for cluster in probes for row in self.lists[cluster] if self._matches(row, filters)], dtype=np.int64)
+        hits = self._top(rows, query, k)
+        if len(hits) < k and filters:
+            return self.search(query, k, filters, exact=True)
+        return hits
+
+class JobVectorIndex(SyncedIndex):
+    """Embeddings of active jobs, kept in step with create_job and the jobs collection."""
+
+    name = "Job vector index"
+
+    def __init__(self):
+        super().__init__()
+        self.index = VectorIndex()
+
+    def upsert(self, job: dict):
+        if not job.get("is_active", True):
+            self.index.remove(job["id"])
+            return
+        meta = {"location_city": job.get("location_city"), "role": job.get("role"), "shift_timing": job.get("shift_timing")}
+        self.index.add(job["id"], get_embedder().embed(job_text(job)), meta)
+
+    async def sync(self):
+        projection = {"_id": 0, "id": 1, "title": 1, "role": 1, "description": 1, "requirements": 1,
+                      "benefits": 1, "location_city": 1, "shift_timing": 1, "is_active": 1, "created_at": 1}
+        query = {"created_at": {"$gte": self.watermark}} if self.watermark else {}
+        async for job in db.jobs.find(query, projection).batch_size(5000):
+            self.upsert(job)
+            self.advance(job.get("created_at"))
+
+    def recommend(self, profile: dict, k: int = 10) -> List[tuple]:
+        query = get_embedder().embed(worker_text(profile))
+        hits = self.index.search(query, k, {"location_city": profile.get("location_city")})
+        return hits or self.index.search(query, k)
+
+job_vector_index = JobVectorIndex()
+
+# Job alerts
+ALERT_DIGEST_SECONDS = int(os.environ.get('ALERT_DIGEST_SECONDS', 900))
+ALERT_FANOUT_BATCH = int(os.environ.get('ALERT_FANOUT_BATCH', 1000))
+
+class AlertIndex(SyncedIndex):
+    """Reverse (percolator) index of job alerts.
+
+    Each alert expands into role x city x shift keys, with "*" standing in
+    for a dimension the alert leaves open, and every key keeps a roaring
+    bitmap of alert slots. A new job probes the 8 keys its own role, city
+    and shift can match, so percolating it costs time proportional to the
+    matching alerts rather than to all subscribers.
+    """
+
+    ANY = "*"
+    name = "Alert index"
+
+    def __init__(self):
+        super().__init__()
+        self.owners: List[str] = []
+        self.slot_of: Dict[str, int] = {}
+        self.keys_of: Dict[int, List[tuple]] = {}
+        self.postings: Dict[tuple, BitMap] = {}
+        self.min_wage: Dict[int, float] = {}
+        self.wage_floor = BitMap()
+
+    @staticmethod
+    def normalize(value: Any) -> str:
+        return str(value).strip().lower()
+
+    def _keys(self, alert: dict) -> List[tuple]:
+        dimensions = [
+            sorted({self.normalize(v) for v in alert.get(field) or []}) or [self.ANY]
+            for field in ("roles", "cities", "shifts")
+        ]
+        return [(role, city, shift) for role in dimensions[0] for city in dimensions[1] for shift in dimensions[2]]
+
+    def upsert(self, alert: dict):
+        slot = self.slot_of.get(alert["id"])
+        if slot is None:
+            slot = len(self.owners)
+            self.owners.append(alert["user_id"])
+            self.slot_of[alert["id"]] = slot
+        else:
+            self._clear(slot)
+        if not alert.get("is_active", True):
+            return
+        keys = self._keys(alert)
+        for key in keys:
+            self.postings.setdefault(key, BitMap()).add(slot)
+        self.keys_of[slot] = keys
+        if alert.get("min_wage"):
+            self.min_wage[slot] = alert["min_wage"]
+            self.wage_floor.add(slot)
+
+    def _clear(self, slot: int):
+        for key in self.keys_of.pop(slot, []):
+            bitmap = self.postings.get(key)
+            if bitmap is not None:
+                bitmap.discard(slot)
+                if not bitmap:
+                    del self.postings[key]
+        self.min_wage.pop(slot, None)
+        self.wage_floor.discard(slot)
+
+    def match(self, job: dict) -> List[str]:
+        """User ids with at least one alert matching the job."""
+        role, city, shift = (self.normalize(job.get(field)) for field in ("role", "location_city", "shift_timing"))
+        probes = [(r, c, s) for r in (role, self.ANY) for c in (city, self.ANY) for s in (shift, self.ANY)]
+        slots = BitMap.union(BitMap(), *(self.postings[key] for key in probes if key in self.postings))
+        # Wage floors are rare, so only those slots are checked one by one
+        wage = job.get("wage_max") or 0
+        slots -= BitMap(slot for slot in slots & self.wage_floor if self.min_wage[slot] > wage)
+        owners = self.owners
+        return list({owners[slot] for slot in slots})
+
+    async def sync(self):
+        projection = {"_id": 0, "id": 1, "user_id": 1, "roles": 1, "cities": 1, "shifts": 1,
+                      "min_wage": 1, "is_active": 1, "updated_at": 1}
+        query = {"updated_at": {"$gte": self.watermark}} if self.watermark else {}
+        async for alert in db.job_alerts.find(query, projection).batch_size(5000):
+            self.upsert(alert)
+            self.advance(alert.get("updated_at"))
+
+alert_index = AlertIndex()
+
+async def save_profile_alert(user_id: str, profile: dict):
+    """Keep the worker's profile-derived alert in step with their preferences."""
+    now = datetime.now(timezone.utc)
+    fields = {
+        "roles": profile.get("preferred_roles", []),
+        "cities": [profile["location_city"]] if profile.get("location_city") else [],
+        "shifts": profile.get("preferred_shifts", []),
+        "is_active": True,
+        "updated_at": now,
+    }
+    alert = await db.job_alerts.find_one_and_update(
+        {"user_id": user_id, "source": "profile"},
+        {"$set": fields, "$setOnInsert": {"id": str(uuid.uuid4()), "name": "Jobs matching my profile", "min_wage": None, "created_at": now}},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    alert_index.upsert(alert)
+
+async def backfill_profile_alerts():
+    """Create the profile-derived alert of every worker profile saved before job alerts existed."""
+    count = 0
+    async for profile in db.worker_profiles.find({}, {"_id": 0}).batch_size(1000):
+        await save_profile_alert(profile["user_id"], profile)
+        count += 1
+    logging.info("Saved %s profile alerts", count)
+
+# Staffing optimizer
+# Fills the open positions of a chain's jobs from their applicant pools in one
+# pass: every (applicant, job) pair the worker applied to gets a fit score,
+# each job contributes one column per open position, and a rectangular
+# assignment (shortest augmenting path Hungarian, numpy only) picks the
+# shortlist with the highest total fit where no worker takes two positions
+EXPERIENCE_MIN_YEARS = {"entry": 0, "1-2": 1, "3-5": 3, "5+": 5}
+AVAILABILITY_FIT = {"immediate": 1.0, "within_week": 0.6, "within_month": 0.2}
+STAFFING_WEIGHTS = {"role": 0.35, "city": 0.25, "shift": 0.15, "experience": 0.15, "availability": 0.10}
+# Application statuses that already hold one of a job's positions
+COMMITTED_STATUSES = ["shortlisted", "interview", "offered", "accepted"]
+
+def staffing_scores(profiles: List[dict], jobs: List[dict]) -> np.ndarray:
+    """Fit in [0, 1] of every worker profile (rows) for every job (columns)."""
+    roles = sorted({job["role"] for job in jobs})
+    shifts = sorted({job["shift_timing"] for job in jobs})
+    cities = sorted({job["location_city"] for job in jobs})
+    role_col = {role: i for i, role in enumerate(roles)}
+    shift_col = {shift: i for i, shift in enumerate(shifts)}
+    city_col = {city: i for i, city in enumerate(cities)}
+    
+    worker_roles = np.zeros((len(profiles), len(roles)), dtype=bool)
+    worker_shifts = np.zeros((len(profiles), len(shifts)), dtype=bool)
+    worker_city = np.full(len(profiles), -1)
+    years = np.zeros(len(profiles))
+    availability = np.zeros(len(profiles))
+    for w, profile in enumerate(profiles):
+        for role in profile.get("preferred_roles", []):
+            if role in role_col:
+                worker_roles[w, role_col[role]] = True
+        preferred = profile.get("preferred_shifts", [])
+        for shift, s in shift_col.items():
+            worker_shifts[w, s] = shift in preferred or "flexible" in preferred
+        worker_city[w] = city_col.get(profile.get("location_city"), -1)
+        years[w] = profile.get("experience_years", 0)
+        availability[w] = AVAILABILITY_FIT.get(profile.get("availability"), 0.0)
+    
+    job_role = np.array([role_col[job["role"]] for job in jobs])
+    job_shift = np.array([shift_col[job["shift_timing"]] for job in jobs])
+    job_city = np.array([city_col[job["location_city"]] for job in jobs])
+    required = np.array([EXPERIENCE_MIN_YEARS.get(job.get("experience_required"), 0) for job in jobs], dtype=float)
+    
+    experience = np.minimum(1.0, (years[:, None] + 1) / (required[None, :] + 1))
+    return (
+        STAFFING_WEIGHTS["role"] * worker_roles[:, job_role]
+        + STAFFING_WEIGHTS["city"] * (worker_city[:, None] == job_city[None, :])
+        + STAFFING_WEIGHTS["shift"] * worker_shifts[:, job_shift]
+        + STAFFING_WEIGHTS["experience"] * experience
+        + STAFFING_WEIGHTS["availability"] * availability[:, None]
+    )
+
+def solve_assignment(cost: np.ndarray):
+    """Minimum-cost assignment of every row of `cost` to a distinct column.
+    
+    Jonker-Volgenant style shortest augmenting paths, as in
+    scipy.optimize.linear_sum_assignment, with the inner loop over columns
+    vectorised. Transposes when there are more rows than columns, so the
+    smaller side is fully assigned. Returns (rows, cols) index arrays.
+    """
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = np.ascontiguousarray(cost.T)
+    n, m = cost.shape
+    u = np.zeros(n)
+    v = np.zeros(m)
+    row_of_col = np.full(m, -1)
+    col_of_row = np.full(n, -1)
+    
+    for start in range(n):
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1)
+        scanned_cols = np.zeros(m, dtype=bool)
+        scanned_rows = [start]
+        i = start
+        min_value = 0.0
+        while True:
+            reduced = min_value + cost[i] - u[i] - v
+            better = ~scanned_cols & (reduced < shortest)
+            path[better] = i
+            shortest[better] = reduced[better]
+            candidates = np.where(scanned_cols, np.inf, shortest)
+            j = int(np.argmin(candidates))
+            min_value = candidates[j]
+            if row_of_col[j] != -1:
+                # Among equally short paths, prefer ending at a free column
+                free = np.flatnonzero((candidates == min_value) & (row_of_col == -1))
+                if len(free):
+                    j = int(free[0])
+            scanned_cols[j] = True
+            if row_of_col[j] == -1:
+                sink = j
+                break
+            i = row_of_col[j]
+            scanned_rows.append(i)
+        
+        # Update the duals, then flip the assignments along the path
+        u[start] += min_value
+        for row in scanned_rows[1:]:
+            u[row] += min_value - shortest[col_of_row[row]]
+        v[scanned_cols] -= min_value - shortest[scanned_cols]
+        j = sink
+        while True:
+            i = path[j]
+            row_of_col[j] = i
+            col_of_row[i], j = j, col_of_row[i]
+            if i == start:
+                break
+    
+    rows = np.arange(n)
+    return (col_of_row, rows) if transposed else (rows, col_of_row)
+
+def plan_shortlists(jobs: List[dict], applications: List[dict], profiles: Dict[str, dict], min_score: float = 0.0) -> List[dict]:
+    """Choose which 'applied' applications to shortlist, at most one per worker.
+    
+    A job has `headcount` positions, less those already held by a
+    shortlisted or later application; workers holding one are not considered.
+    Returns the chosen applications with their fit score.
+    """
+    committed_workers = {app["worker_id"] for app in applications if app["status"] in COMMITTED_STATUSES}
+    held = {}
+    for app in applications:
+        if app["status"] in COMMITTED_STATUSES:
+            held[app["job_id"]] = held.get(app["job_id"], 0) + 1
+    job_col = {job["id"]: j for j, job in enumerate(jobs)}
+    pool = [
+        app for app in applications
+        if app["status"] == "applied" and app["job_id"] in job_col
+        and app["worker_id"] not in committed_workers and app["worker_id"] in profiles
+    ]
+    if not pool:
+        return []
+    
+    workers = sorted({app["worker_id"] for app in pool})
+    worker_row = {worker_id: w for w, worker_id in enumerate(workers)}
+    scores = staffing_scores([profiles[worker_id] for worker_id in workers], jobs)
+    # Only pairs the worker applied for are allowed
+    allowed = np.zeros(scores.shape, dtype=bool)
+    application_at = {}
+    for app in pool:
+        w, j = worker_row[app["worker_id"]], job_col[app["job_id"]]
+        allowed[w, j] = True
+        application_at[w, j] = app
+    allowed &= scores >= min_score
+    open_positions = np.array([job.get("headcount", 1) - held.get(job["id"], 0) for job in jobs])
+    # Never more columns for a job than it has applicants
+    open_positions = np.clip(np.minimum(open_positions, allowed.sum(axis=0)), 0, None)
+    
+    # Jobs sharing no applicants (typically different cities) are solved
+    # separately; the solver's cost grows faster than linearly in size
+    parent = list(range(len(jobs)))
+    def find(j):
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+    for w in range(len(workers)):
+        applied = np.flatnonzero(allowed[w])
+        for j in applied[1:]:
+            parent[find(j)] = find(applied[0])
+    components = {}
+    for j in np.flatnonzero(open_positions):
+        components.setdefault(find(j), []).append(j)
+    
+    plan = []
+    for component in components.values():
+        slots = np.repeat(component, open_positions[component])
+        rows = np.flatnonzero(allowed[:, component].any(axis=1))
+        # Forbidden pairs cost more than any set of allowed ones can save, so
+        # the solver maximises the number of positions filled first, then total fit
+        forbidden = 2.0 * (min(len(slots), len(rows)) + 1)
+        cost = np.where(allowed[np.ix_(rows, slots)], -scores[np.ix_(rows, slots)], forbidden)
+        for r, c in zip(*solve_assignment(cost)):
+            w, j = rows[r], slots[c]
+            if allowed[w, j]:
+                plan.append({**application_at[w, j], "score": round(float(scores[w, j]), 4)})
+    return plan
+
+# External dependencies
+# Calls to third parties (LLM, Stripe) go through a Dependency: a timeout, a
+# bulkhead capping concurrent calls, and a circuit breaker that fails fast
+# while the dependency is down, so callers take their fallback immediately
+# instead of tying up a request for the full provider timeout
+class DependencyUnavailable(Exception):
+    """The call was not attempted (breaker open, bulkhead full) or timed out."""
+
+    def __init__(self, dependency: str, reason: str):
+        super().__init__(f"{dependency} unavailable: {reason}")
+        self.dependency = dependency
+        self.reason = reason
+
+class Dependency:
+    """Timeout, bulkhead and circuit breaker for one external dependency.
+
+    The breaker opens after failure_threshold consecutive failures and rejects
+    calls for reset_seconds; it then goes half-open and lets up to
+    half_open_calls trial calls through, closing again on a success and
+    re-opening on a failure. Settings come from <NAME>_TIMEOUT_SECONDS,
+    <NAME>_MAX_CONCURRENCY, <NAME>_FAILURE_THRESHOLD and <NAME>_RESET_SECONDS.
+    """
+
+    def __init__(self, name: str, timeout: float, max_concurrency: int, failure_threshold: int = 5,
+                 reset_seconds: float = 30, half_open_calls: int = 1):
+        prefix = name.upper()
+        self.name = name
+        self.timeout = float(os.environ.get(f'{prefix}_TIMEOUT_SECONDS', timeout))
+        self.max_concurrency = int(os.environ.get(f'{prefix}_MAX_CONCURRENCY', max_concurrency))
+        self.failure_threshold = int(os.environ.get(f'{prefix}_FAILURE_THRESHOLD', failure_threshold))
+        self.reset_seconds = float(os.environ.get(f'{prefix}_RESET_SECONDS', reset_seconds))
+        self.half_open_calls = half_open_calls
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.in_flight = 0
+        self.trials = 0
+        self.counters = {"calls": 0, "successes": 0, "failures": 0, "timeouts": 0,
+                         "rejected_open": 0, "rejected_bulkhead": 0, "opened": 0}
+
+    def _admit(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.counters["rejected_open"] += 1
+                raise DependencyUnavailable(self.name, "circuit open")
+            self.state = "half_open"
+            self.trials = 0
+        if self.state == "half_open":
+            if self.trials >= self.half_open_calls:
+                self.counters["rejected_open"] += 1
+                raise DependencyUnavailable(self.name, "circuit half-open, trial in progress")
+            self.trials += 1
+        if self.in_flight >= self.max_concurrency:
+            self.counters["rejected_bulkhead"] += 1
+            raise DependencyUnavailable(self.name, "too many concurrent calls")
+
+    def _record(self, success: bool):
+        if success:
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            if self.state == "half_open":
+                logging.info("%s circuit closed", self.name)
+            self.state = "closed"
+            return
+        self.counters["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                logging.warning("%s circuit opened after %s failures", self.name, self.consecutive_failures)
+                self.counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def call(self, fn, *args, record_failures: bool = True, **kwargs):
+        """Await fn(*args, **kwargs) under the timeout, bulkhead and breaker.
+
+        Raises DependencyUnavailable when the call is rejected or times out;
+        other exceptions from fn propagate. With record_failures=False those
+        exceptions don't count towards opening the breaker (for errors caused
+        by the caller's input rather than the dependency).
+        """
+        self._admit()
+        self.counters["calls"] += 1
+        self.in_flight += 1
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            self._record(False)
+            raise DependencyUnavailable(self.name, f"timed out after {self.timeout}s")
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. a dashboard section timeout); that says
+            # nothing about the dependency, so hand the trial slot back
+            if self.state == "half_open":
+                self.trials -= 1
+            raise
+        except Exception:
+            if record_failures:
+                self._record(False)
+            elif self.state == "half_open":
+                self.trials -= 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self._record(True)
+        return result
+
+    def snapshot(self) -> dict:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            state = "half_open"
+        else:
+            state = self.state
+        return {
+            "state": state,
+            "in_flight": self.in_flight,
+            "consecutive_failures": self.consecutive_failures,
+            "timeout_seconds": self.timeout,
+            "max_concurrency": self.max_concurrency,
+            **self.counters,
+        }
+
+DEPENDENCIES = {
+    "llm": Dependency("llm", timeout=8, max_concurrency=20, failure_threshold=5, reset_seconds=30),
+    "stripe": Dependency("stripe", timeout=10, max_concurrency=20, failure_threshold=5, reset_seconds=20),
+}
+
+# Background tasks
+# Side effects (SMS, notifications, email) are queued in background_tasks and
+# run by TaskQueue, either in the API process (TASK_QUEUE_IN_PROCESS) or by
+# the standalone worker: python server.py worker
+TASK_QUEUE_IN_PROCESS = os.environ.get('TASK_QUEUE_IN_PROCESS', 'true').lower() == 'true'
+TASK_POLL_SECONDS = float(os.environ.get('TASK_POLL_SECONDS', 1))
+TASK_RETENTION_SECONDS = int(os.environ.get('TASK_RETENTION_SECONDS', 7 * 86400))
+
+@dataclass
+class TaskSpec:
+    handler: Any
+    concurrency: int
+    max_attempts: int
+    timeout: float
+    backoff_seconds: float
+
+TASK_HANDLERS: Dict[str, TaskSpec] = {}
+
+def task_handler(task_type: str, concurrency: int = 10, max_attempts: int = 5, timeout: float = 30, backoff_seconds: float = 5):
+    def register(handler):
+        TASK_HANDLERS[task_type] = TaskSpec(handler, concurrency, max_attempts, timeout, backoff_seconds)
+        return handler
+    return register
+
+task_queue: Optional["TaskQueue"] = None
+
+async def enqueue_task(task_type: str, payload: dict, delay_seconds: float = 0):
+    await enqueue_tasks(task_type, [payload], delay_seconds)
+
+async def enqueue_tasks(task_type: str, payloads: List[dict], delay_seconds: float = 0):
+    """Queue one task per payload with a single insert."""
+    if task_type not in TASK_HANDLERS:
+        raise ValueError(f"Unknown task type {task_type}")
+    if not payloads:
+        return
+    now = datetime.now(timezone.utc)
+    request_id = (log_context.get() or {}).get("request_id")
+    await db.background_tasks.insert_many([{
+        "id": str(uuid.uuid4()),
+        "type": task_type,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "run_at": now + timedelta(seconds=delay_seconds),
+        "created_at": now,
+        "request_id": request_id,
+    } for payload in payloads])
+    if task_queue is not None:
+        task_queue.notify()
+
+class TaskQueue:
+    """Claims due tasks from background_tasks and runs them with per-type limits.
+
+    Failed tasks are retried with exponential backoff and moved to the 'dead'
+    status after max_attempts; tasks left 'running' by a crashed process are
+    reclaimed once their lock expires.
+    """
+
+    def __init__(self, poll_seconds: float = TASK_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._active: Dict[str, int] = {task_type: 0 for task_type in TASK_HANDLERS}
+        self._running: set = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        self._wakeup.set()
+
+    def start(self):
+        self._loop_task = asyncio.create_task(self.run())
+
+    async def stop(self, grace_seconds: float = 10):
+        self._stopping = True
+        self._wakeup.set()
+        if self._loop_task:
+            await self._loop_task
+        if self._running:
+            await asyncio.wait(self._running, timeout=grace_seconds)
+
+    async def run(self):
+        while not self._stopping:
+            claimed = False
+            for task_type, spec in TASK_HANDLERS.items():
+                while self._active.get(task_type, 0) < spec.concurrency and not self._stopping:
+                    try:
+                        task = await self._claim(task_type, spec)
+                    except Exception as e:
+                        logging.error("Task claim failed: %s", e)
+                        task = None
+                    if not task:
+                        break
+                    claimed = True
+                    self._active[task_type] = self._active.get(task_type, 0) + 1
+                    running = asyncio.create_task(self._execute(spec, task))
+                    self._running.add(running)
+                    running.add_done_callback(self._running.discard)
+            if not claimed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _claim(self, task_type: str, spec: TaskSpec) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await db.background_tasks.find_one_and_update(
+            {"type": task_type, "$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "locked_until": {"$lt": now}},
+            ]},
+            {"$set": {"status": "running", "locked_until": now + timedelta(seconds=spec.timeout * 2)}, "$inc": {"attempts": 1}},
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _execute(self, spec: TaskSpec, task: dict):
+        log_context.set({"request_id": task.get("request_id"), "task_id": task["id"]})
+        try:
+            await asyncio.wait_for(spec.handler(task["payload"]), spec.timeout)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if task["attempts"] >= spec.max_attempts:
+                logging.error("Task %s %s dead-lettered after %s attempts: %s", task["type"], task["id"], task["attempts"], error)
+                update = {"status": "dead", "last_error": error}
+            else:
+                delay = spec.backoff_seconds * 2 ** (task["attempts"] - 1) * random.uniform(0.8, 1.2)
+                update = {"status": "queued", "last_error": error, "run_at": datetime.now(timezone.utc) + timedelta(seconds=delay)}
+            await db.background_tasks.update_one({"id": task["id"]}, {"$set": update})
+        else:
+            await db.background_tasks.update_one(
+                {"id": task["id"]},
+                {"$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}}
+            )
+        finally:
+            self._active[task["type"]] -= 1
+            self._wakeup.set()
+
+class LogSmsProvider:
+    """Local fake: records and logs messages instead of sending them."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+
+    async def send(self, phone: str, message: str):
+        self.sent.append({"phone": phone, "message": message})
+        # The body may carry an OTP, so only its length is logged
+        logger.info("SMS sent via log provider", extra={"phone": phone, "sms_length": len(message)})
+
+class TwilioSmsProvider:
+    def __init__(self):
+        self.account_sid = os.environ['TWILIO_ACCOUNT_SID']
+        self.auth_token = os.environ['TWILIO_AUTH_TOKEN']
+        self.from_number = os.environ['TWILIO_FROM_NUMBER']
+
+    async def send(self, phone: str, message: str):
+        import httpx
+        async with httpx.AsyncClient(timeout=10) as http:
+            response = await http.post(
+                f"https://api.twilio.com/2010-04-01/Accounts/{self.account_sid}/Messages.json",
+                data={"To": phone, "From": self.from_number, "Body": message},
+                auth=(self.account_sid, self.auth_token)
+            )
+            response.raise_for_status()
+
+class LogEmailProvider:
+    """Local fake: records and logs emails instead of sending them."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+
+    async def send(self, to: str, subject: str, body: str):
+        self.sent.append({"to": to, "subject": subject, "body": body})
+        # The recipient is personal data and stays out of the logs
+        logger.info("Email sent via log provider", extra={"subject": subject, "body_length": len(body)})
+
+class SmtpEmailProvider:
+    def __init__(self):
+        self.host = os.environ['SMTP_HOST']
+        self.port = int(os.environ.get('SMTP_PORT', 587))
+        self.username = os.environ.get('SMTP_USERNAME')
+        self.password = os.environ.get('SMTP_PASSWORD')
+        self.sender = os.environ['SMTP_FROM']
+
+    def _send(self, to: str, subject: str, body: str):
+        import smtplib
+        from email.message import EmailMessage
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+    async def send(self, to: str, subject: str, body: str):
+        await asyncio.to_thread(self._send, to, subject, body)
+
+SMS_PROVIDERS = {"log": LogSmsProvider, "twilio": TwilioSmsProvider}
+EMAIL_PROVIDERS = {"log": LogEmailProvider, "smtp": SmtpEmailProvider}
+
+@lru_cache(maxsize=None)
+def get_sms_provider():
+    return SMS_PROVIDERS[os.environ.get('SMS_PROVIDER', 'log')]()
+
+@lru_cache(maxsize=None)
+def get_email_provider():
+    return EMAIL_PROVIDERS[os.environ.get('EMAIL_PROVIDER', 'log')]()
+
+# Object storage
+# Worker documents are stored as content-addressed blobs (blobs/<sha256>), in
+# an S3-compatible bucket (OBJECT_STORE=s3, e.g. MinIO locally) or a local
+# directory (OBJECT_STORE=filesystem). Uploads are written part by part as
+# they stream in, and downloads go through presigned URLs so file bytes
+# never pass back through the API.
+MAX_DOCUMENT_BYTES = int(os.environ.get('MAX_DOCUMENT_BYTES', str(10 * 1024 * 1024)))
+# S3's minimum part size; also the most an upload holds in memory
+UPLOAD_PART_SIZE = max(5 * 1024 * 1024, int(os.environ.get('UPLOAD_PART_SIZE', str(5 * 1024 * 1024))))
+DOWNLOAD_URL_SECONDS = int(os.environ.get('DOWNLOAD_URL_SECONDS', '600'))
+
+class FilesystemObjectStore:
+    """Local directory store; presigned URLs point at the signed /api/files route."""
+
+    def __init__(self):
+        self.root = Path(os.environ.get('FILE_STORE_PATH', str(ROOT_DIR / 'uploads'))).resolve()
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def _parts(self, upload_id: str) -> Path:
+        return self.path(f".multipart/{upload_id}")
+
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        upload_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._parts(upload_id).mkdir, parents=True)
+        return upload_id
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> dict:
+        await asyncio.to_thread((self._parts(upload_id) / f"{part_number:05d}").write_bytes, data)
+        return {"PartNumber": part_number}
+
+    def _complete(self, key: str, upload_id: str, parts: List[dict]):
+        import shutil
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as out:
+            for part in parts:
+                with open(self._parts(upload_id) / f"{part['PartNumber']:05d}", "rb") as chunk:
+                    shutil.copyfileobj(chunk, out)
+        shutil.rmtree(self._parts(upload_id))
+
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[dict]):
+        await asyncio.to_thread(self._complete, key, upload_id, parts)
+
+    async def abort_multipart(self, key: str, upload_id: str):
+        import shutil
+        await asyncio.to_thread(shutil.rmtree, self._parts(upload_id), True)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self.path(key).exists)
+
+    async def promote(self, source: str, key: str):
+        target = self.path(key)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(os.replace, self.path(source), target)
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        target = self.path(key)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(target.write_bytes, data)
+
+    async def read(self, key: str, limit: int) -> bytes:
+        def read():
+            with open(self.path(key), "rb") as f:
+                return f.read(limit)
+        return await asyncio.to_thread(read)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self.path(key).unlink, True)
+
+    async def presigned_url(self, key: str, filename: str, content_type: str, expires_in: int) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"name": filename, "type": content_type, "expires": expires})
+        return f"/api/files/{key}?{query}&signature={file_signature(key, filename, content_type, expires)}"
+
+class S3ObjectStore:
+    """S3 or an S3-compatible server (S3_ENDPOINT_URL, e.g. MinIO); boto3 calls run in threads."""
+
+    def __init__(self):
+        import boto3
+        from botocore.config import Config
+        self.bucket = os.environ['S3_BUCKET']
+        self.s3 = boto3.client(
+            "s3",
+            endpoint_url=os.environ.get('S3_ENDPOINT_URL'),
+            region_name=os.environ.get('S3_REGION', 'us-east-1'),
+            config=Config(signature_version="s3v4", retries={"max_attempts": 3})
+        )
+
+    async def create_multipart(self, key: str, content_type: str) -> str:
+        response = await asyncio.to_thread(self.s3.create_multipart_upload, Bucket=self.bucket, Key=key, ContentType=content_type)
+        return response["UploadId"]
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> dict:
+        response = await asyncio.to_thread(
+            self.s3.upload_part, Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    async def complete_multipart(self, key: str, upload_id: str, parts: List[dict]):
+        await asyncio.to_thread(
+            self.s3.complete_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+
+    async def abort_multipart(self, key: str, upload_id: str):
+        await asyncio.to_thread(self.s3.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            await asyncio.to_thread(self.s3.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def promote(self, source: str, key: str):
+        # Server-side copy; documents are well under the 5GB single-copy limit
+        await asyncio.to_thread(self.s3.copy_object, Bucket=self.bucket, Key=key, CopySource={"Bucket": self.bucket, "Key": source})
+        await self.delete(source)
+
+    async def put(self, key: str, data: bytes, content_type: str):
+        await asyncio.to_thread(self.s3.put_object, Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+
+    async def read(self, key: str, limit: int) -> bytes:
+        response = await asyncio.to_thread(self.s3.get_object, Bucket=self.bucket, Key=key, Range=f"bytes=0-{limit - 1}")
+        return await asyncio.to_thread(response["Body"].read)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self.s3.delete_object, Bucket=self.bucket, Key=key)
+
+    async def presigned_url(self, key: str, filename: str, content_type: str, expires_in: int) -> str:
+        return await asyncio.to_thread(
+            self.s3.generate_presigned_url,
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=expires_in
+        )
+
+OBJECT_STORES = {"filesystem": FilesystemObjectStore, "s3": S3ObjectStore}
+
+@lru_cache(maxsize=None)
+def get_object_store():
+    return OBJECT_STORES[os.environ.get('OBJECT_STORE', 'filesystem')]()
+
+def file_signature(key: str, filename: str, content_type: str, expires: int) -> str:
+    import hmac
+    message = f"{key}\n{filename}\n{content_type}\n{expires}".encode()
+    return hmac.new(JWT_SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+@task_handler("send_otp_sms", concurrency=20, max_attempts=3, timeout=15, backoff_seconds=2)
+async def send_otp_sms(payload: dict):
+    await get_sms_provider().send(payload["phone"], f"Your HospitalityHub verification code is {payload['otp']}")
+
+@task_handler("notify_application_status", concurrency=20)
+async def notify_application_status(payload: dict):
+    worker, job = await asyncio.gather(
+        db.users.find_one({"id": payload["worker_id"]}, {"_id": 0, "phone": 1}),
+        db.jobs.find_one({"id": payload["job_id"]}, {"_id": 0, "title": 1, "restaurant_name": 1})
+    )
+    if not worker or not job:
+        return
+    message = f"Your application for {job['title']} at {job['restaurant_name']} is now {payload['status']}"
+    # Keyed by the event so a retried task doesn't notify twice
+    await db.notifications.update_one(
+        {"id": payload["event_id"]},
+        {"$setOnInsert": {
+            "id": payload["event_id"],
+            "user_id": payload["worker_id"],
+            "message": message,
+            "is_read": False,
+            "created_at": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+    await get_sms_provider().send(worker["phone"], message)
+
+@task_handler("email_new_applicant", concurrency=10)
+async def email_new_applicant(payload: dict):
+    restaurant = await db.users.find_one({"id": payload["restaurant_id"]}, {"_id": 0, "email": 1})
+    if not restaurant or not restaurant.get("email"):
+        return
+    await get_email_provider().send(
+        restaurant["email"],
+        f"New applicant for {payload['job_title']}",
+        f"{payload['worker_name']} applied for {payload['job_title']}. Log in to HospitalityHub to review the application."
+    )
+
+def alert_digest_bucket(now: datetime) -> int:
+    return int(now.timestamp()) // ALERT_DIGEST_SECONDS * ALERT_DIGEST_SECONDS
+
+@task_handler("update_wage_benchmark", concurrency=2, max_attempts=5, backoff_seconds=1)
+async def retry_wage_benchmark(payload: dict):
+    """Fold in a job whose wage benchmark update lost every race in create_job."""
+    job = await db.jobs.find_one(
+        {"id": payload["job_id"]},
+        {"_id": 0, "role": 1, "location_city": 1, "shift_timing": 1, "wage_min": 1, "wage_max": 1}
+    )
+    if job:
+        await update_wage_benchmark(job)
+
+@task_handler("fan_out_job_alerts", concurrency=2, timeout=300)
+async def fan_out_job_alerts(payload: dict):
+    """Add a new job to the pending digest of every worker whose alerts match it.
+
+    Digests are bucketed by ALERT_DIGEST_SECONDS: a job joins the digest of
+    the current bucket, which is sent once the bucket has closed, so no
+    further jobs can be added to a digest while it is being sent.
+    """
+    if not alert_index.loaded:
+        await alert_index.sync()
+        alert_index.loaded = True
+    job = await db.jobs.find_one({"id": payload["job_id"]}, {"_id": 0})
+    if not job or not job.get("is_active"):
+        return
+    subscribers = alert_index.match(job)
+    if not subscribers:
+        return
+    now = datetime.now(timezone.utc)
+    bucket = alert_digest_bucket(now)
+    due_at = datetime.fromtimestamp(bucket + ALERT_DIGEST_SECONDS, timezone.utc)
+    for start in range(0, len(subscribers), ALERT_FANOUT_BATCH):
+        await db.alert_digests.bulk_write([
+            UpdateOne(
+                {"_id": f"{user_id}:{bucket}"},
+                {"$addToSet": {"job_ids": job["id"]}, "$setOnInsert": {"user_id": user_id, "due_at": due_at}},
+                upsert=True
+            )
+            for user_id in subscribers[start:start + ALERT_FANOUT_BATCH]
+        ], ordered=False)
+    logging.info("Job %s matched %s alert subscribers", job["id"], len(subscribers))
+    await enqueue_task("send_alert_digests", {}, delay_seconds=(due_at - now).total_seconds() + 5)
+
+@task_handler("send_alert_digests", concurrency=1, timeout=300)
+async def send_alert_digests(payload: dict):
+    """Turn every closed digest into one in-app notification; safe to run repeatedly."""
+    while True:
+        digests = await db.alert_digests.find({"due_at": {"$lte": datetime.now(timezone.utc)}}).limit(ALERT_FANOUT_BATCH).to_list(ALERT_FANOUT_BATCH)
+        if not digests:
+            return
+        job_ids = list({job_id for digest in digests for job_id in digest["job_ids"]})
+        jobs = {
+            job["id"]: job for job in await db.jobs.find(
+                {"id": {"$in": job_ids}, "is_active": True}, {"_id": 0, "id": 1, "title": 1, "restaurant_name": 1}
+            ).to_list(None)
+        }
+        notifications = []
+        for digest in digests:
+            matched = [jobs[job_id] for job_id in digest["job_ids"] if job_id in jobs]
+            if not matched:
+                continue
+            titles = ", ".join(f"{job['title']} at {job['restaurant_name']}" for job in matched[:3])
+            more = f" and {len(matched) - 3} more" if len(matched) > 3 else ""
+            notifications.append({
+                # Derived from the digest so a retried batch doesn't notify twice
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"alert-digest:{digest['_id']}")),
+                "user_id": digest["user_id"],
+                "message": f"{len(matched)} new {'jobs match' if len(matched) > 1 else 'job matches'} your alerts: {titles}{more}",
+                "job_ids": [job["id"] for job in matched],
+                "is_read": False,
+                "created_at": datetime.now(timezone.utc),
+            })
+        if notifications:
+            try:
+                await db.notifications.insert_many(notifications, ordered=False)
+            except BulkWriteError as e:
+                if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                    raise
+        await db.alert_digests.delete_many({"_id": {"$in": [digest["_id"] for digest in digests]}})
+
+# Job translations
+# Job text (title, description, requirements) is translated segment by
+# segment, keyed by a hash of the segment, its language pair and the model,
+# so a segment shared by many jobs (a common requirement) is translated
+# once. Lookups go LRU -> translations collection -> one batched LLM call
+# for the misses; concurrent requests for the same missing segment wait on
+# the single in-flight translation instead of calling the LLM again. New
+# jobs are pre-translated in the background into the languages most workers
+# speak.
+# Profiles hold free-text languages; codes are folded into names
+LANGUAGE_ALIASES = {
+    "en": "english", "hi": "hindi", "mr": "marathi", "ta": "tamil", "te": "telugu", "kn": "kannada",
+    "bn": "bengali", "gu": "gujarati", "ml": "malayalam", "pa": "punjabi", "ur": "urdu",
+}
+
+def normalize_language(language: str) -> str:
+    language = language.strip().lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+JOB_SOURCE_LANGUAGE = normalize_language(os.environ.get('JOB_SOURCE_LANGUAGE', 'english'))
+TRANSLATION_MODEL = ("openai", "gpt-4o-mini")
+TRANSLATION_CACHE_SIZE = int(os.environ.get('TRANSLATION_CACHE_SIZE', '5000'))
+PRETRANSLATE_TOP_LANGUAGES = int(os.environ.get('PRETRANSLATE_TOP_LANGUAGES', '3'))
+# The worker language mix changes slowly; recount it at most this often per process
+TOP_LANGUAGES_TTL_SECONDS = float(os.environ.get('TOP_LANGUAGES_TTL_SECONDS', '3600'))
+
+def job_segments(job: dict) -> List[str]:
+    return [job.get("title", ""), job.get("description", ""), *job.get("requirements", [])]
+
+def translated_job(language: str, segments: List[Optional[str]]) -> Optional[dict]:
+    """The job's translated fields, or None while any segment is untranslated."""
+    if any(segment is None for segment in segments):
+        return None
+    return {"language": language, "title": segments[0], "description": segments[1], "requirements": segments[2:]}
+
+async def llm_translate(texts: List[str], language: str) -> List[str]:
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    chat = LlmChat(
+        api_key=os.environ.get('EMERGENT_LLM_KEY'),
+        session_id=f"translate_{uuid.uuid4().hex}",
+        system_message="You translate restaurant job postings. Keep wages, numbers and proper nouns unchanged."
+    ).with_model(*TRANSLATION_MODEL)
+    message = UserMessage(
+        text=f"Translate each string of this JSON array from {JOB_SOURCE_LANGUAGE} to {language}. "
+             f"Reply with only a JSON array of the {len(texts)} translations, in order.\n{json.dumps(texts, ensure_ascii=False)}"
+    )
+    response = await DEPENDENCIES["llm"].call(chat.send_message, message)
+    translations = json.loads(response.strip().removeprefix("```json").removeprefix("```").removesuffix("```"))
+    if not isinstance(translations, list) or len(translations) != len(texts) or not all(isinstance(t, str) for t in translations):
+        raise ValueError(f"Expected {len(texts)} translations, got {str(response)[:200]}")
+    return translations
+
+class Translator:
+    """Cached, coalesced translation of text segments."""
+
+    def __init__(self, size: int = TRANSLATION_CACHE_SIZE):
+        self.size = size
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._requested: "OrderedDict[tuple, float]" = OrderedDict()
+        self.hits = self.misses = self.coalesced = 0
+
+    @staticmethod
+    def key(text: str, language: str) -> str:
+        return hashlib.sha256("\0".join([*TRANSLATION_MODEL, JOB_SOURCE_LANGUAGE, language, text]).encode()).hexdigest()
+
+    def _remember(self, key: str, translation: str):
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    async def cached(self, texts: List[str], language: str) -> List[Optional[str]]:
+        """Translations already in the LRU or the collection; None for the rest. Never calls the LLM."""
+        keys = [self.key(text, language) for text in texts]
+        missing = [key for key in set(keys) if key not in self._lru]
+        if missing:
+            async for doc in db.translations.find({"_id": {"$in": missing}}, {"translation": 1}):
+                self._remember(doc["_id"], doc["translation"])
+        return [text if not text else self._lru.get(key) for text, key in zip(texts, keys)]
+
+    async def request(self, job_ids: List[str], language: str, every_seconds: float = 600):
+        """Queue background translations of jobs (one insert), each at most once per every_seconds per process."""
+        now = time.monotonic()
+        due = []
+        for job_id in job_ids:
+            key = (job_id, language)
+            if now - self._requested.get(key, -every_seconds) < every_seconds:
+                continue
+            self._requested[key] = now
+            self._requested.move_to_end(key)
+            if len(self._requested) > self.size:
+                self._requested.popitem(last=False)
+            due.append(job_id)
+        await enqueue_tasks("translate_job", [{"job_id": job_id, "language": language} for job_id in due])
+
+    async def translate(self, texts: List[str], language: str) -> List[str]:
+        """Translate texts, falling back to the original text of any segment that could not be translated."""
+        if language == JOB_SOURCE_LANGUAGE:
+            return list(texts)
+        keys = [self.key(text, language) for text in texts]
+        owned: Dict[str, str] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        for text, key in zip(texts, keys):
+            if not text or key in owned or key in waiting:
+                continue
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.hits += 1
+            elif key in self._inflight:
+                waiting[key] = self._inflight[key]
+                self.coalesced += 1
+            else:
+                # Registered before any await, so concurrent callers find it
+                self._inflight[key] = asyncio.get_running_loop().create_future()
+                owned[key] = text
+        
+        if owned:
+            try:
+                await self._fill(owned, language)
+            finally:
+                for key in owned:
+                    future = self._inflight.pop(key)
+                    future.set_result(self._lru.get(key))
+        results = {key: await asyncio.shield(future) for key, future in waiting.items()}
+        return [
+            text if not text else (self._lru.get(key) or results.get(key) or text)
+            for text, key in zip(texts, keys)
+        ]
+
+    async def _fill(self, owned: Dict[str, str], language: str):
+        async for doc in db.translations.find({"_id": {"$in": list(owned)}}, {"translation": 1}):
+            self._remember(doc["_id"], doc["translation"])
+            self.hits += 1
+        missing = {key: text for key, text in owned.items() if key not in self._lru}
+        if not missing:
+            return
+        self.misses += len(missing)
+        try:
+            translations = await llm_translate(list(missing.values()), language)
+        except DependencyUnavailable as e:
+            logging.warning("Translation to %s skipped: %s", language, e)
+            return
+        except Exception as e:
+            logging.error("Translation to %s failed: %s", language, e)
+            return
+        now = datetime.now(timezone.utc)
+        for key, translation in zip(missing, translations):
+            self._remember(key, translation)
+        try:
+            await db.translations.insert_many([
+                {"_id": key, "language": language, "text": text, "translation": translation, "created_at": now}
+                for (key, text), translation in zip(missing.items(), translations)
+            ], ordered=False)
+        except BulkWriteError as e:
+            # Another process stored the same segment first
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+
+translator = Translator()
 
-class OTPVerifyRequest(BaseModel):
-    phone: str
-    otp: str
+worker_languages_cache = {"at": None, "languages": []}
 
-class TokenResponse(BaseModel):
-    access_token: str
-    token_type: str = "bearer"
-    user_id: str
-    role: str
+async def top_worker_languages(limit: int = PRETRANSLATE_TOP_LANGUAGES) -> List[str]:
+    """The most common languages on worker profiles, other than the one jobs are posted in."""
+    cached_at = worker_languages_cache["at"]
+    if cached_at is not None and time.monotonic() - cached_at < TOP_LANGUAGES_TTL_SECONDS:
+        return worker_languages_cache["languages"][:limit]
+    rows = await db.worker_profiles.aggregate([
+        {"$unwind": "$languages"},
+        {"$group": {"_id": {"$toLower": "$languages"}, "workers": {"$sum": 1}}}
+    ]).to_list(None)
+    workers = {}
+    for row in rows:
+        language = normalize_language(row["_id"])
+        workers[language] = workers.get(language, 0) + row["workers"]
+    workers.pop(JOB_SOURCE_LANGUAGE, None)
+    worker_languages_cache.update(at=time.monotonic(), languages=sorted(workers, key=workers.get, reverse=True))
+    return worker_languages_cache["languages"][:limit]
 
-class JobCreateRequest(BaseModel):
-    title: str
-    role: str
-    location_city: str
-    shift_timing: str
-    experience_required: str
-    wage_min: float
-    wage_max: float
-    description: str
-    requirements: List[str] = []
-    benefits: List[str] = []
+@task_handler("translate_job", concurrency=4, timeout=120)
+async def translate_job(payload: dict):
+    job = await db.jobs.find_one({"id": payload["job_id"]}, {"_id": 0, "title": 1, "description": 1, "requirements": 1})
+    if not job:
+        return
+    languages = [normalize_language(payload["language"])] if payload.get("language") else await top_worker_languages()
+    segments = job_segments(job)
+    for language in languages:
+        await translator.translate(segments, language)
+        if translated_job(language, await translator.cached(segments, language)) is None:
+            # LLM unavailable or its reply unusable; let the task queue retry later
+            raise RuntimeError(f"Translation of job {payload['job_id']} to {language} failed")
 
-class ApplicationStatusUpdate(BaseModel):
-    status: str
+# Worker document processing
+# Uploaded resumes and certificates are read once in the background: images
+# get a thumbnail, text is extracted (plain text, or PDF via pypdf) and
+# matched against the role vocabulary, and the terms found are kept on the
+# worker profile as document_skills so candidate search can filter on them.
+DOCUMENT_TYPES = {
+    "application/pdf": (b"%PDF-",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "text/plain": (),
+}
+THUMBNAIL_SIZE = (256, 256)
+DOCUMENT_EXCERPT_CHARS = 500
+# Matched term -> (role concept, pattern); a resume mentioning "espresso" also counts as "barista"
+DOCUMENT_SKILL_PATTERNS = {
+    term.replace("_", " "): (role, re.compile(rf"\b{re.escape(term.replace('_', ' '))}\b", re.IGNORECASE))
+    for role, terms in ROLE_SYNONYMS.items()
+    for term in [role, *terms]
+}
 
-class ReviewCreateRequest(BaseModel):
-    restaurant_id: str
-    overall_rating: float
-    wage_accuracy: float
-    work_environment: float
-    career_growth: float
-    compliance: float
-    comment: str = ""
+def sniff_document(content_type: str, head: bytes) -> bool:
+    """Whether the first bytes of an upload match its declared type."""
+    if content_type == "text/plain":
+        return b"\x00" not in head
+    return any(head.startswith(magic) for magic in DOCUMENT_TYPES[content_type])
 
-class WorkerProfileRequest(BaseModel):
-    location_city: str
-    experience_years: int
-    preferred_roles: List[str]
-    preferred_shifts: List[str]
-    languages: List[str]
-    availability: str
-    skills: List[str] = []
+def make_thumbnail(data: bytes) -> bytes:
+    from io import BytesIO
+    from PIL import Image
+    with Image.open(BytesIO(data)) as image:
+        # Let the JPEG decoder downscale while decoding instead of at full size
+        image.draft("RGB", THUMBNAIL_SIZE)
+        image = image.convert("RGB")
+        image.thumbnail(THUMBNAIL_SIZE)
+        out = BytesIO()
+        image.save(out, "JPEG", quality=80)
+    return out.getvalue()
 
-class RestaurantProfileRequest(BaseModel):
-    company_name: str
-    number_of_outlets: int
-    manager_name: str
-    location_cities: List[str]
-    description: str = ""
+def extract_document_text(data: bytes, content_type: str) -> str:
+    if content_type == "text/plain":
+        return data.decode("utf-8", errors="replace")
+    if content_type == "application/pdf":
+        from io import BytesIO
+        from pypdf import PdfReader
+        return "\n".join(page.extract_text() or "" for page in PdfReader(BytesIO(data)).pages)
+    return ""
 
-# Helper functions
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def document_skills(text: str) -> List[str]:
+    skills = set()
+    for term, (role, pattern) in DOCUMENT_SKILL_PATTERNS.items():
+        if pattern.search(text):
+            skills.update((term, role))
+    return sorted(skills)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def refresh_document_skills(user_id: str):
+    """Recompute the profile's document_skills from the worker's processed documents."""
+    skills = set()
+    async for document in db.worker_documents.find({"user_id": user_id, "status": "ready"}, {"_id": 0, "skills_found": 1}):
+        skills.update(document.get("skills_found") or [])
+    await db.worker_profiles.update_one(
+        {"user_id": user_id},
+        {"$set": {"document_skills": sorted(skills), "updated_at": datetime.now(timezone.utc)}}
+    )
 
-def create_access_token(data: dict) -> str:
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+@task_handler("process_worker_document", concurrency=2, timeout=120)
+async def process_worker_document(payload: dict):
+    document = await db.worker_documents.find_one({"id": payload["document_id"]}, {"_id": 0})
+    if not document:
+        return
+    # Identical bytes were already processed for another upload
+    processed = await db.worker_documents.find_one(
+        {"sha256": document["sha256"], "status": "ready"},
+        {"_id": 0, "thumbnail_key": 1, "skills_found": 1, "text_excerpt": 1}
+    )
+    if processed:
+        update = processed
+    else:
+        store = get_object_store()
+        data = await store.read(document["storage_key"], MAX_DOCUMENT_BYTES)
+        update = {"thumbnail_key": None, "skills_found": [], "text_excerpt": ""}
+        try:
+            if document["content_type"].startswith("image/"):
+                thumbnail_key = f"thumbs/{document['sha256']}.jpg"
+                await store.put(thumbnail_key, await asyncio.to_thread(make_thumbnail, data), "image/jpeg")
+                update["thumbnail_key"] = thumbnail_key
+            text = await asyncio.to_thread(extract_document_text, data, document["content_type"])
+        except ImportError as e:
+            logging.warning("Document %s not processed, missing dependency: %s", document["id"], e)
+            text = ""
+        update["skills_found"] = document_skills(text)
+        update["text_excerpt"] = " ".join(text.split())[:DOCUMENT_EXCERPT_CHARS]
+    await db.worker_documents.update_one({"id": document["id"]}, {"$set": {**update, "status": "ready"}})
+    await refresh_document_skills(document["user_id"])
+
+async def run_worker():
+    """Standalone task worker; runs until SIGINT/SIGTERM."""
+    global task_queue
+    await client.admin.command("ping")
+    task_queue = TaskQueue()
+    alert_index.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.create_task(task_queue.stop()))
+    logging.info("Task worker started for %s", ", ".join(TASK_HANDLERS))
+    await task_queue.run()
+    await alert_index.stop()
+    client.close()
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    from jose import JWTError, jwt
     try:
         token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
@@ -216,10 +3109,24 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         role = payload.get("role")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication")
+        context = log_context.get()
+        if context is not None:
+            context["user_id"] = user_id
         return {"user_id": user_id, "role": role}
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
+def is_admin_key(key: Optional[str]) -> bool:
+    import hmac
+    return bool(ADMIN_API_KEY and key and hmac.compare_digest(key, ADMIN_API_KEY))
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)):
+    if not is_admin_key(x_admin_key):
+        raise HTTPException(status_code=403, detail="Access denied")
+
+async def get_loaders(current_user: dict = Depends(get_current_user)) -> RequestLoaders:
+    return RequestLoaders(current_user["user_id"])
+
 # Auth Routes
 @api_router.get("/")
 async def root():
@@ -242,7 +3149,6 @@ async def register(req: RegisterRequest):
     )
     
     user_dict = user.model_dump()
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
     await db.users.insert_one(user_dict)
     
     # Create token
@@ -264,8 +3170,8 @@ async def send_otp(req: OTPRequest):
     # Generate 6-digit OTP
     otp = str(random.randint(100000, 999999))
     otp_storage[req.phone] = otp
-    # In production: Send via Twilio SMS
-    logging.info(f"OTP for {req.phone}: {otp}")
+    await enqueue_task("send_otp_sms", {"phone": req.phone, "otp": otp})
+    logger.info("OTP issued", extra={"phone": req.phone})
     return {"message": "OTP sent successfully", "otp": otp}  # Remove otp in production
 
 @api_router.post("/auth/verify-otp")
@@ -289,13 +3195,17 @@ async def create_worker_profile(req: WorkerProfileRequest, current_user: dict =
     
     profile = WorkerProfile(user_id=current_user["user_id"], **req.model_dump())
     profile_dict = profile.model_dump()
-    profile_dict['created_at'] = profile_dict['created_at'].isoformat()
-    await db.worker_profiles.insert_one(profile_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.worker_profiles.insert_one(profile_dict, session=session)
+    candidate_index.upsert(profile_dict)
+    await save_profile_alert(current_user["user_id"], profile_dict)
     return profile
 
 @api_router.get("/workers/profile")
 async def get_worker_profile(current_user: dict = Depends(get_current_user)):
-    profile = await db.worker_profiles.find_one({"user_id": current_user["user_id"]}, {"_id": 0})
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        profile = await reader.worker_profiles.find_one({"user_id": current_user["user_id"]}, {"_id": 0}, session=session)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
@@ -305,16 +3215,173 @@ async def update_worker_profile(req: WorkerProfileRequest, current_user: dict =
     if current_user["role"] != "worker":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    result = await db.worker_profiles.update_one(
-        {"user_id": current_user["user_id"]},
-        {"$set": req.model_dump()}
-    )
+    update = {**req.model_dump(), "updated_at": datetime.now(timezone.utc)}
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        # The stored profile keeps fields the request doesn't carry (document_skills)
+        profile = await db.worker_profiles.find_one_and_update(
+            {"user_id": current_user["user_id"]},
+            {"$set": update},
+            projection=CandidateIndex.projection(),
+            return_document=ReturnDocument.AFTER,
+            session=session
+        )
     
-    if result.matched_count == 0:
+    if profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    candidate_index.upsert(profile)
+    await save_profile_alert(current_user["user_id"], update)
     return {"message": "Profile updated successfully"}
 
+# Worker Document Routes
+@api_router.post("/workers/documents")
+async def upload_worker_document(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=200),
+    kind: str = Query("resume", pattern="^(resume|certificate|other)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream the raw request body into the object store.
+
+    The body is hashed and uploaded one part at a time as it arrives, in
+    parts of exactly UPLOAD_PART_SIZE (the last may be shorter), so an upload
+    holds at most one part plus the chunk being received in memory; identical
+    files from any worker end up as a single stored blob.
+    """
+    if current_user["role"] != "worker":
+        raise HTTPException(status_code=403, detail="Access denied")
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in DOCUMENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported document type: {content_type or 'none'}")
+    try:
+        declared_size = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared_size > MAX_DOCUMENT_BYTES:
+        raise HTTPException(status_code=413, detail="Document too large")
+    filename = re.sub(r'[\\/"\r\n]', "_", filename)
+    
+    store = get_object_store()
+    staging_key = f"staging/{uuid.uuid4().hex}"
+    upload_id = await store.create_multipart(staging_key, content_type)
+    digest = hashlib.sha256()
+    head = bytearray()
+    buffer = bytearray()
+    parts = []
+    size = 0
+    sniffed = False
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_DOCUMENT_BYTES:
+                raise HTTPException(status_code=413, detail="Document too large")
+            digest.update(chunk)
+            if not sniffed:
+                head += chunk[:512 - len(head)]
+                if len(head) == 512:
+                    if not sniff_document(content_type, bytes(head)):
+                        raise HTTPException(status_code=415, detail=f"File contents do not match {content_type}")
+                    sniffed = True
+            # A full part is handed to the store as is, not copied
+            view = memoryview(chunk)
+            while view:
+                room = UPLOAD_PART_SIZE - len(buffer)
+                buffer += view[:room]
+                view = view[room:]
+                if len(buffer) == UPLOAD_PART_SIZE:
+                    part, buffer = buffer, bytearray()
+                    parts.append(await store.upload_part(staging_key, upload_id, len(parts) + 1, part))
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty document")
+        if not sniffed and not sniff_document(content_type, bytes(head)):
+            raise HTTPException(status_code=415, detail=f"File contents do not match {content_type}")
+        if buffer:
+            parts.append(await store.upload_part(staging_key, upload_id, len(parts) + 1, buffer))
+        await store.complete_multipart(staging_key, upload_id, parts)
+    except BaseException:
+        await store.abort_multipart(staging_key, upload_id)
+        raise
+    
+    sha256 = digest.hexdigest()
+    storage_key = f"blobs/{sha256[:2]}/{sha256}"
+    if await store.exists(storage_key):
+        await store.delete(staging_key)
+    else:
+        await store.promote(staging_key, storage_key)
+    
+    document = WorkerDocument(
+        user_id=current_user["user_id"],
+        kind=kind,
+        filename=filename,
+        content_type=content_type,
+        size=size,
+        sha256=sha256,
+        storage_key=storage_key
+    )
+    await db.worker_documents.insert_one(document.model_dump())
+    await enqueue_task("process_worker_document", {"document_id": document.id})
+    return document
+
+@api_router.get("/workers/documents")
+async def get_worker_documents(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "worker":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return await db.worker_documents.find({"user_id": current_user["user_id"]}, {"_id": 0}).sort("created_at", -1).to_list(100)
+
+@api_router.get("/workers/documents/{document_id}/url")
+async def get_worker_document_url(document_id: str, thumbnail: bool = False, current_user: dict = Depends(get_current_user)):
+    """Short-lived download link for the owner, or a restaurant the worker applied to."""
+    document = await db.worker_documents.find_one({"id": document_id}, {"_id": 0})
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if document["user_id"] != current_user["user_id"]:
+        if current_user["role"] != "restaurant":
+            raise HTTPException(status_code=403, detail="Access denied")
+        applications = await db.applications.find({"worker_id": document["user_id"]}, {"_id": 0, "job_id": 1}).to_list(1000)
+        job = await db.jobs.find_one(
+            {"id": {"$in": [a["job_id"] for a in applications]}, "restaurant_id": current_user["user_id"]}, {"_id": 0, "id": 1}
+        )
+        if not job:
+            raise HTTPException(status_code=403, detail="Access denied")
+    
+    if thumbnail:
+        if not document.get("thumbnail_key"):
+            raise HTTPException(status_code=404, detail="No thumbnail for this document")
+        key, filename, content_type = document["thumbnail_key"], f"{document['filename']}.jpg", "image/jpeg"
+    else:
+        key, filename, content_type = document["storage_key"], document["filename"], document["content_type"]
+    url = await get_object_store().presigned_url(key, filename, content_type, DOWNLOAD_URL_SECONDS)
+    return {"url": url, "expires_in": DOWNLOAD_URL_SECONDS}
+
+@api_router.delete("/workers/documents/{document_id}")
+async def delete_worker_document(document_id: str, current_user: dict = Depends(get_current_user)):
+    document = await db.worker_documents.find_one({"id": document_id, "user_id": current_user["user_id"]}, {"_id": 0})
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    await db.worker_documents.delete_one({"id": document_id})
+    # The blob is shared by every upload of the same bytes
+    if not await db.worker_documents.find_one({"sha256": document["sha256"]}, {"_id": 1}):
+        store = get_object_store()
+        await store.delete(document["storage_key"])
+        if document.get("thumbnail_key"):
+            await store.delete(document["thumbnail_key"])
+    await refresh_document_skills(current_user["user_id"])
+    return {"message": "Document deleted"}
+
+@api_router.get("/files/{key:path}")
+async def download_file(key: str, name: str, expires: int, signature: str, content_type: str = Query(..., alias="type")):
+    """Presigned downloads for the filesystem object store (local development)."""
+    import hmac
+    store = get_object_store()
+    if not isinstance(store, FilesystemObjectStore):
+        raise HTTPException(status_code=404, detail="Not found")
+    if expires < time.time() or not hmac.compare_digest(signature, file_signature(key, name, content_type, expires)):
+        raise HTTPException(status_code=403, detail="Link expired or invalid")
+    path = store.path(key)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(path, media_type=content_type, filename=name)
+
 # Restaurant Profile Routes
 @api_router.post("/restaurants/profile")
 async def create_restaurant_profile(req: RestaurantProfileRequest, current_user: dict = Depends(get_current_user)):
@@ -327,13 +3394,15 @@ async def create_restaurant_profile(req: RestaurantProfileRequest, current_user:
     
     profile = RestaurantProfile(user_id=current_user["user_id"], **req.model_dump())
     profile_dict = profile.model_dump()
-    profile_dict['created_at'] = profile_dict['created_at'].isoformat()
-    await db.restaurant_profiles.insert_one(profile_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.restaurant_profiles.insert_one(profile_dict, session=session)
     return profile
 
 @api_router.get("/restaurants/profile")
 async def get_restaurant_profile(current_user: dict = Depends(get_current_user)):
-    profile = await db.restaurant_profiles.find_one({"user_id": current_user["user_id"]}, {"_id": 0})
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        profile = await reader.restaurant_profiles.find_one({"user_id": current_user["user_id"]}, {"_id": 0}, session=session)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
@@ -343,23 +3412,75 @@ async def update_restaurant_profile(req: RestaurantProfileRequest, current_user:
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    result = await db.restaurant_profiles.update_one(
-        {"user_id": current_user["user_id"]},
-        {"$set": req.model_dump()}
-    )
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        result = await db.restaurant_profiles.update_one(
+            {"user_id": current_user["user_id"]},
+            {"$set": req.model_dump()},
+            session=session
+        )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Profile not found")
     
     return {"message": "Profile updated successfully"}
 
+@api_router.get("/restaurants/candidates/search")
+async def search_candidates(
+    roles: List[str] = Query([]),
+    shifts: List[str] = Query([]),
+    languages: List[str] = Query([]),
+    skills: List[str] = Query([]),
+    availability: List[str] = Query([]),
+    city: List[str] = Query([]),
+    match_all: List[str] = Query([]),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Workers matching every given attribute (any listed value; all of them for fields in match_all)."""
+    if current_user["role"] != "restaurant":
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not candidate_index.loaded:
+        raise HTTPException(status_code=503, detail="Candidate index is loading, retry shortly")
+    
+    params = {
+        "preferred_roles": roles,
+        "preferred_shifts": shifts,
+        "languages": languages,
+        "skills": skills,
+        "availability": availability,
+        "location_city": city,
+    }
+    aliases = {"roles": "preferred_roles", "shifts": "preferred_shifts", "city": "location_city"}
+    filters = {field: values for field, values in params.items() if values}
+    result = candidate_index.search(filters, [aliases.get(field, field) for field in match_all])
+    user_ids = candidate_index.page(result, (page - 1) * page_size, page_size)
+    
+    profiles = await db_public.worker_profiles.find({"user_id": {"$in": user_ids}}, {"_id": 0}).to_list(None)
+    by_user = {p["user_id"]: p for p in profiles}
+    return {
+        "total": len(result),
+        "page": page,
+        "page_size": page_size,
+        "candidates": [by_user[user_id] for user_id in user_ids if user_id in by_user],
+        "facets": candidate_index.facets(result)
+    }
+
 # Job Routes
+# `sort` values of the job listings; ties go to the newest job
+JOB_SORTS = {
+    "newest": [("created_at", -1)],
+    "fewest_applicants": [("applicant_count", 1), ("created_at", -1)],
+    "most_applicants": [("applicant_count", -1), ("created_at", -1)],
+}
+JOB_SORT_PATTERN = "^(" + "|".join(JOB_SORTS) + ")$"
+
 @api_router.post("/jobs")
-async def create_job(req: JobCreateRequest, current_user: dict = Depends(get_current_user)):
+async def create_job(req: JobCreateRequest, current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    restaurant = await db.restaurant_profiles.find_one({"user_id": current_user["user_id"]})
+    restaurant = await loaders.restaurant_profiles.load(current_user["user_id"])
     if not restaurant:
         raise HTTPException(status_code=400, detail="Create restaurant profile first")
     
@@ -370,8 +3491,17 @@ async def create_job(req: JobCreateRequest, current_user: dict = Depends(get_cur
     )
     
     job_dict = job.model_dump()
-    job_dict['created_at'] = job_dict['created_at'].isoformat()
-    await db.jobs.insert_one(job_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.jobs.insert_one(job_dict, session=session)
+    job_vector_index.upsert(job_dict)
+    try:
+        await update_wage_benchmark(job_dict)
+    except WageBenchmarkConflict as e:
+        # Retried by the task queue, and dead-lettered if it keeps losing
+        logging.warning("%s; queued for retry", e)
+        await enqueue_task("update_wage_benchmark", {"job_id": job.id})
+    await enqueue_task("fan_out_job_alerts", {"job_id": job.id})
+    await enqueue_task("translate_job", {"job_id": job.id})
     return job
 
 @api_router.get("/jobs", response_model=List[Dict])
@@ -379,8 +3509,12 @@ async def get_jobs(
     role: Optional[str] = None,
     location: Optional[str] = None,
     shift: Optional[str] = None,
-    experience: Optional[str] = None
+    experience: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = Query("newest", pattern=JOB_SORT_PATTERN),
+    language: Optional[str] = None
 ):
+    selection = parse_fields(fields, Job)
     query = {"is_active": True}
     if role:
         query["role"] = role
@@ -391,43 +3525,72 @@ async def get_jobs(
     if experience:
         query["experience_required"] = experience
     
-    jobs = await db.jobs.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
+    jobs = await db_public.jobs.find(query, selection.projection()).sort(JOB_SORTS[sort]).to_list(100)
+    if language and normalize_language(language) != JOB_SOURCE_LANGUAGE:
+        await attach_cached_translations(jobs, normalize_language(language))
     return jobs
 
+async def attach_cached_translations(jobs: List[dict], language: str):
+    """Add the translation of each job already translated; queue the others so a later listing has them."""
+    segments = [job_segments(job) for job in jobs]
+    cached = iter(await translator.cached([text for texts in segments for text in texts], language))
+    untranslated = []
+    for job, texts in zip(jobs, segments):
+        translation = translated_job(language, [next(cached) for _ in texts])
+        if translation:
+            job["translation"] = translation
+        else:
+            untranslated.append(job["id"])
+    await translator.request(untranslated, language)
+
 @api_router.get("/jobs/{job_id}")
-async def get_job(job_id: str):
-    job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
+async def get_job(job_id: str, fields: Optional[str] = None, language: Optional[str] = None):
+    job = await db_public.jobs.find_one({"id": job_id}, parse_fields(fields, Job).projection())
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    if language and normalize_language(language) != JOB_SOURCE_LANGUAGE:
+        # A single job is translated on demand (cached for every later reader)
+        language = normalize_language(language)
+        segments = job_segments(job)
+        await translator.translate(segments, language)
+        # None if the LLM was unavailable; the listing shows the original
+        job["translation"] = translated_job(language, await translator.cached(segments, language))
     return job
 
 @api_router.get("/restaurants/jobs")
-async def get_restaurant_jobs(current_user: dict = Depends(get_current_user)):
+async def get_restaurant_jobs(
+    fields: Optional[str] = None,
+    sort: str = Query("newest", pattern=JOB_SORT_PATTERN),
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    jobs = await db.jobs.find({"restaurant_id": current_user["user_id"]}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    selection = parse_fields(fields, Job)
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        jobs = await reader.jobs.find(
+            {"restaurant_id": current_user["user_id"]}, selection.projection(), session=session
+        ).sort(JOB_SORTS[sort]).to_list(100)
     return jobs
 
 # Application Routes
 @api_router.post("/applications/{job_id}")
-async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_user)):
+async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "worker":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Check if job exists
-    job = await db.jobs.find_one({"id": job_id})
+    # Job, duplicate-application check (on the primary) and worker info are independent
+    job, existing, user = await asyncio.gather(
+        loaders.jobs.load(job_id),
+        db.applications.find_one({"job_id": job_id, "worker_id": current_user["user_id"]}, {"_id": 1}),
+        loaders.users.load(current_user["user_id"])
+    )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Check if already applied
-    existing = await db.applications.find_one({"job_id": job_id, "worker_id": current_user["user_id"]})
     if existing:
         raise HTTPException(status_code=400, detail="Already applied")
     
-    # Get worker info
-    user = await db.users.find_one({"id": current_user["user_id"]})
-    
     application = Application(
         job_id=job_id,
         worker_id=current_user["user_id"],
@@ -435,74 +3598,284 @@ async def apply_for_job(job_id: str, current_user: dict = Depends(get_current_us
     )
     
     app_dict = application.model_dump()
-    app_dict['applied_at'] = app_dict['applied_at'].isoformat()
-    app_dict['updated_at'] = app_dict['updated_at'].isoformat()
-    await db.applications.insert_one(app_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.applications.insert_one(app_dict, session=session)
+        await db.jobs.update_one({"id": job_id}, applicant_count_update(None, "applied"), session=session)
+    await record_application_event(app_dict, job["restaurant_id"], "applied", application.applied_at)
+    await enqueue_task("email_new_applicant", {
+        "restaurant_id": job["restaurant_id"],
+        "job_title": job["title"],
+        "worker_name": application.worker_name
+    })
     return application
 
 @api_router.get("/workers/applications")
-async def get_worker_applications(current_user: dict = Depends(get_current_user)):
+async def get_worker_applications(fields: Optional[str] = None, current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "worker":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    applications = await db.applications.find({"worker_id": current_user["user_id"]}, {"_id": 0}).sort("applied_at", -1).to_list(100)
+    selection = parse_fields(fields, Application, {"job_details": Job})
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        applications = await reader.applications.find(
+            {"worker_id": current_user["user_id"]}, selection.projection(["job_id"]), session=session
+        ).sort("applied_at", -1).to_list(100)
     
-    # Enrich with job details
-    for app in applications:
-        job = await db.jobs.find_one({"id": app["job_id"]}, {"_id": 0})
-        if job:
-            app["job_details"] = job
+    # Enrich with job details (one batched lookup), unless not asked for
+    if "job_details" in selection.embedded:
+        jobs = await loaders.jobs.only(selection.embedded["job_details"]).load_many([app["job_id"] for app in applications])
+        for app, job in zip(applications, jobs):
+            if job:
+                app["job_details"] = job
     
-    return applications
+    return [selection.trim(app) for app in applications]
 
 @api_router.get("/restaurants/applications/{job_id}")
-async def get_job_applications(job_id: str, current_user: dict = Depends(get_current_user)):
+async def get_job_applications(job_id: str, fields: Optional[str] = None, current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Verify job belongs to restaurant
-    job = await db.jobs.find_one({"id": job_id, "restaurant_id": current_user["user_id"]})
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    selection = parse_fields(fields, Application, {"worker_profile": WorkerProfile})
+    # Fetch the job (to verify ownership) and its applications concurrently
+    async def fetch_applications():
+        async with causal_session(current_user["user_id"]) as session:
+            reader = user_reader(current_user["user_id"])
+            return await reader.applications.find(
+                {"job_id": job_id}, selection.projection(["worker_id"]), session=session
+            ).sort("applied_at", -1).to_list(100)
     
-    applications = await db.applications.find({"job_id": job_id}, {"_id": 0}).sort("applied_at", -1).to_list(100)
+    job, applications = await asyncio.gather(loaders.jobs.load(job_id), fetch_applications())
+    if not job or job["restaurant_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    # Enrich with worker details
-    for app in applications:
-        worker = await db.worker_profiles.find_one({"user_id": app["worker_id"]}, {"_id": 0})
-        if worker:
-            app["worker_profile"] = worker
+    # Enrich with worker details (one batched lookup), unless not asked for
+    if "worker_profile" in selection.embedded:
+        workers = await loaders.worker_profiles.only(selection.embedded["worker_profile"]).load_many([app["worker_id"] for app in applications])
+        for app, worker in zip(applications, workers):
+            if worker:
+                app["worker_profile"] = worker
     
-    return applications
+    return [selection.trim(app) for app in applications]
 
 @api_router.put("/restaurants/applications/{application_id}")
 async def update_application_status(application_id: str, req: ApplicationStatusUpdate, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Verify application belongs to restaurant's job
-    application = await db.applications.find_one({"id": application_id})
-    if not application:
+    # Verify application belongs to restaurant's job; the job is joined
+    # server-side since its id is only known from the application
+    matches = await db.applications.aggregate([
+        {"$match": {"id": application_id}},
+        {"$lookup": {
+            "from": "jobs",
+            "let": {"job_id": "$job_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$or": [{"$eq": ["$_id", "$$job_id"]}, {"$eq": ["$id", "$$job_id"]}]}}},
+                {"$project": {"_id": 0, "restaurant_id": 1}}
+            ],
+            "as": "job"
+        }}
+    ]).to_list(1)
+    if not matches:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    job = await db.jobs.find_one({"id": application["job_id"], "restaurant_id": current_user["user_id"]})
-    if not job:
+    application = matches[0]
+    job = application.pop("job")
+    if not job and STORAGE_DUAL_READ:
+        # Application and job not yet in the same storage layout
+        job = [await db.jobs.find_one({"id": application["job_id"]}, {"_id": 0, "restaurant_id": 1})]
+    if not job or not job[0] or job[0]["restaurant_id"] != current_user["user_id"]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$set": {"status": req.status, "updated_at": datetime.now(timezone.utc).isoformat()}}
-    )
+    current_status = application.get("status", "applied")
+    if req.status not in APPLICATION_STATUS_TRANSITIONS:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    if req.status not in APPLICATION_STATUS_TRANSITIONS.get(current_status, []):
+        raise HTTPException(status_code=400, detail=f"Cannot move application from {current_status} to {req.status}")
+    
+    # Only apply the transition if no concurrent update moved the application first
+    now = datetime.now(timezone.utc)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        result = await db.applications.update_one(
+            {"id": application_id, "status": current_status},
+            {"$set": {"status": req.status, "updated_at": now}},
+            session=session
+        )
+        if result.modified_count:
+            await db.jobs.update_one({"id": application["job_id"]}, applicant_count_update(current_status, req.status), session=session)
+    if result.modified_count == 0:
+        raise HTTPException(status_code=409, detail="Application was updated concurrently, please retry")
+    
+    event = await record_application_event(application, current_user["user_id"], req.status, now)
+    await enqueue_task("notify_application_status", {
+        "event_id": event.id,
+        "worker_id": application["worker_id"],
+        "job_id": application["job_id"],
+        "status": req.status
+    })
     
     return {"message": "Application updated successfully"}
 
+@api_router.post("/restaurants/staffing/optimize")
+async def optimize_staffing(req: StaffingPlanRequest, current_user: dict = Depends(get_current_user)):
+    """Shortlist applicants across the restaurant's jobs, filling each job's headcount without double-booking a worker."""
+    if current_user["role"] != "restaurant":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    query = {"restaurant_id": current_user["user_id"], "is_active": True}
+    if req.job_ids:
+        query["id"] = {"$in": req.job_ids}
+    jobs = await db.jobs.find(query, {"_id": 0}).to_list(None)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="No active jobs")
+    
+    # Applications across all of the restaurant's jobs, since a worker holding
+    # a position at any outlet (even for a job not being optimised) is booked
+    own_job_ids = [
+        job["id"] for job in await db.jobs.find({"restaurant_id": current_user["user_id"]}, {"_id": 0, "id": 1}).to_list(None)
+    ]
+    applications = await db.applications.find(
+        {"job_id": {"$in": own_job_ids}, "status": {"$in": ["applied"] + COMMITTED_STATUSES}},
+        {"_id": 0}
+    ).to_list(None)
+    selected = {job["id"] for job in jobs}
+    profiles = await db.worker_profiles.find(
+        {"user_id": {"$in": list({app["worker_id"] for app in applications if app["status"] == "applied" and app["job_id"] in selected})}},
+        {"_id": 0}
+    ).to_list(None)
+    
+    started = time.perf_counter()
+    plan = await asyncio.to_thread(
+        plan_shortlists, jobs, applications, {p["user_id"]: p for p in profiles}, req.min_score
+    )
+    solve_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    shortlisted = plan
+    if plan and not req.dry_run:
+        # One bulk write; an application moved on concurrently is left alone.
+        # Each update stamps its planned event's id, which identifies the ones that applied
+        now = datetime.now(timezone.utc)
+        planned = {app["id"]: build_application_event(app, current_user["user_id"], "shortlisted", now) for app in plan}
+        result = await db.applications.bulk_write([
+            (
+                {"id": app_id, "status": "applied"},
+                {"$set": {"status": "shortlisted", "updated_at": now, "shortlist_event_id": event.id}},
+                False
+            )
+            for app_id, event in planned.items()
+        ], ordered=False)
+        if result.modified_count < len(plan):
+            moved = await db.applications.find(
+                {"id": {"$in": list(planned)}, "shortlist_event_id": {"$in": [event.id for event in planned.values()]}},
+                {"_id": 0, "id": 1}
+            ).to_list(None)
+            moved_ids = {app["id"] for app in moved}
+            shortlisted = [app for app in plan if app["id"] in moved_ids]
+        events = [planned[app["id"]] for app in shortlisted]
+        if events:
+            moved_per_job = {}
+            for event in events:
+                moved_per_job[event.job_id] = moved_per_job.get(event.job_id, 0) + 1
+            await db.jobs.bulk_write([
+                ({"id": job_id}, {"$inc": {"applicant_status_counts.applied": -n, "applicant_status_counts.shortlisted": n}}, False)
+                for job_id, n in moved_per_job.items()
+            ], ordered=False)
+            await db.application_events.insert_many([event.model_dump() for event in events])
+            await update_application_rollups(events)
+            await asyncio.gather(*(
+                enqueue_task("notify_application_status", {
+                    "event_id": event.id,
+                    "worker_id": event.worker_id,
+                    "job_id": event.job_id,
+                    "status": "shortlisted"
+                })
+                for event in events
+            ))
+    
+    by_job = {}
+    for app in sorted(shortlisted, key=lambda app: -app["score"]):
+        by_job.setdefault(app["job_id"], []).append(
+            {"application_id": app["id"], "worker_id": app["worker_id"], "worker_name": app["worker_name"], "score": app["score"]}
+        )
+    filled = {job_id: 0 for job_id in selected}
+    for app in applications:
+        if app["status"] in COMMITTED_STATUSES and app["job_id"] in selected:
+            filled[app["job_id"]] += 1
+    return {
+        "dry_run": req.dry_run,
+        "solve_ms": solve_ms,
+        "applicants": len({app["worker_id"] for app in applications if app["status"] == "applied" and app["job_id"] in selected}),
+        "shortlisted_count": len(shortlisted),
+        "conflicts": len(plan) - len(shortlisted),
+        "total_score": round(sum(app["score"] for app in shortlisted), 4),
+        "jobs": [
+            {
+                "job_id": job["id"],
+                "title": job["title"],
+                "location_city": job["location_city"],
+                "headcount": job.get("headcount", 1),
+                "already_filled": filled[job["id"]],
+                "shortlisted": by_job.get(job["id"], []),
+            }
+            for job in jobs
+        ]
+    }
+
+# Notification Routes
+@api_router.get("/notifications")
+async def get_notifications(current_user: dict = Depends(get_current_user)):
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        notifications = await reader.notifications.find({"user_id": current_user["user_id"]}, {"_id": 0}, session=session).sort("created_at", -1).to_list(50)
+    return notifications
+
+# Job Alert Routes
+@api_router.post("/alerts")
+async def create_job_alert(req: JobAlertRequest, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "worker":
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not (req.roles or req.cities or req.shifts):
+        raise HTTPException(status_code=400, detail="Choose at least one role, city or shift")
+    
+    alert = JobAlert(user_id=current_user["user_id"], **req.model_dump())
+    alert_dict = alert.model_dump()
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.job_alerts.insert_one(alert_dict, session=session)
+    alert_index.upsert(alert_dict)
+    return alert
+
+@api_router.get("/alerts")
+async def get_job_alerts(current_user: dict = Depends(get_current_user)):
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        alerts = await reader.job_alerts.find(
+            {"user_id": current_user["user_id"], "is_active": True}, {"_id": 0}, session=session
+        ).sort("created_at", -1).to_list(100)
+    return alerts
+
+@api_router.delete("/alerts/{alert_id}")
+async def delete_job_alert(alert_id: str, current_user: dict = Depends(get_current_user)):
+    # Deactivated rather than deleted so other processes' indexes see the change
+    update = {"is_active": False, "updated_at": datetime.now(timezone.utc)}
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        result = await db.job_alerts.update_one(
+            {"id": alert_id, "user_id": current_user["user_id"]},
+            {"$set": update},
+            session=session
+        )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    
+    alert_index.upsert({"id": alert_id, "user_id": current_user["user_id"], **update})
+    return {"message": "Alert deleted successfully"}
+
 # Review Routes
 @api_router.post("/reviews")
-async def create_review(req: ReviewCreateRequest, current_user: dict = Depends(get_current_user)):
+async def create_review(req: ReviewCreateRequest, current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "worker":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    user = await db.users.find_one({"id": current_user["user_id"]})
+    user = await loaders.users.load(current_user["user_id"])
     
     review = Review(
         restaurant_id=req.restaurant_id,
@@ -517,13 +3890,13 @@ async def create_review(req: ReviewCreateRequest, current_user: dict = Depends(g
     )
     
     review_dict = review.model_dump()
-    review_dict['created_at'] = review_dict['created_at'].isoformat()
-    await db.reviews.insert_one(review_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.reviews.insert_one(review_dict, session=session)
     return review
 
 @api_router.get("/reviews/{restaurant_id}")
 async def get_restaurant_reviews(restaurant_id: str):
-    reviews = await db.reviews.find({"restaurant_id": restaurant_id}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    reviews = await db_public.reviews.find({"restaurant_id": restaurant_id}, {"_id": 0}).sort("created_at", -1).to_list(100)
     
     # Calculate averages
     if reviews:
@@ -552,50 +3925,190 @@ async def get_restaurant_reviews(restaurant_id: str):
 async def get_restaurant_analytics(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "restaurant":
         raise HTTPException(status_code=403, detail="Access denied")
+    return await restaurant_analytics(current_user["user_id"])
+
+async def restaurant_analytics(restaurant_id: str, jobs: Optional[List[dict]] = None):
+    """Job, application and review totals; jobs may be passed in when the caller already has them.
     
-    # Total jobs
-    total_jobs = await db.jobs.count_documents({"restaurant_id": current_user["user_id"]})
+    Application totals are summed from the jobs' applicant counters rather
+    than recounted from applications.
+    """
+    async def fetch_jobs():
+        if jobs is not None:
+            return jobs
+        return await db_analytics.jobs.find(
+            {"restaurant_id": restaurant_id}, {"_id": 0, "applicant_status_counts": 1}
+        ).to_list(None)
     
-    # Total applications
-    jobs = await db.jobs.find({"restaurant_id": current_user["user_id"]}, {"id": 1}).to_list(1000)
-    job_ids = [j["id"] for j in jobs]
-    total_applications = await db.applications.count_documents({"job_id": {"$in": job_ids}})
+    # Jobs and reviews are independent of each other
+    jobs, reviews = await asyncio.gather(
+        fetch_jobs(),
+        db_analytics.reviews.find({"restaurant_id": restaurant_id}, {"_id": 0, "overall_rating": 1}).to_list(100)
+    )
     
-    # Applications by status
-    pipeline = [
-        {"$match": {"job_id": {"$in": job_ids}}},
-        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
-    ]
-    status_counts = await db.applications.aggregate(pipeline).to_list(100)
+    # Every application has a status, so these sum to the total
+    by_status = {}
+    for job in jobs:
+        for status, count in job.get("applicant_status_counts", {}).items():
+            if count:
+                by_status[status] = by_status.get(status, 0) + count
     
-    # Reviews summary
-    reviews = await db.reviews.find({"restaurant_id": current_user["user_id"]}, {"_id": 0}).to_list(100)
     avg_rating = sum(r["overall_rating"] for r in reviews) / len(reviews) if reviews else 0
     
     return {
-        "total_jobs": total_jobs,
-        "total_applications": total_applications,
-        "applications_by_status": {item["_id"]: item["count"] for item in status_counts},
+        "total_jobs": len(jobs),
+        "total_applications": sum(by_status.values()),
+        "applications_by_status": by_status,
         "average_rating": round(avg_rating, 1),
         "total_reviews": len(reviews)
     }
 
+@api_router.get("/restaurants/analytics/funnel")
+async def get_hiring_funnel(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    job_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "restaurant":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    start_day, end_day = parse_day_range(start, end)
+    query = {"restaurant_id": current_user["user_id"], "day": {"$gte": start_day, "$lte": end_day}}
+    if job_id:
+        query["job_id"] = job_id
+    rollups = await db_analytics.application_event_daily.find(query, {"transitions": 1, "stages_entered": 1}).to_list(None)
+    
+    totals = {status: 0 for status in APPLICATION_STATUS_TRANSITIONS}
+    for rollup in rollups:
+        # Buckets written before stages_entered existed only have transitions
+        for status, count in rollup.get("stages_entered", rollup.get("transitions", {})).items():
+            totals[status] = totals.get(status, 0) + count
+    
+    # Every stage is entered at most once per application, and a transition
+    # that skips stages (applied -> interview) enters each one it passes over,
+    # so stage entries give the funnel directly; conversion is relative to
+    # the previous stage
+    stages = []
+    previous = None
+    for stage in FUNNEL_STAGES:
+        entered = totals.get(stage, 0)
+        stages.append({
+            "stage": stage,
+            "count": entered,
+            "conversion_from_previous": round(entered / previous, 3) if previous else None
+        })
+        previous = entered
+    
+    return {
+        "start": start_day,
+        "end": end_day,
+        "stages": stages,
+        "rejected": totals.get("rejected", 0),
+        "overall_conversion": round(totals["accepted"] / totals["applied"], 3) if totals["applied"] else None
+    }
+
+@api_router.get("/restaurants/analytics/time-to-hire")
+async def get_time_to_hire(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    job_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != "restaurant":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    start_day, end_day = parse_day_range(start, end, default_days=84)
+    query = {"restaurant_id": current_user["user_id"], "day": {"$gte": start_day, "$lte": end_day}}
+    if job_id:
+        query["job_id"] = job_id
+    rollups = await db_analytics.application_event_daily.find(query, {"_id": 0}).to_list(None)
+    
+    hires = 0
+    hire_seconds = 0.0
+    stage_seconds: Dict[str, float] = {}
+    stage_exits: Dict[str, int] = {}
+    weekly: Dict[str, Dict[str, float]] = {}
+    for rollup in rollups:
+        day_hires = rollup.get("transitions", {}).get("accepted", 0)
+        hires += day_hires
+        hire_seconds += rollup.get("time_to_hire_seconds", 0)
+        for stage, seconds in rollup.get("stage_seconds", {}).items():
+            stage_seconds[stage] = stage_seconds.get(stage, 0) + seconds
+        for stage, count in rollup.get("stage_exits", {}).items():
+            stage_exits[stage] = stage_exits.get(stage, 0) + count
+        day = datetime.strptime(rollup["day"], "%Y-%m-%d").date()
+        week_start = (day - timedelta(days=day.weekday())).isoformat()
+        bucket = weekly.setdefault(week_start, {"hires": 0, "seconds": 0.0})
+        bucket["hires"] += day_hires
+        bucket["seconds"] += rollup.get("time_to_hire_seconds", 0)
+    
+    return {
+        "start": start_day,
+        "end": end_day,
+        "hires": hires,
+        "average_time_to_hire_days": round(hire_seconds / hires / 86400, 2) if hires else None,
+        "average_days_in_stage": {
+            stage: round(stage_seconds[stage] / stage_exits[stage] / 86400, 2)
+            for stage in FUNNEL_STAGES if stage_exits.get(stage)
+        },
+        "weekly": [
+            {
+                "week_start": week,
+                "hires": int(bucket["hires"]),
+                "average_time_to_hire_days": round(bucket["seconds"] / bucket["hires"] / 86400, 2) if bucket["hires"] else None
+            }
+            for week, bucket in sorted(weekly.items())
+        ]
+    }
+
+# Market Routes
+@api_router.get("/market/wages")
+async def get_market_wages(
+    role: Optional[str] = None,
+    city: Optional[str] = None,
+    shift: Optional[str] = None
+):
+    # A fully specified bucket is a single primary-key read
+    if role and city and shift:
+        benchmark = await db_analytics.wage_benchmarks.find_one({"_id": wage_benchmark_key(role, city, shift)})
+        benchmarks = [benchmark] if benchmark else []
+    else:
+        query = {}
+        if role:
+            query["role"] = role
+        if city:
+            query["location_city"] = city
+        if shift:
+            query["shift_timing"] = shift
+        benchmarks = await db_analytics.wage_benchmarks.find(query).to_list(500)
+    
+    return {"benchmarks": [format_wage_benchmark(b) for b in benchmarks]}
+
 # AI Job Matching
 @api_router.get("/workers/job-recommendations")
-async def get_job_recommendations(current_user: dict = Depends(get_current_user)):
+async def get_job_recommendations(current_user: dict = Depends(get_current_user), loaders: RequestLoaders = Depends(get_loaders)):
     if current_user["role"] != "worker":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Get worker profile
-    profile = await db.worker_profiles.find_one({"user_id": current_user["user_id"]}, {"_id": 0})
+    profile = await loaders.worker_profiles.load(current_user["user_id"])
     if not profile:
         raise HTTPException(status_code=400, detail="Create profile first")
     
-    # Get all active jobs
-    jobs = await db.jobs.find({"is_active": True}, {"_id": 0}).to_list(100)
+    # Semantic top-k from the job vector index (same city first); until the
+    # index has loaded, fall back to the first page of active jobs
+    if job_vector_index.loaded:
+        hits = job_vector_index.recommend(profile)
+        jobs = []
+        for job, (_, score) in zip(await loaders.jobs.load_many([job_id for job_id, _ in hits]), hits):
+            if job and job.get("is_active"):
+                jobs.append({**job, "match_score": round(score, 3)})
+    else:
+        jobs = await db_public.jobs.find({"is_active": True}, {"_id": 0}).to_list(100)
     
     # Use LLM to rank jobs
     try:
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
         llm_key = os.environ.get('EMERGENT_LLM_KEY')
         chat = LlmChat(
             api_key=llm_key,
@@ -616,18 +4129,166 @@ async def get_job_recommendations(current_user: dict = Depends(get_current_user)
             Return only the job IDs in order of best match to worst, comma-separated."""
         )
         
-        response = await chat.send_message(message)
+        response = await DEPENDENCIES["llm"].call(chat.send_message, message)
         # Parse response and return sorted jobs
         return {"jobs": jobs[:10], "ai_recommendation": response}
+    except DependencyUnavailable as e:
+        logging.warning("AI matching skipped: %s", e)
     except Exception as e:
-        logging.error(f"AI matching error: {e}")
-        # Fallback to simple filtering
-        matched_jobs = [
-            j for j in jobs 
-            if j.get("role") in profile.get("preferred_roles", []) 
-            and j.get("location_city") == profile.get("location_city")
-        ]
-        return {"jobs": matched_jobs[:10]}
+        logging.error("AI matching error: %s", e)
+    
+    if job_vector_index.loaded:
+        return {"jobs": jobs[:10]}
+    # Fallback to simple filtering
+    matched_jobs = [
+        j for j in jobs 
+        if j.get("role") in profile.get("preferred_roles", []) 
+        and j.get("location_city") == profile.get("location_city")
+    ]
+    return {"jobs": matched_jobs[:10]}
+
+# Dashboard Routes
+# One request per dashboard instead of one per panel. Sections run
+# concurrently and share the request's DataLoaders, so e.g. the worker's
+# profile and jobs referenced by several sections are fetched once. A failed
+# or slow section is reported in "errors" rather than failing the dashboard.
+# With ?stream=true the response is NDJSON, one line per section as it
+# completes, so fast sections render first.
+# Above the LLM dependency's timeout, so recommendations can still fall back
+DASHBOARD_SECTION_TIMEOUT = float(os.environ.get('DASHBOARD_SECTION_TIMEOUT_SECONDS', '10'))
+DASHBOARD_APPLICANTS_PER_JOB = 5
+
+async def run_dashboard_section(name: str, section) -> dict:
+    started = time.perf_counter()
+    try:
+        result = {"section": name, "status": 200, "data": await asyncio.wait_for(section, DASHBOARD_SECTION_TIMEOUT)}
+    except HTTPException as e:
+        result = {"section": name, "status": e.status_code, "error": e.detail}
+    except asyncio.TimeoutError:
+        result = {"section": name, "status": 504, "error": "Section timed out"}
+    except Exception as e:
+        logging.error("Dashboard section %s failed: %s", name, e)
+        result = {"section": name, "status": 500, "error": "Section failed"}
+    result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+async def dashboard_response(sections: Dict[str, Any], requested: Optional[str], stream: bool):
+    """Run the (requested) sections concurrently; one JSON document, or NDJSON lines as they finish."""
+    if requested:
+        names = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in names if name not in sections]
+        if unknown:
+            for section in sections.values():
+                section.close()
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}; available: {', '.join(sections)}")
+        for name in set(sections) - set(names):
+            sections.pop(name).close()
+    
+    if stream:
+        async def lines():
+            tasks = [asyncio.ensure_future(run_dashboard_section(name, section)) for name, section in sections.items()]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    yield json.dumps(jsonable_encoder(await finished)) + "\n"
+            finally:
+                # Client went away mid-stream
+                for task in tasks:
+                    task.cancel()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    results = await asyncio.gather(*(run_dashboard_section(name, section) for name, section in sections.items()))
+    response = JSONResponse(jsonable_encoder({
+        "sections": {r["section"]: r.get("data") for r in results},
+        "errors": {r["section"]: {"status": r["status"], "detail": r["error"]} for r in results if "error" in r},
+        "timings_ms": {r["section"]: r["ms"] for r in results},
+    }))
+    response.headers["Server-Timing"] = ", ".join(f"{r['section']};dur={r['ms']}" for r in results)
+    return response
+
+@api_router.get("/workers/dashboard")
+async def get_worker_dashboard(
+    sections: Optional[str] = None,
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
+    """Profile, applications, recommendations and notifications in one round trip."""
+    if current_user["role"] != "worker":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    async def profile():
+        profile = await loaders.worker_profiles.load(current_user["user_id"])
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+    
+    return await dashboard_response({
+        "profile": profile(),
+        "applications": get_worker_applications(None, current_user, loaders),
+        "recommendations": get_job_recommendations(current_user, loaders),
+        "notifications": get_notifications(current_user),
+    }, sections, stream)
+
+@api_router.get("/restaurants/dashboard")
+async def get_restaurant_dashboard(
+    sections: Optional[str] = None,
+    stream: bool = False,
+    current_user: dict = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
+    """Profile, jobs, analytics and each job's latest applicants in one round trip."""
+    if current_user["role"] != "restaurant":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    restaurant_id = current_user["user_id"]
+    jobs_future = None
+    
+    def restaurant_jobs():
+        # The jobs list feeds three sections; fetched once, by whichever needs it first
+        nonlocal jobs_future
+        if jobs_future is None:
+            jobs_future = asyncio.ensure_future(get_restaurant_jobs(None, "newest", current_user))
+        return asyncio.shield(jobs_future)
+    
+    async def profile():
+        profile = await loaders.restaurant_profiles.load(restaurant_id)
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+    
+    async def jobs():
+        return await restaurant_jobs()
+    
+    async def analytics():
+        return await restaurant_analytics(restaurant_id, await restaurant_jobs())
+    
+    async def applicants():
+        job_ids = [job["id"] for job in await restaurant_jobs()]
+        # Latest few per job, so one busy posting can't crowd out the others
+        async with causal_session(restaurant_id) as session:
+            groups = await user_reader(restaurant_id).applications.aggregate([
+                {"$match": {"job_id": {"$in": job_ids}, "status": {"$ne": "rejected"}}},
+                {"$sort": {"job_id": 1, "applied_at": -1}},
+                {"$group": {"_id": "$job_id", "applicants": {"$push": "$$ROOT"}}},
+                {"$project": {"_id": 0, "job_id": "$_id", "applicants": {"$slice": ["$applicants", DASHBOARD_APPLICANTS_PER_JOB]}}}
+            ], session=session).to_list(None)
+        by_job = {}
+        for group in groups:
+            for app in group["applicants"]:
+                app.pop("_id", None)
+            by_job[group["job_id"]] = group["applicants"]
+        shown = [app for apps in by_job.values() for app in apps]
+        for app, worker in zip(shown, await loaders.worker_profiles.load_many([app["worker_id"] for app in shown])):
+            if worker:
+                app["worker_profile"] = worker
+        return by_job
+    
+    return await dashboard_response({
+        "profile": profile(),
+        "jobs": jobs(),
+        "analytics": analytics(),
+        "applicants": applicants(),
+    }, sections, stream)
 
 # Payment Routes
 @api_router.post("/payments/create-checkout")
@@ -652,6 +4313,7 @@ async def create_payment_checkout(request: Request, current_user: dict = Depends
     amount = PACKAGES[package_id]
     
     # Initialize Stripe
+    from emergentintegrations.payments.stripe.checkout import StripeCheckout, CheckoutSessionRequest
     stripe_key = os.environ.get('STRIPE_API_KEY')
     base_url = str(request.base_url)
     webhook_url = f"{base_url}api/webhook/stripe"
@@ -672,7 +4334,15 @@ async def create_payment_checkout(request: Request, current_user: dict = Depends
         }
     )
     
-    session = await stripe_checkout.create_checkout_session(checkout_request)
+    try:
+        session = await DEPENDENCIES["stripe"].call(stripe_checkout.create_checkout_session, checkout_request)
+    except DependencyUnavailable as e:
+        logging.warning("Checkout unavailable: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="Payments are temporarily unavailable, please try again shortly",
+            headers={"Retry-After": str(int(DEPENDENCIES["stripe"].reset_seconds))}
+        )
     
     # Store transaction
     transaction = PaymentTransaction(
@@ -685,24 +4355,27 @@ async def create_payment_checkout(request: Request, current_user: dict = Depends
     )
     
     trans_dict = transaction.model_dump()
-    trans_dict['created_at'] = trans_dict['created_at'].isoformat()
-    await db.payment_transactions.insert_one(trans_dict)
+    async with causal_session(current_user["user_id"], wrote=True) as session:
+        await db.payment_transactions.insert_one(trans_dict, session=session)
     
     return {"url": session.url, "session_id": session.session_id}
 
 @api_router.get("/payments/status/{session_id}")
 async def get_payment_status(session_id: str, current_user: dict = Depends(get_current_user)):
     # Get transaction from DB
-    transaction = await db.payment_transactions.find_one({"session_id": session_id}, {"_id": 0})
+    async with causal_session(current_user["user_id"]) as session:
+        reader = user_reader(current_user["user_id"])
+        transaction = await reader.payment_transactions.find_one({"session_id": session_id}, {"_id": 0}, session=session)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
     # Check Stripe status
+    from emergentintegrations.payments.stripe.checkout import StripeCheckout
     stripe_key = os.environ.get('STRIPE_API_KEY')
     stripe_checkout = StripeCheckout(api_key=stripe_key, webhook_url="")
     
     try:
-        status = await stripe_checkout.get_checkout_status(session_id)
+        status = await DEPENDENCIES["stripe"].call(stripe_checkout.get_checkout_status, session_id)
         
         # Update transaction if status changed
         if status.payment_status == "paid" and transaction["payment_status"] != "paid":
@@ -713,7 +4386,7 @@ async def get_payment_status(session_id: str, current_user: dict = Depends(get_c
         
         return status
     except Exception as e:
-        logging.error(f"Payment status error: {e}")
+        logging.error("Payment status error: %s", e)
         return transaction
 
 @api_router.post("/webhook/stripe")
@@ -721,13 +4394,17 @@ async def stripe_webhook(request: Request):
     body = await request.body()
     signature = request.headers.get("Stripe-Signature")
     
+    from emergentintegrations.payments.stripe.checkout import StripeCheckout
     stripe_key = os.environ.get('STRIPE_API_KEY')
     base_url = str(request.base_url)
     webhook_url = f"{base_url}api/webhook/stripe"
     stripe_checkout = StripeCheckout(api_key=stripe_key, webhook_url=webhook_url)
     
     try:
-        webhook_response = await stripe_checkout.handle_webhook(body, signature)
+        # Bad signatures are the sender's fault and must not open the breaker
+        webhook_response = await DEPENDENCIES["stripe"].call(
+            stripe_checkout.handle_webhook, body, signature, record_failures=False
+        )
         
         # Update transaction
         if webhook_response.payment_status == "paid":
@@ -737,26 +4414,480 @@ async def stripe_webhook(request: Request):
             )
         
         return {"status": "success"}
+    except DependencyUnavailable as e:
+        # Stripe retries webhooks that don't get a 2xx
+        logging.warning("Webhook deferred: %s", e)
+        raise HTTPException(status_code=503, detail="Webhook processing temporarily unavailable")
     except Exception as e:
-        logging.error(f"Webhook error: {e}")
+        logging.error("Webhook error: %s", e)
         raise HTTPException(status_code=400, detail="Webhook processing failed")
 
-app.include_router(api_router)
+# Operational Routes
+@api_router.get("/metrics/dependencies", dependencies=[Depends(require_admin)])
+async def get_dependency_metrics():
+    return {name: dependency.snapshot() for name, dependency in DEPENDENCIES.items()}
+
+@api_router.get("/metrics/db-pools", dependencies=[Depends(require_admin)])
+async def get_db_pool_metrics():
+    return {
+        "pools": pool_metrics.pools,
+        "max_pool_size": client.options.pool_options.max_pool_size,
+        "read_preferences": {
+            "public": db_public.read_preference.document,
+            "analytics": db_analytics.read_preference.document,
+        },
+        "users_pinned_to_primary": len(recent_writes),
+    }
+
+@api_router.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_request_profiles(path: Optional[str] = None, limit: int = 50):
+    query = {"path": path} if path else {}
+    profiles = await db.request_profiles.find(
+        query, {"_id": 0, "report": 0, "db_commands": 0}
+    ).sort("created_at", -1).to_list(min(limit, 200))
+    return profiles
+
+@api_router.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_request_profile(profile_id: str, format: str = "json"):
+    profile = await db.request_profiles.find_one({"id": profile_id}, {"_id": 0})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "json":
+        return profile
+    
+    report = profile["report"]
+    if "session" in report:
+        from pyinstrument.session import Session
+        from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+        session = Session.from_json(json.loads(report["session"]))
+        if format == "html":
+            return Response(content=HTMLRenderer().render(session), media_type="text/html")
+        if format == "speedscope":
+            return Response(content=SpeedscopeRenderer().render(session), media_type="application/json")
+    elif format == "html":
+        import html
+        return Response(content=f"<pre>{html.escape(report['text'])}</pre>", media_type="text/html")
+    raise HTTPException(status_code=400, detail=f"Format {format} not available for {profile['profiler']} profiles")
+
+@api_router.get("/health/live")
+async def liveness():
+    return {"status": "alive"}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@api_router.get("/health/ready")
+async def readiness(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Starting up")
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        logging.error("Readiness check failed: %s", e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ready"}
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("hospitalityhub.access")
+
+async def create_indexes():
+    await db.applications.create_index([("job_id", 1), ("applied_at", -1)])
+    await db.application_events.create_index([("job_id", 1), ("day", 1)])
+    await db.application_events.create_index("application_id")
+    await db.application_events.create_index("day")
+    await db.application_event_daily.create_index([("restaurant_id", 1), ("day", 1)])
+    await db.wage_benchmarks.create_index([("role", 1), ("location_city", 1), ("shift_timing", 1)])
+    await db.idempotency_keys.create_index("created_at", expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS)
+    await db.background_tasks.create_index([("type", 1), ("status", 1), ("run_at", 1)])
+    await db.background_tasks.create_index("id")
+    await db.background_tasks.create_index("finished_at", expireAfterSeconds=TASK_RETENTION_SECONDS)
+    await db.notifications.create_index([("user_id", 1), ("created_at", -1)])
+    await db.request_profiles.create_index("id")
+    await db.worker_profiles.create_index("user_id")
+    await db.worker_profiles.create_index("updated_at")
+    await db.jobs.create_index("created_at")
+    await db.jobs.create_index([("is_active", 1), ("applicant_count", 1), ("created_at", -1)])
+    await db.job_alerts.create_index([("user_id", 1), ("source", 1)])
+    await db.job_alerts.create_index("updated_at")
+    await db.worker_documents.create_index([("user_id", 1), ("created_at", -1)])
+    await db.worker_documents.create_index("sha256")
+    await db.alert_digests.create_index("due_at")
+    await db.request_profiles.create_index("created_at", expireAfterSeconds=PROFILE_RETENTION_SECONDS)
+    if STORAGE_DUAL_READ:
+        # Dual-read id lookups also match the legacy "id" field of unmigrated documents
+        for name in sorted(COMPACT_COLLECTIONS):
+            await db.raw[name].create_index("id", sparse=True)
+
+async def warm_up():
+    """Pay one-off costs before the first request instead of during it."""
+    # Import and exercise passlib/bcrypt and jose; hashing runs off the event loop
+    await asyncio.to_thread(verify_password, "warmup", get_password_hash("warmup"))
+    token = create_access_token({"sub": "warmup", "role": "warmup"})
+    from jose import jwt
+    jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    # Pull the default job listing through the public read path
+    await db_public.jobs.find({"is_active": True}, {"_id": 0}).sort("created_at", -1).to_list(100)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global task_queue
+    with queued_logging():
+        connect_mongo()
+        await client.admin.command("ping")
+        await create_indexes()
+        await warm_up()
+        if TASK_QUEUE_IN_PROCESS:
+            task_queue = TaskQueue()
+            task_queue.start()
+        # Load in the background; search answers 503 (and recommendations use
+        # the unranked fallback) until the first load completes
+        candidate_index.start()
+        job_vector_index.start()
+        alert_index.start()
+        app.state.ready = True
+        logger.info("Startup complete")
+        yield
+        app.state.ready = False
+        await candidate_index.stop()
+        await job_vector_index.stop()
+        await alert_index.stop()
+        if task_queue is not None:
+            await task_queue.stop()
+            task_queue = None
+        client.close()
+
+def idempotency_scope(request: Request) -> Optional[str]:
+    """Authenticated user id for scoping keys; None lets the handler reject the request."""
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    from jose import JWTError, jwt
+    try:
+        return jwt.decode(authorization[7:], JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+async def claim_idempotency_key(record_id: str, request_hash: str):
+    """Try to become the request that executes this key; otherwise return the existing record."""
+    now = datetime.now(timezone.utc)
+    locked_until = now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+    try:
+        await db.idempotency_keys.insert_one({
+            "_id": record_id,
+            "status": "in_progress",
+            "request_hash": request_hash,
+            "created_at": now,  # BSON date, required by the TTL index
+            "locked_until": locked_until,
+        })
+        return True, None
+    except DuplicateKeyError:
+        pass
+    # Take over a claim abandoned by a crashed process
+    taken = await db.idempotency_keys.find_one_and_update(
+        {"_id": record_id, "status": "in_progress", "request_hash": request_hash, "locked_until": {"$lt": now}},
+        {"$set": {"locked_until": locked_until}}
+    )
+    if taken:
+        return True, None
+    return False, await db.idempotency_keys.find_one({"_id": record_id})
+
+async def wait_for_idempotency_key(record_id: str, deadline: float):
+    event = idempotency_inflight.get(record_id)
+    remaining = max(deadline - time.monotonic(), 0)
+    if event is None:
+        # In flight on another process; poll the stored record
+        await asyncio.sleep(min(0.1, remaining))
+        return
+    try:
+        await asyncio.wait_for(event.wait(), remaining)
+    except asyncio.TimeoutError:
+        pass
+
+class IdempotencyMiddleware:
+    """Pure ASGI middleware for Idempotency-Key on IDEMPOTENT_ROUTES.
+
+    The first request with a key runs and its response is stored; a retry
+    with the same key and body gets the stored response back. Every other
+    request passes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not any(route.match(scope["path"]) for route in IDEMPOTENT_ROUTES):
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope, receive)
+        key = request.headers.get("Idempotency-Key")
+        if key and len(key) > 255:
+            await JSONResponse(status_code=400, content={"detail": "Idempotency-Key too long"})(scope, receive, send)
+            return
+        user_id = idempotency_scope(request) if key else None
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+        
+        body = await request.body()
+        record_id = hashlib.sha256(f"{user_id}:{scope['path']}:{key}".encode()).hexdigest()
+        request_hash = hashlib.sha256(body).hexdigest()
+        
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            claimed, record = await claim_idempotency_key(record_id, request_hash)
+            if claimed:
+                break
+            if record is None:
+                continue  # the in-flight request failed and released the key
+            if record["request_hash"] != request_hash:
+                await JSONResponse(status_code=422, content={"detail": "Idempotency-Key reused with a different request"})(scope, receive, send)
+                return
+            if record["status"] == "completed":
+                stored = record["response"]
+                replay = Response(content=stored["body"], status_code=stored["status_code"], media_type=stored["media_type"])
+                if "headers" in stored:
+                    # Raw (name, value) pairs, so repeated headers such as Set-Cookie survive
+                    replay.raw_headers = [(bytes(name), bytes(value)) for name, value in stored["headers"]]
+                replay.headers["Idempotent-Replayed"] = "true"
+                await replay(scope, receive, send)
+                return
+            if time.monotonic() >= deadline:
+                await JSONResponse(status_code=409, content={"detail": "A request with this Idempotency-Key is still in progress"})(scope, receive, send)
+                return
+            await wait_for_idempotency_key(record_id, deadline)
+        
+        # The body was consumed above; hand it to the route once more
+        pending = [{"type": "http.request", "body": body, "more_body": False}]
+        
+        async def receive_body():
+            return pending.pop() if pending else await receive()
+        
+        # The response goes to the client as it is produced and is stored once complete
+        start, chunks = {}, []
+        
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+        
+        done = idempotency_inflight[record_id] = asyncio.Event()
+        try:
+            await self.app(scope, receive_body, send_and_capture)
+            if start and start["status"] < 500:
+                headers = Headers(raw=start.get("headers", []))
+                await db.idempotency_keys.update_one({"_id": record_id}, {"$set": {
+                    "status": "completed",
+                    "response": {
+                        "status_code": start["status"],
+                        "media_type": headers.get("content-type"),
+                        "headers": [list(header) for header in headers.raw],
+                        "body": b"".join(chunks),
+                    }
+                }})
+            else:
+                # Server errors are not cached so the client's retry runs again
+                await db.idempotency_keys.delete_one({"_id": record_id})
+        except BaseException:
+            await db.idempotency_keys.delete_one({"_id": record_id})
+            raise
+        finally:
+            done.set()
+            idempotency_inflight.pop(record_id, None)
+
+class RequestProfiler:
+    """pyinstrument when installed (HTML/speedscope output), cProfile otherwise."""
+
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            import cProfile
+            self.kind = "cprofile"
+            self._profiler = cProfile.Profile()
+        else:
+            self.kind = "pyinstrument"
+            self._profiler = Profiler(async_mode="enabled")
+
+    def start(self):
+        self._profiler.enable() if self.kind == "cprofile" else self._profiler.start()
+
+    def stop(self) -> dict:
+        if self.kind == "pyinstrument":
+            session = self._profiler.stop()
+            return {"session": json.dumps(session.to_json())}
+        import io
+        import pstats
+        self._profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(self._profiler, stream=report).sort_stats("cumulative").print_stats(60)
+        return {"text": report.getvalue()}
+
+async def store_request_profile(scope, status_code: int, profiler: RequestProfiler, trace: DbTrace, started: float, sampled: bool) -> Optional[str]:
+    """Stop the profiler and save the request to request_profiles; returns its id, or None if storing failed."""
+    report = profiler.stop()
+    duration_ms = (time.perf_counter() - started) * 1000
+    profile_id = str(uuid.uuid4())
+    db_commands = [
+        {
+            "command": command,
+            "collection": collection,
+            "offset_ms": round((command_started - started) * 1000, 2),
+            "duration_ms": round((command_ended - command_started) * 1000, 2),
+        }
+        for command_started, command_ended, command, collection in sorted(trace.commands)
+    ]
+    try:
+        await db.request_profiles.insert_one({
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "sampled": sampled,
+            "duration_ms": round(duration_ms, 2),
+            "db_time_ms": round(sum(c["duration_ms"] for c in db_commands), 2),
+            "db_round_trips": trace.sequential_round_trips(),
+            "db_commands": db_commands,
+            "profiler": profiler.kind,
+            "report": report,
+            "created_at": datetime.now(timezone.utc),  # BSON date for the TTL index
+        })
+    except Exception as e:
+        logging.error("Storing request profile failed: %s", e)
+        return None
+    return profile_id
+
+class RequestObservabilityMiddleware:
+    """Outermost pure ASGI middleware: request id and log context, DB round-trip
+    headers, request profiling and one access log line per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        request_id = request_headers.get("X-Request-ID", "")
+        if not re.fullmatch(r"[\w\-]{8,64}", request_id):
+            request_id = uuid.uuid4().hex
+        log_context.set({"request_id": request_id, "user_id": None})
+        
+        requested = request_headers.get("X-Profile") == "1" and is_admin_key(request_headers.get("X-Admin-Key"))
+        profiler = None
+        if requested or (PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE):
+            profiler = RequestProfiler()
+        trace = DbTrace() if profiler or DB_TRACE_HEADERS else None
+        trace_token = db_trace.set(trace) if trace else None
+        started = time.perf_counter()
+        status = 500
+        
+        async def send_with_headers(message):
+            nonlocal profiler, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                if DB_TRACE_HEADERS:
+                    headers["X-DB-Round-Trips"] = str(trace.sequential_round_trips())
+                    headers["X-DB-Commands"] = str(len(trace.commands))
+                if profiler is not None:
+                    profiled, profiler = profiler, None
+                    profile_id = await store_request_profile(scope, status, profiled, trace, started, not requested)
+                    if profile_id:
+                        headers["X-Profile-Id"] = profile_id
+            await send(message)
+        
+        if profiler is not None:
+            profiler.start()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if profiler is not None:
+                profiler.stop()  # failed before responding
+            if trace_token is not None:
+                db_trace.reset(trace_token)
+            access_logger.log(
+                logging.WARNING if status >= 500 else logging.INFO,
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+            )
+
+class CausalTokenMiddleware:
+    """Read the client's X-Causal-Token and hand back a new one after a write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = {"token": Headers(scope=scope).get(CAUSAL_TOKEN_HEADER)}
+        causal_context.set(context)
+        
+        async def send_with_token(message):
+            if message["type"] == "http.response.start" and context.get("write"):
+                user_id, write = context["write"]
+                MutableHeaders(scope=message)[CAUSAL_TOKEN_HEADER] = encode_causal_token(user_id, write)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_token)
+
+def create_app() -> FastAPI:
+    application = FastAPI(lifespan=lifespan)
+    application.state.ready = False
+    application.include_router(api_router)
+    # Pure ASGI layers, innermost first
+    application.add_middleware(CausalTokenMiddleware)
+    application.add_middleware(IdempotencyMiddleware)
+    application.add_middleware(RequestObservabilityMiddleware)
+    application.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[CAUSAL_TOKEN_HEADER],
+    )
+    return application
+
+app = create_app()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HospitalityHub maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild-wage-benchmarks", help="Rebuild /api/market/wages rollups from all active jobs")
+    commands.add_parser("worker", help="Run the background task worker")
+    commands.add_parser("backfill-profile-alerts", help="Create job alerts from existing worker profiles")
+    reconcile = commands.add_parser("reconcile-applicant-counts", help="Recount applications per job and repair drifted job counters")
+    reconcile.add_argument("--batch-size", type=int, default=500)
+    reconcile.add_argument("--dry-run", action="store_true", help="Only report drifted jobs")
+    rollups = commands.add_parser("reconcile-application-rollups", help="Rebuild recent funnel rollups that miss events")
+    rollups.add_argument("--days", type=int, default=2, help="Days back to check, including today")
+    rollups.add_argument("--dry-run", action="store_true", help="Only report drifted buckets")
+    migrate = commands.add_parser("migrate-storage", help="Convert legacy documents to native dates and binary ids")
+    migrate.add_argument("--collection", action="append", dest="collections", help="Collection to migrate (repeatable; default all)")
+    migrate.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    connect_mongo()
+    with queued_logging():
+        if args.command == "rebuild-wage-benchmarks":
+            asyncio.run(rebuild_wage_benchmarks())
+        elif args.command == "worker":
+            asyncio.run(run_worker())
+        elif args.command == "backfill-profile-alerts":
+            asyncio.run(backfill_profile_alerts())
+        elif args.command == "reconcile-applicant-counts":
+            asyncio.run(reconcile_applicant_counts(args.batch_size, args.dry_run))
+        elif args.command == "reconcile-application-rollups":
+            asyncio.run(reconcile_application_rollups(args.days, args.dry_run))
+        elif args.command == "migrate-storage":
+            asyncio.run(migrate_storage(args.collections, args.batch_size))
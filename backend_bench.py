@@ -0,0 +1,421 @@
+"""Offline micro-benchmarks for the in-process data structures in backend/server.py.
+
+Runs without MongoDB or network access:
+
+    python backend_bench.py vector-index --jobs 50000 --queries 200
+    python backend_bench.py storage-layout
+    python backend_bench.py alert-fanout --subscribers 100000
+    python backend_bench.py resilience --upstream slow
+    python backend_bench.py logging --sink-latency-ms 2
+    python backend_bench.py staffing --applicants 5000 --jobs 200
+    python backend_bench.py fieldsets
+"""
+import argparse
+import asyncio
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import bson
+import numpy as np
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+import server  # noqa: E402
+
+CITIES = ["Mumbai", "Delhi", "Bangalore", "Pune", "Hyderabad", "Chennai", "Kolkata", "Goa"]
+SHIFTS = ["morning", "evening", "night", "flexible"]
+ROLE_WORDS = {
+    "barista": ["espresso", "latte art", "coffee machine", "milk steaming", "pour over"],
+    "waiter": ["table service", "order taking", "menu knowledge", "upselling", "fine dining"],
+    "counter_staff": ["billing", "cash handling", "pos system", "takeaway orders", "customer queue"],
+    "cook": ["tandoor", "prep", "line cooking", "food safety", "knife skills"],
+    "host": ["reservations", "greeting guests", "seating plan", "waitlist"],
+    "cleaner": ["dishwashing", "sanitation", "floor cleaning", "waste management"],
+}
+FILLER = "friendly team fast paced weekend tips meals provided uniform training growth hygiene".split()
+
+def synthetic_job(rng, i):
+    role = rng.choice(list(ROLE_WORDS))
+    words = rng.sample(ROLE_WORDS[role], 3) + rng.sample(FILLER, 5)
+    return {
+        "id": f"job-{i}", "title": f"{role.replace('_', ' ').title()} wanted", "role": role,
+        "description": " ".join(words), "requirements": rng.sample(ROLE_WORDS[role], 2),
+        "benefits": rng.sample(FILLER, 2), "location_city": rng.choice(CITIES),
+        "shift_timing": rng.choice(SHIFTS), "is_active": True,
+    }
+
+def synthetic_profile(rng):
+    role = rng.choice(list(ROLE_WORDS))
+    return {
+        "preferred_roles": [role], "skills": rng.sample(ROLE_WORDS[role], 2),
+        "preferred_shifts": [rng.choice(SHIFTS)], "location_city": rng.choice(CITIES),
+    }
+
+def bench_vector_index(args):
+    rng = random.Random(args.seed)
+    embedder = server.get_embedder()
+    index = server.VectorIndex(n_lists=args.lists, n_probe=args.probe)
+
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        job = synthetic_job(rng, i)
+        index.add(job["id"], embedder.embed(server.job_text(job)),
+                  {"location_city": job["location_city"], "role": job["role"], "shift_timing": job["shift_timing"]})
+    build = time.perf_counter() - start
+    print(f"built {args.jobs} vectors (dim {embedder.dim}) in {build:.1f}s, trained={index.centroids is not None}")
+
+    for label, use_filter in (("unfiltered", False), ("city filter", True)):
+        recalls, ann_ms, exact_ms = [], [], []
+        for _ in range(args.queries):
+            profile = synthetic_profile(rng)
+            query = embedder.embed(server.worker_text(profile))
+            filters = {"location_city": profile["location_city"]} if use_filter else None
+            t0 = time.perf_counter()
+            approx = index.search(query, args.k, filters)
+            t1 = time.perf_counter()
+            exact = index.search(query, args.k, filters, exact=True)
+            t2 = time.perf_counter()
+            ann_ms.append((t1 - t0) * 1000)
+            exact_ms.append((t2 - t1) * 1000)
+            # Score-based recall: ties in the synthetic corpus make id overlap meaningless
+            threshold = exact[-1][1] - 1e-6 if exact else 0
+            recalls.append(sum(1 for _, score in approx if score >= threshold) / max(len(exact), 1))
+        print(f"{label:>12}: recall@{args.k} {np.mean(recalls):.3f}  "
+              f"ivf p50 {np.percentile(ann_ms, 50):.2f}ms p95 {np.percentile(ann_ms, 95):.2f}ms  "
+              f"exact p50 {np.percentile(exact_ms, 50):.2f}ms")
+
+def legacy_layout(doc):
+    legacy = {"_id": ObjectId()}
+    for key, value in doc.items():
+        legacy[key] = value.isoformat() if isinstance(value, datetime) else value
+    return legacy
+
+def bench_storage_layout(args):
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    job = {**synthetic_job(rng, 0), "id": str(uuid.uuid4()), "restaurant_id": str(uuid.uuid4()),
+           "restaurant_name": "Blue Tokai", "experience_required": "entry", "wage_min": 15000.0,
+           "wage_max": 18000.0, "created_at": now}
+    application = {"id": str(uuid.uuid4()), "job_id": job["id"], "worker_id": str(uuid.uuid4()),
+                   "worker_name": "Asha", "status": "applied", "applied_at": now, "updated_at": now}
+    for name, doc in (("jobs", job), ("applications", application)):
+        legacy = len(bson.encode(legacy_layout(doc)))
+        compact = len(bson.encode(server.to_storage(doc)))
+        print(f"{name:>12}: document {legacy}B -> {compact}B ({100 * (legacy - compact) / legacy:.0f}% smaller)")
+    # Index keys: what a created_at / job_id index stores per entry
+    for label, old, new in (("date key", now.isoformat(), now), ("reference key", job["id"], server.encode_id(job["id"]))):
+        old_size, new_size = len(bson.encode({"": old})) - 5, len(bson.encode({"": new})) - 5
+        print(f"{label:>13}: {old_size}B -> {new_size}B per index entry")
+
+def bench_alert_fanout(args):
+    rng = random.Random(args.seed)
+    index = server.AlertIndex()
+    job = {"id": str(uuid.uuid4()), "role": "barista", "location_city": "Pune", "shift_timing": "morning", "wage_max": 18000}
+
+    start = time.perf_counter()
+    for i in range(args.subscribers):
+        # Matching alerts, some leaving a dimension open, a few with a wage floor
+        alert = {"id": f"m{i}", "user_id": str(uuid.uuid4()), "roles": ["barista"], "cities": ["Pune"], "shifts": ["morning"]}
+        if i % 3 == 0:
+            alert["shifts"] = []
+        if i % 50 == 0:
+            alert["min_wage"] = rng.choice([15000, 20000])
+        index.upsert(alert)
+    for i in range(args.others):
+        index.upsert({"id": f"o{i}", "user_id": str(uuid.uuid4()), "roles": [rng.choice(list(ROLE_WORDS))],
+                      "cities": [rng.choice([c for c in CITIES if c != "Pune"])], "shifts": [rng.choice(SHIFTS)]})
+    print(f"indexed {args.subscribers + args.others} alerts in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        subscribers = index.match(job)
+        timings.append((time.perf_counter() - t0) * 1000)
+    print(f"percolate: {len(subscribers)} subscribers in p50 {np.percentile(timings, 50):.1f}ms")
+
+    # Digest upserts as sent to Mongo (one bulk_write per ALERT_FANOUT_BATCH)
+    t0 = time.perf_counter()
+    payload = 0
+    for start in range(0, len(subscribers), server.ALERT_FANOUT_BATCH):
+        ops = [
+            {"q": {"_id": f"{user_id}:0"}, "u": {"$addToSet": {"job_ids": job["id"]}, "$setOnInsert": {"user_id": user_id}}, "upsert": True}
+            for user_id in subscribers[start:start + server.ALERT_FANOUT_BATCH]
+        ]
+        payload += len(bson.encode({"updates": ops}))
+    batches = -(-len(subscribers) // server.ALERT_FANOUT_BATCH)
+    print(f"digest writes: {batches} bulk_write batches, {payload / 1e6:.1f}MB, built in {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+async def fake_upstream(mode: str, delay: float):
+    """Local stand-in for a third-party API: healthy, slow, or failing with 500s."""
+    async def handle(reader, writer):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            if mode == "slow":
+                await asyncio.sleep(delay)
+            elif mode == "healthy":
+                await asyncio.sleep(0.02)
+            status = "500 Internal Server Error" if mode == "failing" else "200 OK"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok".encode())
+            await writer.drain()
+        except (asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError):
+            # Client gave up (timed out) or the benchmark is shutting down
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+async def run_resilience(args):
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    server_handle = await fake_upstream(args.upstream, args.delay)
+    url = f"http://127.0.0.1:{server_handle.sockets[0].getsockname()[1]}/"
+    dependency = server.Dependency("bench", timeout=args.timeout, max_concurrency=args.concurrency,
+                                   failure_threshold=5, reset_seconds=args.reset)
+
+    async with httpx.AsyncClient(timeout=30) as http:
+        async def upstream():
+            response = await http.get(url)
+            response.raise_for_status()
+            return response
+
+        async def request(protected: bool):
+            # One API request: the upstream call, or the fallback when it fails
+            start = time.perf_counter()
+            try:
+                await (dependency.call(upstream) if protected else upstream())
+            except Exception:
+                pass
+            return (time.perf_counter() - start) * 1000
+
+        for protected in (False, True):
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited():
+                async with semaphore:
+                    return await request(protected)
+
+            started = time.perf_counter()
+            latencies = await asyncio.gather(*(limited() for _ in range(args.requests)))
+            label = "with Dependency" if protected else "unprotected"
+            print(f"{label:>16}: p50 {np.percentile(latencies, 50):.0f}ms  p99 {np.percentile(latencies, 99):.0f}ms  "
+                  f"wall {time.perf_counter() - started:.1f}s")
+        print(f"breaker: {dependency.snapshot()}")
+    server_handle.close()
+
+def bench_resilience(args):
+    asyncio.run(run_resilience(args))
+
+class SlowSink(logging.Handler):
+    """Handler standing in for a slow log destination (disk under load, network shipper)."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.written = 0
+
+    def emit(self, record):
+        self.format(record)
+        time.sleep(self.latency)
+        self.written += 1
+
+def bench_logging(args):
+    context = {"request_id": uuid.uuid4().hex, "user_id": str(uuid.uuid4())}
+    server.log_context.set(context)
+    for pipeline in ("direct", "queue"):
+        sink = SlowSink(args.sink_latency_ms / 1000)
+        sink.setFormatter(server.JsonFormatter())
+        if pipeline == "direct":
+            handler = sink
+            handler.addFilter(server.ContextFilter())
+            listener = None
+        else:
+            handler = server.RedactingQueueHandler(queue.SimpleQueue())
+            handler.addFilter(server.ContextFilter())
+            listener = logging.handlers.QueueListener(handler.queue, sink)
+            listener.start()
+        bench_logger = logging.getLogger(f"bench.{pipeline}")
+        bench_logger.propagate = False
+        bench_logger.handlers = [handler]
+        bench_logger.setLevel(logging.INFO)
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(args.records):
+            t0 = time.perf_counter()
+            bench_logger.info("OTP issued", extra={"phone": "+919876543210", "attempt": i})
+            latencies.append((time.perf_counter() - t0) * 1e6)
+        caller = time.perf_counter() - started
+        if listener:
+            listener.stop()
+        drained = time.perf_counter() - started
+        print(f"{pipeline:>6}: caller p50 {np.percentile(latencies, 50):.0f}us  p99 {np.percentile(latencies, 99):.0f}us  "
+              f"caller total {caller * 1000:.0f}ms  all written after {drained * 1000:.0f}ms ({sink.written} records)")
+
+def bench_staffing(args):
+    rng = random.Random(args.seed)
+    roles = list(ROLE_WORDS)
+    jobs = [
+        {
+            "id": f"job-{j}", "role": rng.choice(roles), "location_city": rng.choice(CITIES),
+            "shift_timing": rng.choice(SHIFTS[:3]), "experience_required": rng.choice(list(server.EXPERIENCE_MIN_YEARS)),
+            "headcount": rng.randint(1, args.max_headcount),
+        }
+        for j in range(args.jobs)
+    ]
+    profiles, applications = {}, []
+    for w in range(args.applicants):
+        worker_id = f"worker-{w}"
+        profile = synthetic_profile(rng)
+        profiles[worker_id] = {**profile, "user_id": worker_id, "experience_years": rng.randint(0, 8),
+                               "availability": rng.choice(list(server.AVAILABILITY_FIT))}
+        # Chain-wide postings: workers apply to several outlets, mostly in their city
+        local = [job for job in jobs if job["location_city"] == profile["location_city"]]
+        for job in rng.sample(local, min(len(local), rng.randint(1, args.max_applications))):
+            applications.append({"id": f"app-{len(applications)}", "job_id": job["id"], "worker_id": worker_id,
+                                 "worker_name": worker_id, "status": "applied"})
+    positions = sum(job["headcount"] for job in jobs)
+    print(f"{args.applicants} applicants, {args.jobs} jobs, {positions} positions, {len(applications)} applications")
+
+    started = time.perf_counter()
+    plan = server.plan_shortlists(jobs, applications, profiles)
+    elapsed = time.perf_counter() - started
+    print(f"optimizer: {len(plan)} positions filled, total fit {sum(a['score'] for a in plan):.1f}, {elapsed:.2f}s")
+
+    # What shortlisting job by job gives: each job takes its best applicants,
+    # unaware that the same worker is being shortlisted elsewhere
+    scores = {}
+    for app in applications:
+        scores[app["id"]] = float(server.staffing_scores([profiles[app["worker_id"]]], [jobs[int(app["job_id"][4:])]])[0, 0])
+    by_job = {}
+    for app in applications:
+        by_job.setdefault(app["job_id"], []).append(app)
+    picked = [
+        app for job in jobs
+        for app in sorted(by_job.get(job["id"], []), key=lambda app: -scores[app["id"]])[:job["headcount"]]
+    ]
+    # A double-booked worker takes only one of the positions they were shortlisted for
+    filled = {}
+    for app in picked:
+        filled.setdefault(app["worker_id"], app)
+    print(f"job by job: {len(picked)} shortlisted, {len(picked) - len(filled)} double-booked, "
+          f"{len(filled)} positions actually filled, total fit {sum(scores[a['id']] for a in filled.values()):.1f}")
+
+# Fields the mobile cards render
+CARD_FIELDS = {
+    "GET /jobs": "title,restaurant_name,location_city,shift_timing,wage_min,wage_max,created_at",
+    "GET /restaurants/jobs": "title,location_city,shift_timing,is_active,headcount,created_at",
+    "GET /workers/applications": "status,applied_at,job_details.title,job_details.restaurant_name,job_details.location_city",
+    "GET /restaurants/applications/{id}": "worker_name,status,applied_at,worker_profile.experience_years,worker_profile.preferred_roles",
+}
+
+def project(doc: dict, fields: list) -> dict:
+    return {k: v for k, v in doc.items() if k in fields or k == "id"}
+
+def bench_fieldsets(args):
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    jobs, profiles, applications = [], [], []
+    for i in range(args.items):
+        job = synthetic_job(rng, i)
+        job.update(id=str(uuid.uuid4()), restaurant_id=str(uuid.uuid4()), restaurant_name="Blue Tokai",
+                   experience_required="entry", wage_min=15000.0, wage_max=18000.0, created_at=now,
+                   description=" ".join(rng.choice(FILLER + ROLE_WORDS[job["role"]]) for _ in range(args.description_words)))
+        jobs.append(server.Job(**job).model_dump())
+        profile = synthetic_profile(rng)
+        profiles.append(server.WorkerProfile(user_id=str(uuid.uuid4()), experience_years=2, languages=["Hindi", "English"],
+                                             availability="immediate", **profile).model_dump())
+        applications.append(server.Application(job_id=job["id"], worker_id=profiles[-1]["user_id"], worker_name="Asha").model_dump())
+
+    def payload(items):
+        return len(json.dumps(items, default=str).encode())
+
+    def stored(items):
+        return sum(len(bson.encode(server.to_storage(item))) for item in items)
+
+    print(f"{args.items} items per response, descriptions of {args.description_words} words")
+    for endpoint, fields in CARD_FIELDS.items():
+        embed_name, embed_docs, embed_model = None, None, None
+        if "applications" in endpoint:
+            embed_name = "job_details" if "workers" in endpoint else "worker_profile"
+            embed_docs, embed_model = (jobs, server.Job) if embed_name == "job_details" else (profiles, server.WorkerProfile)
+            selection = server.parse_fields(fields, server.Application, {embed_name: embed_model})
+            full = [{**app, embed_name: doc} for app, doc in zip(applications, embed_docs)]
+            sub = selection.embedded[embed_name]
+            sparse = [{**project(app, selection.fields), embed_name: project(doc, sub)} for app, doc in zip(applications, embed_docs)]
+            read_full = stored(applications) + stored(embed_docs)
+            read_sparse = stored([project(a, selection.fields + ["job_id", "worker_id"]) for a in applications]) + stored([project(d, sub) for d in embed_docs])
+        else:
+            selection = server.parse_fields(fields, server.Job)
+            full, sparse = jobs, [project(job, selection.fields) for job in jobs]
+            read_full, read_sparse = stored(jobs), stored(sparse)
+        before, after = payload(full), payload(sparse)
+        print(f"{endpoint:<36} response {before / 1024:6.1f}KB -> {after / 1024:5.1f}KB ({100 * after / before:3.0f}%)  "
+              f"from Mongo {read_full / 1024:6.1f}KB -> {read_sparse / 1024:5.1f}KB ({100 * read_sparse / read_full:3.0f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    vector = commands.add_parser("vector-index", help="Recall and latency of the IVF job index against exact search")
+    vector.add_argument("--jobs", type=int, default=50000)
+    vector.add_argument("--queries", type=int, default=200)
+    vector.add_argument("--k", type=int, default=10)
+    vector.add_argument("--lists", type=int, default=64)
+    vector.add_argument("--probe", type=int, default=8)
+    vector.add_argument("--seed", type=int, default=7)
+    vector.set_defaults(func=bench_vector_index)
+
+    storage = commands.add_parser("storage-layout", help="Document and index key sizes, legacy vs compact layout")
+    storage.add_argument("--seed", type=int, default=7)
+    storage.set_defaults(func=bench_storage_layout)
+
+    alerts = commands.add_parser("alert-fanout", help="Percolating a new job against the job alert index")
+    alerts.add_argument("--subscribers", type=int, default=100000, help="Alerts matching the job")
+    alerts.add_argument("--others", type=int, default=200000, help="Alerts not matching it")
+    alerts.add_argument("--runs", type=int, default=20)
+    alerts.add_argument("--seed", type=int, default=7)
+    alerts.set_defaults(func=bench_alert_fanout)
+
+    resilience = commands.add_parser("resilience", help="Request latency against a slow or failing fake upstream")
+    resilience.add_argument("--upstream", choices=["healthy", "slow", "failing"], default="slow")
+    resilience.add_argument("--delay", type=float, default=2.0, help="Response delay of the slow upstream")
+    resilience.add_argument("--timeout", type=float, default=0.5)
+    resilience.add_argument("--reset", type=float, default=5.0)
+    resilience.add_argument("--requests", type=int, default=200)
+    resilience.add_argument("--concurrency", type=int, default=20)
+    resilience.set_defaults(func=bench_resilience)
+
+    log = commands.add_parser("logging", help="Caller-side cost of a log call, direct handler vs the queue pipeline")
+    log.add_argument("--records", type=int, default=2000)
+    log.add_argument("--sink-latency-ms", type=float, default=2.0, help="Time the sink spends writing one record")
+    log.set_defaults(func=bench_logging)
+
+    staffing = commands.add_parser("staffing", help="Multi-outlet shortlist assignment against job-by-job shortlisting")
+    staffing.add_argument("--applicants", type=int, default=5000)
+    staffing.add_argument("--jobs", type=int, default=200)
+    staffing.add_argument("--max-headcount", type=int, default=3)
+    staffing.add_argument("--max-applications", type=int, default=6, help="Jobs each applicant applies to, at most")
+    staffing.add_argument("--seed", type=int, default=7)
+    staffing.set_defaults(func=bench_staffing)
+
+    fieldsets = commands.add_parser("fieldsets", help="Response and document bytes of list endpoints, full vs card fields")
+    fieldsets.add_argument("--items", type=int, default=100)
+    fieldsets.add_argument("--description-words", type=int, default=120)
+    fieldsets.add_argument("--seed", type=int, default=7)
+    fieldsets.set_defaults(func=bench_fieldsets)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
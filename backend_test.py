@@ -1,7 +1,29 @@
 import requests
 import sys
 import json
+import os
+import subprocess
 from datetime import datetime
+from pathlib import Path
+
+# Operational routes (metrics, request profiles) need the server's ADMIN_API_KEY
+ADMIN_API_KEY = os.environ.get("ADMIN_API_KEY")
+
+# Cold-start budget for `import server` (cumulative, from python -X importtime)
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+
+# Sequential Mongo round-trips allowed per endpoint; checked when the server
+# runs with DB_TRACE_HEADERS=true and reports X-DB-Round-Trips. Without the
+# header the check is reported as skipped, or fails with REQUIRE_DB_ROUND_TRIPS=true
+REQUIRE_DB_ROUND_TRIPS = os.environ.get("REQUIRE_DB_ROUND_TRIPS", "false").lower() == "true"
+MAX_DB_ROUND_TRIPS = {
+    "Job Creation": 4,
+    "Job Application": 4,
+    "Worker Applications View": 2,
+    "Restaurant Applicants View": 2,
+    "Application Status Update": 4,
+    "Restaurant Analytics": 2,
+}
 
 class HospitalityHubAPITester:
     def __init__(self, base_url="https://serveconnect-3.preview.emergentagent.com"):
@@ -47,7 +69,19 @@ class HospitalityHubAPITester:
 
             success = response.status_code == expected_status
             details = f"Status: {response.status_code}"
-            if not success:
+            round_trips = response.headers.get("X-DB-Round-Trips")
+            if success and name in MAX_DB_ROUND_TRIPS and round_trips is None:
+                if REQUIRE_DB_ROUND_TRIPS:
+                    success = False
+                    details += ", X-DB-Round-Trips missing (start the server with DB_TRACE_HEADERS=true)"
+                else:
+                    print(f"   ⏭️  {name}: DB round-trip budget not checked, no X-DB-Round-Trips header")
+            elif success and name in MAX_DB_ROUND_TRIPS:
+                details += f", DB round-trips: {round_trips}"
+                if int(round_trips) > MAX_DB_ROUND_TRIPS[name]:
+                    success = False
+                    details += f" (max {MAX_DB_ROUND_TRIPS[name]})"
+            elif not success:
                 details += f", Expected: {expected_status}"
                 try:
                     error_data = response.json()
@@ -62,6 +96,50 @@ class HospitalityHubAPITester:
             self.log_test(name, False, f"Exception: {str(e)}")
             return False, {}
 
+    def run_backend_check(self, name, script):
+        """Run an in-process check against the backend module; it prints OK on success"""
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parent / "backend",
+            capture_output=True,
+            text=True
+        )
+        success = result.returncode == 0 and result.stdout.strip().endswith("OK")
+        self.log_test(name, success, (result.stdout + result.stderr).strip()[-300:])
+        return success
+
+    def test_import_time(self):
+        """Test that importing the backend stays within the cold-start budget"""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import server"],
+            cwd=Path(__file__).parent / "backend",
+            capture_output=True,
+            text=True
+        )
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == "server":
+                cumulative_us = int(parts[1])
+        if result.returncode != 0 or cumulative_us is None:
+            self.log_test("Server Import Time", False, result.stderr.strip()[-200:])
+            return False
+        
+        import_ms = cumulative_us / 1000
+        self.log_test(
+            "Server Import Time",
+            import_ms <= IMPORT_TIME_BUDGET_MS,
+            f"{import_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+        )
+        return import_ms <= IMPORT_TIME_BUDGET_MS
+
+    def test_readiness(self):
+        """Test liveness and readiness probes"""
+        success, _ = self.run_test("Liveness Probe", "GET", "health/live", 200)
+        if success:
+            success, _ = self.run_test("Readiness Probe", "GET", "health/ready", 200)
+        return success
+
     def test_api_health(self):
         """Test API health endpoint"""
         success, response = self.run_test(
@@ -226,6 +304,41 @@ class HospitalityHubAPITester:
             return True
         return False
 
+    def test_idempotent_job_creation(self):
+        """Test that a retried job posting with the same Idempotency-Key is replayed"""
+        if not self.restaurant_token:
+            return False
+            
+        job_data = {
+            "title": "Weekend Waiter",
+            "role": "waiter",
+            "location_city": "Mumbai",
+            "shift_timing": "evening",
+            "experience_required": "entry",
+            "wage_min": 15000,
+            "wage_max": 18000,
+            "description": "Weekend evening service"
+        }
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.restaurant_token}',
+            'Idempotency-Key': f"job-{datetime.now().strftime('%H%M%S%f')}"
+        }
+        try:
+            first = requests.post(f"{self.api_url}/jobs", json=job_data, headers=headers)
+            retry = requests.post(f"{self.api_url}/jobs", json=job_data, headers=headers)
+            success = (
+                first.status_code == 200
+                and retry.status_code == 200
+                and retry.headers.get("Idempotent-Replayed") == "true"
+                and retry.json().get("id") == first.json().get("id")
+            )
+            self.log_test("Idempotent Job Creation", success, f"Status: {first.status_code}/{retry.status_code}")
+            return success
+        except Exception as e:
+            self.log_test("Idempotent Job Creation", False, f"Exception: {str(e)}")
+            return False
+
     def test_job_browsing(self):
         """Test job browsing (public endpoint)"""
         success, response = self.run_test(
@@ -236,6 +349,27 @@ class HospitalityHubAPITester:
         )
         return success
 
+    def test_sparse_fieldsets(self):
+        """Test fields= returning only the requested job fields"""
+        success, response = self.run_test(
+            "Job Browsing (fields=title,wage_min)",
+            "GET",
+            "jobs?fields=title,wage_min",
+            200
+        )
+        if not success:
+            return False
+        if any(set(job) - {"id", "title", "wage_min"} for job in response):
+            print("❌ Response contains fields that were not requested")
+            return False
+        success, _ = self.run_test(
+            "Job Browsing (unknown field)",
+            "GET",
+            "jobs?fields=salary",
+            400
+        )
+        return success
+
     def test_job_filtering(self):
         """Test job filtering"""
         success, response = self.run_test(
@@ -295,6 +429,97 @@ class HospitalityHubAPITester:
         )
         return success
 
+    def test_applicant_counts(self):
+        """Test the job's applicant counter after applying, and sorting by it"""
+        if not hasattr(self, 'job_id'):
+            return False
+            
+        success, response = self.run_test(
+            "Job Applicant Count",
+            "GET",
+            f"jobs/{self.job_id}",
+            200
+        )
+        if not success or response.get("applicant_count", 0) < 1:
+            return False
+        success, _ = self.run_test(
+            "Job Browsing (sort=fewest_applicants)",
+            "GET",
+            "jobs?sort=fewest_applicants",
+            200
+        )
+        return success
+
+    def test_job_translation(self):
+        """Test requesting a job in another language (translation is null if the LLM is unavailable)"""
+        if not hasattr(self, 'job_id'):
+            return False
+            
+        success, response = self.run_test(
+            "Job Translation (hindi)",
+            "GET",
+            f"jobs/{self.job_id}?language=hindi",
+            200
+        )
+        return success and "translation" in response
+
+    def test_document_upload(self):
+        """Test streaming a resume upload and fetching its download link"""
+        if not self.worker_token:
+            return False
+            
+        headers = {'Authorization': f'Bearer {self.worker_token}', 'Content-Type': 'text/plain'}
+        resume = b"Barista with 2 years of espresso and latte art experience.\n"
+        try:
+            response = requests.post(
+                f"{self.api_url}/workers/documents?filename=resume.txt&kind=resume",
+                data=iter([resume[:20], resume[20:]]),
+                headers=headers
+            )
+            success = response.status_code == 200 and response.json().get("size") == len(resume)
+            self.log_test("Document Upload (streamed)", success, f"Status: {response.status_code}")
+            if not success:
+                return False
+            document_id = response.json()["id"]
+        except Exception as e:
+            self.log_test("Document Upload (streamed)", False, f"Exception: {str(e)}")
+            return False
+        
+        success, response = self.run_test(
+            "Document Download URL",
+            "GET",
+            f"workers/documents/{document_id}/url",
+            200,
+            headers={'Authorization': f'Bearer {self.worker_token}'}
+        )
+        return success and bool(response.get("url"))
+
+    def test_staffing_plan(self):
+        """Test a dry-run staffing plan over the restaurant's jobs"""
+        if not self.restaurant_token or not hasattr(self, 'job_id'):
+            return False
+            
+        headers = {'Authorization': f'Bearer {self.restaurant_token}'}
+        success, response = self.run_test(
+            "Staffing Plan (dry run)",
+            "POST",
+            "restaurants/staffing/optimize",
+            200,
+            data={"job_ids": [self.job_id], "dry_run": True},
+            headers=headers
+        )
+        if not success or response.get("shortlisted_count", 0) > response["jobs"][0]["headcount"]:
+            return False
+        # A dry run writes nothing
+        success, applications = self.run_test(
+            "Applications Unchanged after Dry Run",
+            "GET",
+            f"restaurants/applications/{self.job_id}",
+            200,
+            headers=headers
+        )
+        return success and all(app["status"] == "applied" for app in applications)
+
     def test_application_status_update(self):
         """Test updating application status"""
         if not self.restaurant_token or not hasattr(self, 'application_id'):
@@ -327,6 +552,507 @@ class HospitalityHubAPITester:
         )
         return success
 
+    def test_invalid_status_transition(self):
+        """Test that application status changes follow the hiring state machine"""
+        if not self.restaurant_token or not hasattr(self, 'application_id'):
+            return False
+            
+        status_data = {"status": "applied"}
+        headers = {'Authorization': f'Bearer {self.restaurant_token}'}
+        success, response = self.run_test(
+            "Invalid Status Transition Rejected",
+            "PUT",
+            f"restaurants/applications/{self.application_id}",
+            400,
+            data=status_data,
+            headers=headers
+        )
+        return success
+
+    def test_hiring_funnel(self):
+        """Test hiring funnel and time-to-hire analytics"""
+        if not self.restaurant_token:
+            return False
+            
+        headers = {'Authorization': f'Bearer {self.restaurant_token}'}
+        success, response = self.run_test(
+            "Hiring Funnel",
+            "GET",
+            "restaurants/analytics/funnel",
+            200,
+            headers=headers
+        )
+        if success:
+            success, _ = self.run_test(
+                "Time To Hire",
+                "GET",
+                "restaurants/analytics/time-to-hire",
+                200,
+                headers=headers
+            )
+        return success
+
+    def test_market_wages(self):
+        """Test market wage benchmarks"""
+        success, response = self.run_test(
+            "Market Wage Benchmarks",
+            "GET",
+            "market/wages?role=barista&city=Mumbai&shift=morning",
+            200
+        )
+        return success
+
+    def test_candidate_search(self):
+        """Test candidate search with facets"""
+        if not self.restaurant_token:
+            return False
+            
+        headers = {'Authorization': f'Bearer {self.restaurant_token}'}
+        success, response = self.run_test(
+            "Candidate Search",
+            "GET",
+            "restaurants/candidates/search?roles=barista&city=Mumbai",
+            200,
+            headers=headers
+        )
+        return success and "facets" in response
+
+    def test_candidate_index(self):
+        """Test the candidate bitmap index: OR within a field, AND across fields, facets and updates"""
+        return self.run_backend_check("Candidate Index", """
+import server
+
+index = server.CandidateIndex()
+index.upsert({"user_id": "a", "preferred_roles": ["barista"], "languages": ["en", "hi"], "location_city": "Pune", "skills": ["latte"]})
+index.upsert({"user_id": "b", "preferred_roles": ["waiter"], "languages": ["en"], "location_city": "Pune"})
+index.upsert({"user_id": "c", "preferred_roles": ["barista", "waiter"], "languages": ["hi"], "location_city": "Mumbai", "document_skills": ["espresso"]})
+
+def ids(result):
+    return sorted(index.slots[slot] for slot in result)
+
+# OR within a field, AND across fields, case-insensitive
+assert ids(index.search({"preferred_roles": ["Barista", "waiter"]})) == ["a", "b", "c"]
+assert ids(index.search({"preferred_roles": ["barista", "waiter"], "location_city": ["pune"]})) == ["a", "b"]
+assert ids(index.search({"preferred_roles": ["barista", "waiter"]}, match_all=["preferred_roles"])) == ["c"]
+assert ids(index.search({"languages": ["en", "hi"]}, match_all=["languages"])) == ["a"]
+assert ids(index.search({"skills": ["espresso"]})) == ["c"]  # from uploaded documents
+assert ids(index.search({"preferred_roles": ["cook"]})) == []
+
+# Facets count within the result
+facets = index.facets(index.search({"location_city": ["pune"]}))
+assert {f["value"]: f["count"] for f in facets["preferred_roles"]} == {"barista": 1, "waiter": 1}, facets
+assert {f["value"]: f["count"] for f in facets["languages"]} == {"en": 2, "hi": 1}, facets
+
+# An update replaces the profile's old terms; removal drops it everywhere
+index.upsert({"user_id": "a", "preferred_roles": ["cook"], "languages": ["en"], "location_city": "Mumbai"})
+assert ids(index.search({"preferred_roles": ["barista"]})) == ["c"]
+assert ids(index.search({"preferred_roles": ["cook"], "location_city": ["mumbai"]})) == ["a"]
+assert "latte" not in index.bitmaps["skills"]
+index.remove("c")
+assert ids(index.search({"preferred_roles": ["barista", "waiter"]})) == ["b"]
+assert ids(index.search({})) == ["a", "b"]
+assert index.page(index.search({}), 0, 10) == ["b", "a"]  # most recently indexed first
+print("OK")
+""")
+
+    def test_vector_index(self):
+        """Test the IVF job index against exact search, the city filter fallback and retraining"""
+        return self.run_backend_check("Job Vector Index", """
+import numpy as np
+import server
+
+rng = np.random.default_rng(7)
+centers = rng.normal(size=(16, 32))
+
+def vector(center):
+    v = centers[center] + 0.3 * rng.normal(size=32)
+    return (v / np.linalg.norm(v)).astype(np.float32)
+
+index = server.VectorIndex(n_lists=16, n_probe=4, brute_force_below=500)
+cities = ["Pune", "Mumbai", "Delhi"]
+for i in range(499):
+    index.add(f"job-{i}", vector(i % 16), {"location_city": cities[i % 3]})
+assert index.centroids is None  # exact below brute_force_below
+index.add("job-499", vector(499 % 16), {"location_city": "Goa"})
+assert index.trained_size == 500
+
+# IVF top-k agrees with an exact scan on nearly every neighbour
+recall = []
+for q in range(20):
+    query = vector(q % 16)
+    approx = {item for item, _ in index.search(query, 10)}
+    exact = {item for item, _ in index.search(query, 10, exact=True)}
+    recall.append(len(approx & exact) / 10)
+assert np.mean(recall) >= 0.9, recall
+
+# Filters apply inside the probed lists; a short result falls back to an exact scan
+hits = index.search(vector(0), 10, {"location_city": "Mumbai"})
+assert len(hits) == 10 and all(index.meta[index.row_of[item]]["location_city"] == "Mumbai" for item, _ in hits)
+assert [item for item, _ in index.search(vector(3), 10, {"location_city": "Goa"})] == ["job-499"]
+index.remove("job-499")
+assert index.search(vector(3), 10, {"location_city": "Goa"}) == []
+
+# Retrained once the index has grown 4x since the last training
+for i in range(500, 1999):
+    index.add(f"job-{i}", vector(i % 16), {"location_city": cities[i % 3]})
+assert index.trained_size == 500
+index.add("job-1999", vector(1999 % 16), {"location_city": "Pune"})
+assert index.trained_size == 2000 and sum(len(rows) for rows in index.lists) == 1999
+
+# Recommendations stay in the worker's city, or fall back to every city
+jobs = server.JobVectorIndex()
+jobs.upsert({"id": "barista-pune", "title": "Barista", "role": "barista", "description": "espresso bar", "location_city": "Pune"})
+jobs.upsert({"id": "waiter-mumbai", "title": "Waiter", "role": "waiter", "description": "table service", "location_city": "Mumbai"})
+jobs.upsert({"id": "closed", "title": "Barista", "role": "barista", "location_city": "Pune", "is_active": False})
+in_city = jobs.recommend({"preferred_roles": ["waiter"], "location_city": "Pune"})
+assert [item for item, _ in in_city] == ["barista-pune"], in_city
+anywhere = jobs.recommend({"preferred_roles": ["barista"], "skills": ["coffee"], "location_city": "Goa"})
+assert [item for item, _ in anywhere][0] == "barista-pune", anywhere
+assert {item for item, _ in anywhere} == {"barista-pune", "waiter-mumbai"}
+print("OK")
+""")
+
+    def test_wage_digest(self):
+        """Test t-digest accuracy and merging, and the wage benchmark's optimistic retries"""
+        return self.run_backend_check("Wage Benchmark Digest", """
+import asyncio
+import random
+import server
+
+random.seed(3)
+values = [random.lognormvariate(6, 0.5) for _ in range(20000)]
+ordered = sorted(values)
+
+def rank_error(digest, q):
+    estimate = digest.quantile(q)
+    return abs(sum(v <= estimate for v in ordered) / len(ordered) - q)
+
+digest = server.TDigest()
+for value in values:
+    digest.add(value)
+assert len(digest.centroids) <= 2 * digest.compression, len(digest.centroids)
+assert digest.count == len(values)
+assert all(rank_error(digest, q) < 0.01 for q in (0.1, 0.25, 0.5, 0.75, 0.9)), [rank_error(digest, q) for q in (0.1, 0.5, 0.9)]
+assert digest.quantile(0) == min(values) and abs(digest.quantile(1) - max(values)) < 1e-6
+
+# Two digests merged through their weighted centroids, and a stored round trip
+left, right = server.TDigest(), server.TDigest()
+for i, value in enumerate(values):
+    (left if i % 2 else right).add(value)
+merged = server.TDigest.from_dict(left.to_dict())
+for mean, weight in right.to_dict()["centroids"]:
+    merged.add(mean, weight)
+assert merged.count == len(values)
+assert all(rank_error(merged, q) < 0.015 for q in (0.1, 0.5, 0.9))
+
+# wage_benchmarks where another writer replaces the document before each of our first `lose` attempts
+class ContendedBenchmarks:
+    def __init__(self, lose):
+        self.docs, self.lose, self.attempts = {}, lose, 0
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+    async def insert_one(self, doc):
+        self.docs[doc["_id"]] = dict(doc)
+    async def replace_one(self, query, doc):
+        self.attempts += 1
+        current = self.docs[query["_id"]]
+        if self.attempts <= self.lose:
+            current["version"] += 1
+        ok = current["version"] == query["version"]
+        if ok:
+            self.docs[query["_id"]] = dict(doc)
+        return type("Result", (), {"modified_count": int(ok)})()
+
+class FakeDb:
+    pass
+
+job = {"role": "barista", "location_city": "Pune", "shift_timing": "morning", "wage_min": 100, "wage_max": 200}
+key = server.wage_benchmark_key("barista", "Pune", "morning")
+
+async def main():
+    server.db = FakeDb()
+    server.db.wage_benchmarks = ContendedBenchmarks(lose=3)
+    await server.update_wage_benchmark(job)  # insert
+    await server.update_wage_benchmark(job, max_attempts=5)  # wins on the 4th attempt
+    stored = server.db.wage_benchmarks.docs[key]
+    assert stored["job_count"] == 2 and server.db.wage_benchmarks.attempts == 4, stored
+
+    server.db.wage_benchmarks.lose, server.db.wage_benchmarks.attempts = 10, 0
+    try:
+        await server.update_wage_benchmark(job, max_attempts=3)
+    except server.WageBenchmarkConflict:
+        pass
+    else:
+        raise AssertionError("a lost update must not pass silently")
+    assert server.db.wage_benchmarks.docs[key]["job_count"] == 2
+
+asyncio.run(main())
+print("OK")
+""")
+
+    def test_staffing_solver(self):
+        """Test the assignment solver against brute force, and shortlists with headcount and forbidden pairs"""
+        return self.run_backend_check("Staffing Solver", """
+import itertools
+import numpy as np
+import server
+
+# Optimal against brute force on small square and rectangular matrices
+rng = np.random.default_rng(11)
+for n, m in [(1, 1), (3, 3), (4, 6), (6, 4), (5, 5), (2, 7)]:
+    for _ in range(20):
+        cost = rng.integers(0, 10, size=(n, m)).astype(float)
+        rows, cols = server.solve_assignment(cost)
+        assert len(set(rows)) == len(rows) == len(set(cols)) == min(n, m)
+        if n <= m:
+            best = min(cost[range(n), list(cols_)].sum() for cols_ in itertools.permutations(range(m), n))
+        else:
+            best = min(cost[list(rows_), range(m)].sum() for rows_ in itertools.permutations(range(n), m))
+        assert abs(cost[rows, cols].sum() - best) < 1e-9, (cost, rows, cols, best)
+
+def profile(user_id, role, city="Pune", years=2):
+    return {"user_id": user_id, "preferred_roles": [role], "preferred_shifts": ["evening"],
+            "location_city": city, "experience_years": years, "availability": "immediate"}
+
+def application(app_id, worker_id, job_id, status="applied"):
+    return {"id": app_id, "worker_id": worker_id, "job_id": job_id, "status": status}
+
+jobs = [
+    {"id": "cook", "role": "cook", "shift_timing": "evening", "location_city": "Pune", "headcount": 2},
+    {"id": "barista", "role": "barista", "shift_timing": "evening", "location_city": "Pune", "headcount": 1},
+]
+profiles = {p["user_id"]: p for p in [
+    profile("w1", "cook", years=5), profile("w2", "cook"), profile("w3", "cook", years=1),
+    profile("w4", "barista"), profile("w5", "barista", city="Mumbai"),
+]}
+applications = [
+    application("a1", "w1", "cook"), application("a2", "w2", "cook"), application("a3", "w3", "cook"),
+    application("a4", "w4", "barista"), application("a5", "w5", "barista"),
+    application("a6", "w1", "barista"),  # applied to both; may fill only one
+    application("a7", "w4", "cook"),
+]
+plan = server.plan_shortlists(jobs, applications, profiles)
+chosen = {app["id"] for app in plan}
+by_job = {}
+for app in plan:
+    by_job.setdefault(app["job_id"], []).append(app["worker_id"])
+assert sorted(by_job["cook"]) == ["w1", "w2"] and by_job["barista"] == ["w4"], by_job
+assert len({app["worker_id"] for app in plan}) == len(plan)  # one position per worker
+assert chosen <= {app["id"] for app in applications}  # only pairs the worker applied for
+
+# Held positions and committed workers are left out; min_score forbids weak pairs
+applications.append(application("a8", "w9", "cook", "interview"))
+plan = server.plan_shortlists(jobs, applications, profiles)
+assert [app["worker_id"] for app in plan if app["job_id"] == "cook"] == ["w1"], plan
+plan = server.plan_shortlists(jobs, applications, profiles, min_score=1.01)
+assert plan == []
+
+# A worker who applied for nothing open is never assigned, even if they fit it best
+plan = server.plan_shortlists(jobs[1:], [application("b1", "w1", "cook"), application("b2", "w5", "barista")], profiles)
+assert [app["id"] for app in plan] == ["b2"], plan
+print("OK")
+""")
+
+    def test_request_profiling(self):
+        """Test that X-Profile needs the admin key and that a profiled request stores its report"""
+        return self.run_backend_check("Request Profiling", """
+import asyncio
+import os
+os.environ["ADMIN_API_KEY"] = "profiling-check-key"
+import httpx
+import server
+
+class RequestProfiles:
+    def __init__(self):
+        self.docs = []
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+class FakeDb:
+    request_profiles = RequestProfiles()
+
+async def main():
+    server.db = FakeDb()
+    transport = httpx.ASGITransport(app=server.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        for headers in ({"X-Profile": "1"}, {"X-Profile": "1", "X-Admin-Key": "wrong"}, {"X-Admin-Key": "profiling-check-key"}):
+            response = await client.get("/api/", headers=headers)
+            assert response.status_code == 200 and "X-Profile-Id" not in response.headers, headers
+        assert server.db.request_profiles.docs == []
+
+        response = await client.get("/api/", headers={"X-Profile": "1", "X-Admin-Key": "profiling-check-key"})
+        assert response.status_code == 200 and response.json()["status"] == "running"
+        [stored] = server.db.request_profiles.docs
+        assert response.headers["X-Profile-Id"] == stored["id"]
+        assert stored["path"] == "/api/" and stored["status_code"] == 200 and not stored["sampled"], stored
+        assert stored["report"].get("session") or stored["report"].get("text"), stored["report"]
+
+asyncio.run(main())
+print("OK")
+""")
+
+    def test_dependency_metrics(self):
+        """Test circuit breaker state for third-party dependencies, behind the admin key"""
+        denied, _ = self.run_test(
+            "Dependency Metrics without Admin Key",
+            "GET",
+            "metrics/dependencies",
+            403
+        )
+        if not ADMIN_API_KEY:
+            print("   Skipping admin metrics check: ADMIN_API_KEY is not set")
+            return denied
+        success, response = self.run_test(
+            "Dependency Metrics",
+            "GET",
+            "metrics/dependencies",
+            200,
+            headers={'X-Admin-Key': ADMIN_API_KEY}
+        )
+        return denied and success and all(response.get(name, {}).get("state") in ("closed", "open", "half_open") for name in ("llm", "stripe"))
+
+    def test_circuit_breaker_cancellation(self):
+        """Test that a cancelled half-open trial doesn't leave the breaker stuck"""
+        return self.run_backend_check("Circuit Breaker Cancelled Trial", """
+import asyncio
+import server
+
+async def main():
+    dependency = server.Dependency("probe", timeout=5, max_concurrency=2, failure_threshold=1, reset_seconds=0)
+
+    async def fail():
+        raise RuntimeError("down")
+
+    async def ok():
+        return "ok"
+
+    try:
+        await dependency.call(fail)
+    except RuntimeError:
+        pass
+    # Half-open trial abandoned by its caller
+    try:
+        await asyncio.wait_for(dependency.call(asyncio.sleep, 10), 0.05)
+    except asyncio.TimeoutError:
+        pass
+    assert dependency.in_flight == 0, dependency.snapshot()
+    assert await dependency.call(ok) == "ok", dependency.snapshot()
+    assert dependency.state == "closed", dependency.snapshot()
+    print("OK")
+
+asyncio.run(main())
+""")
+
+    def test_log_redaction(self):
+        """Test that OTPs never reach the log output"""
+        return self.run_backend_check("Log Redaction (OTP)", """
+import asyncio
+import logging
+import queue
+import server
+
+records = queue.SimpleQueue()
+handler = server.RedactingQueueHandler(records)
+handler.addFilter(server.ContextFilter())
+logging.getLogger().handlers = [handler]
+logging.getLogger().setLevel(logging.INFO)
+
+asyncio.run(server.send_otp_sms({"phone": "+919876543210", "otp": "482913"}))
+logging.info("OTP for +91 98765 43210: 482913", extra={"note": "code 482913", "details": "your pin is 482913"})
+logging.info("Sending %s", "verification code 482913")
+
+formatter = server.JsonFormatter()
+output = []
+while not records.empty():
+    output.append(formatter.format(records.get()))
+assert len(output) == 3, output
+assert not any("482913" in line or "9876543210" in line for line in output), output
+print("OK")
+""")
+
+    def test_causal_tokens(self):
+        """Test that X-Causal-Token is signed and bound to the user who wrote"""
+        return self.run_backend_check("Causal Token Signing", """
+import time
+from bson.timestamp import Timestamp
+import server
+
+write = {
+    "at": time.time(),
+    "cluster_time": {"clusterTime": Timestamp(1700000000, 7)},
+    "operation_time": Timestamp(1700000000, 7),
+}
+token = server.encode_causal_token("user-a", write)
+decoded = server.decode_causal_token(token, "user-a")
+assert decoded == write, decoded
+
+# Another user's token, a tampered body or signature, and garbage are ignored
+assert server.decode_causal_token(token, "user-b") is None
+body, _, signature = token.partition(".")
+other = server.encode_causal_token("user-b", write).partition(".")[0]
+assert server.decode_causal_token(f"{other}.{signature}", "user-b") is None
+assert server.decode_causal_token(f"{body}.{'0' * len(signature)}", "user-a") is None
+assert server.decode_causal_token("not-a-token", "user-a") is None
+
+# A request carrying user-a's token reads user-a's data from the primary only
+server.connect_mongo()
+server.recent_writes.clear()
+server.causal_context.set({"token": token})
+assert server.user_reader("user-a") is server.db
+assert server.user_reader("user-b") is server.db_public
+server.causal_context.set({"token": token + "0"})
+assert server.user_reader("user-a") is server.db_public
+
+# Tokens older than the read-your-writes window no longer pin reads
+stale = dict(write, at=time.time() - server.READ_YOUR_WRITES_WINDOW_SECONDS - 1)
+server.causal_context.set({"token": server.encode_causal_token("user-a", stale)})
+assert server.user_reader("user-a") is server.db_public
+print("OK")
+""")
+
+    def test_dashboards(self):
+        """Test the aggregated worker and restaurant dashboards"""
+        results = []
+        for role, token in (("workers", self.worker_token), ("restaurants", self.restaurant_token)):
+            if not token:
+                continue
+            success, response = self.run_test(
+                f"Dashboard ({role})",
+                "GET",
+                f"{role}/dashboard",
+                200,
+                headers={'Authorization': f'Bearer {token}'}
+            )
+            results.append(success and set(response.get("timings_ms", {})) == set(response.get("sections", {})))
+        return bool(results) and all(results)
+
+    def test_job_alerts(self):
+        """Test saving a job alert and listing it with the profile alert"""
+        if not self.worker_token:
+            return False
+            
+        headers = {'Authorization': f'Bearer {self.worker_token}'}
+        success, response = self.run_test(
+            "Create Job Alert",
+            "POST",
+            "alerts",
+            200,
+            data={"name": "Evening barista", "roles": ["barista"], "cities": ["Mumbai"], "shifts": ["evening"]},
+            headers=headers
+        )
+        if not success:
+            return False
+        
+        success, response = self.run_test(
+            "List Job Alerts",
+            "GET",
+            "alerts",
+            200,
+            headers=headers
+        )
+        return success and any(alert.get("source") == "profile" for alert in response)
+
     def test_otp_functionality(self):
         """Test OTP send and verify (mocked)"""
         timestamp = datetime.now().strftime('%H%M%S')
@@ -355,6 +1081,76 @@ class HospitalityHubAPITester:
             return success
         return False
 
+    def test_task_queue(self):
+        """Test the Mongo-backed task queue: success, retry with backoff, dead-lettering and the fake providers"""
+        return self.run_backend_check("Background Task Queue", """
+import asyncio
+import os
+import time
+import uuid
+import server
+
+# Scratch database, dropped afterwards
+os.environ["DB_NAME"] = f"{os.environ['DB_NAME']}_task_queue_check"
+os.environ["SMS_PROVIDER"] = "log"
+os.environ["EMAIL_PROVIDER"] = "log"
+attempts = []
+
+@server.task_handler("check_succeeds")
+async def check_succeeds(payload):
+    pass
+
+@server.task_handler("check_fails", max_attempts=3, backoff_seconds=0.2)
+async def check_fails(payload):
+    attempts.append(time.monotonic())
+    raise RuntimeError("always fails")
+
+async def wait_for(task_type, status, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        task = await server.db.background_tasks.find_one({"type": task_type}, {"_id": 0})
+        if task and task["status"] == status:
+            return task
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"{task_type} not {status}: {task}")
+
+async def main():
+    server.connect_mongo()
+    queue = server.TaskQueue(poll_seconds=0.05)
+    server.task_queue = queue
+    queue.start()
+    try:
+        restaurant_id = str(uuid.uuid4())
+        await server.db.users.insert_one({"id": restaurant_id, "role": "restaurant", "email": "owner@example.com"})
+        await server.enqueue_task("check_succeeds", {})
+        await server.enqueue_task("check_fails", {})
+        await server.enqueue_task("send_otp_sms", {"phone": "+910000000000", "otp": "123456"})
+        await server.enqueue_task("email_new_applicant", {
+            "restaurant_id": restaurant_id, "job_title": "Barista", "worker_name": "Asha"
+        })
+
+        task = await wait_for("check_succeeds", "done")
+        assert task["attempts"] == 1 and task.get("finished_at"), task
+
+        task = await wait_for("check_fails", "dead")
+        assert task["attempts"] == 3 and "always fails" in task["last_error"], task
+        assert len(attempts) == 3, attempts
+        gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+        # Backoff of 0.2s then 0.4s, with +-20% jitter
+        assert gaps[0] >= 0.15 and gaps[1] >= 0.3 and gaps[1] > gaps[0] * 1.2, gaps
+
+        await wait_for("send_otp_sms", "done")
+        assert server.get_sms_provider().sent[-1]["message"].endswith("123456")
+        await wait_for("email_new_applicant", "done")
+        assert server.get_email_provider().sent[-1]["to"] == "owner@example.com"
+    finally:
+        await queue.stop()
+        await server.client.drop_database(os.environ["DB_NAME"])
+    print("OK")
+
+asyncio.run(main())
+""")
+
     def run_all_tests(self):
         """Run all API tests"""
         print("🚀 Starting HospitalityHub API Tests...")
@@ -362,8 +1158,19 @@ class HospitalityHubAPITester:
         print("=" * 50)
 
         # Basic API tests
+        self.test_import_time()
+        self.test_circuit_breaker_cancellation()
+        self.test_log_redaction()
+        self.test_causal_tokens()
+        self.test_candidate_index()
+        self.test_vector_index()
+        self.test_wage_digest()
+        self.test_staffing_solver()
+        self.test_request_profiling()
         self.test_api_health()
+        self.test_readiness()
         self.test_otp_functionality()
+        self.test_task_queue()
 
         # Authentication tests
         if self.test_worker_registration():
@@ -372,23 +1179,36 @@ class HospitalityHubAPITester:
 
         if self.test_restaurant_registration():
             self.test_restaurant_profile_creation()
+            self.test_idempotent_job_creation()
             if self.test_job_creation():
                 self.test_job_application()
                 self.test_restaurant_applicants_view()
+                self.test_applicant_counts()
+                self.test_job_translation()
+                self.test_staffing_plan()
                 if hasattr(self, 'application_id'):
                     self.test_application_status_update()
+                    self.test_invalid_status_transition()
 
         # Public endpoints
         self.test_job_browsing()
         self.test_job_filtering()
+        self.test_sparse_fieldsets()
+        self.test_market_wages()
+        self.test_dependency_metrics()
+        self.test_dashboards()
 
         # Worker-specific tests
         if self.worker_token:
             self.test_worker_applications_view()
+            self.test_job_alerts()
+            self.test_document_upload()
 
         # Restaurant-specific tests
         if self.restaurant_token:
             self.test_restaurant_analytics()
+            self.test_hiring_funnel()
+            self.test_candidate_search()
 
         # Print results
         print("=" * 50)
@@ -7,6 +7,14 @@ const config = {
   disableHotReload: process.env.DISABLE_HOT_RELOAD === "true",
   enableVisualEdits: process.env.REACT_APP_ENABLE_VISUAL_EDITS === "true",
   enableHealthCheck: process.env.ENABLE_HEALTH_CHECK === "true",
+  enforceBundleBudget: process.env.BUNDLE_BUDGET !== "off",
+};
+
+// Production bundle budget (minified, pre-gzip). The entrypoint is what a
+// first-time visitor downloads before anything renders; route chunks are lazy.
+const bundleBudget = {
+  maxEntrypointSize: parseInt(process.env.BUNDLE_BUDGET_ENTRY_KB || "450", 10) * 1024,
+  maxAssetSize: parseInt(process.env.BUNDLE_BUDGET_CHUNK_KB || "450", 10) * 1024,
 };
 
 // Conditionally load visual editing modules only if enabled
@@ -63,6 +71,15 @@ const webpackConfig = {
         };
       }
 
+      // Fail production builds that exceed the bundle budget
+      if (config.enforceBundleBudget && webpackConfig.mode === "production") {
+        webpackConfig.performance = {
+          hints: "error",
+          ...bundleBudget,
+          assetFilter: (assetFilename) => assetFilename.endsWith(".js"),
+        };
+      }
+
       // Add health check plugin to webpack if enabled
       if (config.enableHealthCheck && healthPluginInstance) {
         webpackConfig.plugins.push(healthPluginInstance);
@@ -0,0 +1,72 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+export const API = `${BACKEND_URL}/api`;
+
+// Read-your-writes: the backend returns a causal token after each write;
+// sending it back keeps our next reads consistent with that write, whichever
+// server instance handles them
+const CAUSAL_TOKEN_HEADER = "X-Causal-Token";
+
+const setCausalToken = (token) => {
+  sessionStorage.setItem("causalToken", token);
+  axios.defaults.headers.common[CAUSAL_TOKEN_HEADER] = token;
+};
+
+const storedCausalToken = sessionStorage.getItem("causalToken");
+if (storedCausalToken) {
+  axios.defaults.headers.common[CAUSAL_TOKEN_HEADER] = storedCausalToken;
+}
+
+axios.interceptors.response.use((response) => {
+  const token = response.headers[CAUSAL_TOKEN_HEADER.toLowerCase()];
+  if (token) setCausalToken(token);
+  return response;
+});
+
+// Auth Context
+const AuthContext = React.createContext(null);
+
+export const useAuth = () => {
+  const context = React.useContext(AuthContext);
+  if (!context) throw new Error("useAuth must be used within AuthProvider");
+  return context;
+};
+
+export const AuthProvider = ({ children }) => {
+  const [user, setUser] = useState(null);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    const userData = localStorage.getItem("user");
+    if (token && userData) {
+      setUser(JSON.parse(userData));
+      axios.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+    }
+    setLoading(false);
+  }, []);
+
+  const login = (token, userData) => {
+    localStorage.setItem("token", token);
+    localStorage.setItem("user", JSON.stringify(userData));
+    axios.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+    setUser(userData);
+  };
+
+  const logout = () => {
+    localStorage.removeItem("token");
+    localStorage.removeItem("user");
+    sessionStorage.removeItem("causalToken");
+    delete axios.defaults.headers.common["Authorization"];
+    delete axios.defaults.headers.common[CAUSAL_TOKEN_HEADER];
+    setUser(null);
+  };
+
+  return (
+    <AuthContext.Provider value={{ user, login, logout, loading }}>
+      {children}
+    </AuthContext.Provider>
+  );
+};
@@ -0,0 +1,160 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate } from "react-router-dom";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { toast } from "sonner";
+import { API, useAuth } from "@/lib/auth";
+
+// Login/Register Page
+const AuthPage = () => {
+  const [isLogin, setIsLogin] = useState(true);
+  const [formData, setFormData] = useState({
+    phone: "",
+    password: "",
+    name: "",
+    email: "",
+    role: "worker"
+  });
+  const navigate = useNavigate();
+  const { login } = useAuth();
+  const [loading, setLoading] = useState(false);
+
+  // Reset form data when switching between login/register
+  useEffect(() => {
+    setFormData({
+      phone: "",
+      password: "",
+      name: "",
+      email: "",
+      role: "worker"
+    });
+  }, [isLogin]);
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setLoading(true);
+
+    try {
+      const endpoint = isLogin ? "/auth/login" : "/auth/register";
+      const response = await axios.post(`${API}${endpoint}`, formData);
+      
+      login(response.data.access_token, {
+        user_id: response.data.user_id,
+        role: response.data.role
+      });
+      
+      toast.success(isLogin ? "Logged in successfully!" : "Registration successful!");
+      
+      if (response.data.role === "worker") {
+        navigate("/worker/jobs");
+      } else {
+        navigate("/restaurant/dashboard");
+      }
+    } catch (error) {
+      toast.error(error.response?.data?.detail || "Authentication failed");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-blue-50 via-white to-blue-50 flex items-center justify-center p-6">
+      <Card className="w-full max-w-md shadow-xl">
+        <CardHeader>
+          <CardTitle className="text-2xl text-center">
+            {isLogin ? "Welcome Back" : "Join HospitalityHub"}
+          </CardTitle>
+        </CardHeader>
+        <CardContent>
+          <Tabs value={isLogin ? "login" : "register"} onValueChange={(v) => setIsLogin(v === "login")}>
+            <TabsList className="grid w-full grid-cols-2 mb-6">
+              <TabsTrigger data-testid="login-tab" value="login">Login</TabsTrigger>
+              <TabsTrigger data-testid="register-tab" value="register">Register</TabsTrigger>
+            </TabsList>
+
+            <form onSubmit={handleSubmit}>
+              {!isLogin && (
+                <>
+                  <div className="space-y-4 mb-4">
+                    <div>
+                      <Label>I am a</Label>
+                      <Select 
+                        value={formData.role} 
+                        onValueChange={(v) => setFormData({...formData, role: v})}
+                      >
+                        <SelectTrigger data-testid="role-select">
+                          <SelectValue />
+                        </SelectTrigger>
+                        <SelectContent>
+                          <SelectItem value="worker">Job Seeker (Worker)</SelectItem>
+                          <SelectItem value="restaurant">Employer (Restaurant)</SelectItem>
+                        </SelectContent>
+                      </Select>
+                    </div>
+                    <div>
+                      <Label>Full Name</Label>
+                      <Input 
+                        data-testid="name-input"
+                        value={formData.name}
+                        onChange={(e) => setFormData({...formData, name: e.target.value})}
+                        required
+                      />
+                    </div>
+                    <div>
+                      <Label>Email (Optional)</Label>
+                      <Input 
+                        data-testid="email-input"
+                        type="email"
+                        value={formData.email}
+                        onChange={(e) => setFormData({...formData, email: e.target.value})}
+                      />
+                    </div>
+                  </div>
+                </>
+              )}
+              
+              <div className="space-y-4">
+                <div>
+                  <Label>Phone Number</Label>
+                  <Input 
+                    data-testid="phone-input"
+                    placeholder="+91 XXXXXXXXXX"
+                    value={formData.phone}
+                    onChange={(e) => setFormData({...formData, phone: e.target.value})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Password</Label>
+                  <Input 
+                    data-testid="password-input"
+                    type="password"
+                    value={formData.password}
+                    onChange={(e) => setFormData({...formData, password: e.target.value})}
+                    required
+                  />
+                </div>
+              </div>
+
+              <Button 
+                data-testid="submit-auth-btn"
+                type="submit" 
+                className="w-full mt-6 bg-blue-600 hover:bg-blue-700"
+                disabled={loading}
+              >
+                {loading ? "Processing..." : (isLogin ? "Login" : "Register")}
+              </Button>
+            </form>
+          </Tabs>
+        </CardContent>
+      </Card>
+    </div>
+  );
+};
+
+export default AuthPage;
@@ -0,0 +1,140 @@
+import React from "react";
+import { useNavigate } from "react-router-dom";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent } from "@/components/ui/card";
+import { Clock, Briefcase, Star, TrendingUp, Users, FileText, ChevronRight } from "lucide-react";
+
+// Landing Page
+const LandingPage = () => {
+  const navigate = useNavigate();
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-blue-50 via-white to-blue-50">
+      {/* Hero Section */}
+      <div className="relative overflow-hidden">
+        <div className="absolute inset-0 bg-gradient-to-br from-blue-600/5 to-blue-800/5 z-0"></div>
+        
+        <nav className="relative z-10 px-6 py-4">
+          <div className="max-w-7xl mx-auto flex justify-between items-center">
+            <div className="flex items-center space-x-2">
+              <Briefcase className="w-8 h-8 text-blue-600" />
+              <span className="text-2xl font-bold text-gray-900">HospitalityHub</span>
+            </div>
+            <Button 
+              data-testid="nav-login-btn"
+              onClick={() => navigate("/login")} 
+              className="bg-blue-600 hover:bg-blue-700 text-white px-6"
+            >
+              Login
+            </Button>
+          </div>
+        </nav>
+
+        <div className="relative z-10 max-w-7xl mx-auto px-6 py-20 lg:py-32">
+          <div className="grid lg:grid-cols-2 gap-12 items-center">
+            <div>
+              <h1 className="text-4xl sm:text-5xl lg:text-6xl font-bold text-gray-900 mb-6 leading-tight">
+                India's Most Trusted
+                <span className="block text-blue-600">Hospitality Job Platform</span>
+              </h1>
+              <p className="text-lg text-gray-600 mb-8 leading-relaxed">
+                Connecting skilled waiters, baristas, and service staff with ethical QSR brands and cafés. 
+                Find verified jobs in 48 hours or hire quality candidates at 40% lower cost.
+              </p>
+              <div className="flex flex-wrap gap-4">
+                <Button 
+                  data-testid="find-jobs-btn"
+                  onClick={() => navigate("/register?role=worker")} 
+                  className="bg-blue-600 hover:bg-blue-700 text-white px-8 py-6 text-lg rounded-full"
+                >
+                  Find Jobs
+                  <ChevronRight className="ml-2 w-5 h-5" />
+                </Button>
+                <Button 
+                  data-testid="hire-talent-btn"
+                  onClick={() => navigate("/register?role=restaurant")} 
+                  variant="outline"
+                  className="border-2 border-blue-600 text-blue-600 hover:bg-blue-50 px-8 py-6 text-lg rounded-full"
+                >
+                  Hire Talent
+                </Button>
+              </div>
+            </div>
+            <div className="relative">
+              <div className="bg-white rounded-3xl shadow-2xl p-8 space-y-6">
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500">Average Hiring Time</p>
+                    <p className="text-3xl font-bold text-blue-600">48 Hours</p>
+                  </div>
+                  <Clock className="w-12 h-12 text-blue-600" />
+                </div>
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500">Cost Savings</p>
+                    <p className="text-3xl font-bold text-green-600">40% Lower</p>
+                  </div>
+                  <TrendingUp className="w-12 h-12 text-green-600" />
+                </div>
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500">Verified Employers</p>
+                    <p className="text-3xl font-bold text-purple-600">100%</p>
+                  </div>
+                  <Star className="w-12 h-12 text-purple-600" />
+                </div>
+              </div>
+            </div>
+          </div>
+        </div>
+      </div>
+
+      {/* Features Section */}
+      <div className="py-20 px-6 bg-white">
+        <div className="max-w-7xl mx-auto">
+          <h2 className="text-3xl sm:text-4xl font-bold text-center mb-12 text-gray-900">Why Choose HospitalityHub?</h2>
+          <div className="grid md:grid-cols-3 gap-8">
+            <Card className="border-2 hover:border-blue-600 transition-all duration-300">
+              <CardContent className="pt-6">
+                <Users className="w-12 h-12 text-blue-600 mb-4" />
+                <h3 className="text-xl font-semibold mb-2">Verified Employers</h3>
+                <p className="text-gray-600">All restaurants verified for wage compliance and work environment standards.</p>
+              </CardContent>
+            </Card>
+            <Card className="border-2 hover:border-blue-600 transition-all duration-300">
+              <CardContent className="pt-6">
+                <TrendingUp className="w-12 h-12 text-green-600 mb-4" />
+                <h3 className="text-xl font-semibold mb-2">Wage Transparency</h3>
+                <p className="text-gray-600">See real wage data by role and location before you apply.</p>
+              </CardContent>
+            </Card>
+            <Card className="border-2 hover:border-blue-600 transition-all duration-300">
+              <CardContent className="pt-6">
+                <FileText className="w-12 h-12 text-purple-600 mb-4" />
+                <h3 className="text-xl font-semibold mb-2">Smart Matching</h3>
+                <p className="text-gray-600">AI-powered job recommendations based on your skills and preferences.</p>
+              </CardContent>
+            </Card>
+          </div>
+        </div>
+      </div>
+
+      {/* CTA Section */}
+      <div className="py-20 px-6 bg-gradient-to-br from-blue-600 to-blue-800">
+        <div className="max-w-4xl mx-auto text-center">
+          <h2 className="text-3xl sm:text-4xl font-bold text-white mb-6">Ready to Get Started?</h2>
+          <p className="text-xl text-blue-100 mb-8">Join thousands of hospitality professionals and leading restaurants</p>
+          <Button 
+            data-testid="get-started-btn"
+            onClick={() => navigate("/register")} 
+            className="bg-white text-blue-600 hover:bg-gray-100 px-8 py-6 text-lg rounded-full"
+          >
+            Get Started Today
+          </Button>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default LandingPage;
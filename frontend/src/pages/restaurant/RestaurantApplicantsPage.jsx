@@ -0,0 +1,122 @@
+import React, { useState, useEffect } from "react";
+import { useParams } from "react-router-dom";
+import axios from "axios";
+import { Card, CardContent } from "@/components/ui/card";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { toast } from "sonner";
+import { MapPin, Briefcase } from "lucide-react";
+import { API } from "@/lib/auth";
+import RestaurantNav from "./RestaurantNav";
+
+const STATUS_LABELS = {
+  applied: "Applied",
+  shortlisted: "Shortlisted",
+  interview: "Interview",
+  offered: "Offered",
+  accepted: "Accepted",
+  rejected: "Rejected",
+};
+
+// Mirrors APPLICATION_STATUS_TRANSITIONS in the backend, which rejects anything else
+const NEXT_STATUSES = {
+  applied: ["shortlisted", "interview", "rejected"],
+  shortlisted: ["interview", "offered", "rejected"],
+  interview: ["offered", "rejected"],
+  offered: ["accepted", "rejected"],
+  accepted: [],
+  rejected: [],
+};
+
+// Restaurant Applicants
+const RestaurantApplicantsPage = () => {
+  const [applications, setApplications] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const { jobId } = useParams();
+
+  useEffect(() => {
+    fetchApplications();
+  }, [jobId]);
+
+  const fetchApplications = async () => {
+    try {
+      const response = await axios.get(`${API}/restaurants/applications/${jobId}`);
+      setApplications(response.data);
+    } catch (error) {
+      toast.error("Failed to load applications");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const updateStatus = async (applicationId, status) => {
+    try {
+      await axios.put(`${API}/restaurants/applications/${applicationId}`, { status });
+      toast.success(`Application ${status}!`);
+      fetchApplications();
+    } catch (error) {
+      toast.error("Failed to update status");
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <RestaurantNav />
+      
+      <div className="max-w-7xl mx-auto px-6 py-8">
+        <h1 className="text-3xl font-bold text-gray-900 mb-8">Job Applicants</h1>
+
+        {loading ? (
+          <div className="text-center py-12">Loading applications...</div>
+        ) : (
+          <div className="grid gap-6">
+            {applications.map((app) => (
+              <Card key={app.id} data-testid={`applicant-card-${app.id}`}>
+                <CardContent className="pt-6">
+                  <div className="flex justify-between items-start">
+                    <div className="flex-1">
+                      <h3 className="text-xl font-semibold text-gray-900 mb-2">{app.worker_name}</h3>
+                      {app.worker_profile && (
+                        <div className="space-y-2 text-gray-600">
+                          <p><MapPin className="w-4 h-4 inline mr-1" />{app.worker_profile.location_city}</p>
+                          <p><Briefcase className="w-4 h-4 inline mr-1" />{app.worker_profile.experience_years} years experience</p>
+                          <p>Roles: {app.worker_profile.preferred_roles.join(", ")}</p>
+                          <p>Languages: {app.worker_profile.languages.join(", ")}</p>
+                        </div>
+                      )}
+                      <p className="text-sm text-gray-500 mt-3">
+                        Applied {new Date(app.applied_at).toLocaleDateString()}
+                      </p>
+                    </div>
+                    <div className="flex flex-col space-y-2">
+                      <Select 
+                        value={app.status}
+                        onValueChange={(v) => v !== app.status && updateStatus(app.id, v)}
+                        disabled={!(NEXT_STATUSES[app.status] || []).length}
+                      >
+                        <SelectTrigger data-testid={`status-select-${app.id}`} className="w-40">
+                          <SelectValue />
+                        </SelectTrigger>
+                        <SelectContent>
+                          {[app.status, ...(NEXT_STATUSES[app.status] || [])].map((status) => (
+                            <SelectItem key={status} value={status}>{STATUS_LABELS[status] || status}</SelectItem>
+                          ))}
+                        </SelectContent>
+                      </Select>
+                    </div>
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+            {applications.length === 0 && (
+              <div className="text-center py-12 text-gray-500">
+                No applications yet for this job.
+              </div>
+            )}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default RestaurantApplicantsPage;
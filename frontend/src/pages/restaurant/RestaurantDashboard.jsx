@@ -0,0 +1,111 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { toast } from "sonner";
+import { Briefcase, Star, Users, FileText } from "lucide-react";
+import { API } from "@/lib/auth";
+import RestaurantNav from "./RestaurantNav";
+
+// Restaurant Dashboard
+const RestaurantDashboard = () => {
+  const [analytics, setAnalytics] = useState(null);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    fetchAnalytics();
+  }, []);
+
+  const fetchAnalytics = async () => {
+    try {
+      const response = await axios.get(`${API}/restaurants/analytics`);
+      setAnalytics(response.data);
+    } catch (error) {
+      toast.error("Failed to load analytics");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <RestaurantNav />
+      
+      <div className="max-w-7xl mx-auto px-6 py-8">
+        <h1 className="text-3xl font-bold text-gray-900 mb-8">Dashboard</h1>
+
+        {loading ? (
+          <div className="text-center py-12">Loading analytics...</div>
+        ) : analytics ? (
+          <div className="grid md:grid-cols-4 gap-6 mb-8">
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500 mb-1">Total Jobs</p>
+                    <p className="text-3xl font-bold text-gray-900">{analytics.total_jobs}</p>
+                  </div>
+                  <Briefcase className="w-10 h-10 text-blue-600" />
+                </div>
+              </CardContent>
+            </Card>
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500 mb-1">Total Applications</p>
+                    <p className="text-3xl font-bold text-gray-900">{analytics.total_applications}</p>
+                  </div>
+                  <Users className="w-10 h-10 text-green-600" />
+                </div>
+              </CardContent>
+            </Card>
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500 mb-1">Average Rating</p>
+                    <p className="text-3xl font-bold text-gray-900">{analytics.average_rating}/5</p>
+                  </div>
+                  <Star className="w-10 h-10 text-yellow-500" />
+                </div>
+              </CardContent>
+            </Card>
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center justify-between">
+                  <div>
+                    <p className="text-sm text-gray-500 mb-1">Total Reviews</p>
+                    <p className="text-3xl font-bold text-gray-900">{analytics.total_reviews}</p>
+                  </div>
+                  <FileText className="w-10 h-10 text-purple-600" />
+                </div>
+              </CardContent>
+            </Card>
+          </div>
+        ) : null}
+
+        <Card>
+          <CardHeader>
+            <CardTitle>Applications by Status</CardTitle>
+          </CardHeader>
+          <CardContent>
+            {analytics && analytics.applications_by_status ? (
+              <div className="space-y-3">
+                {Object.entries(analytics.applications_by_status).map(([status, count]) => (
+                  <div key={status} className="flex justify-between items-center">
+                    <span className="font-medium capitalize">{status}</span>
+                    <span className="text-2xl font-bold text-blue-600">{count}</span>
+                  </div>
+                ))}
+              </div>
+            ) : (
+              <p className="text-gray-500">No application data available</p>
+            )}
+          </CardContent>
+        </Card>
+      </div>
+    </div>
+  );
+};
+
+export default RestaurantDashboard;
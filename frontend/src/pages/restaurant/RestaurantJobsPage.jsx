@@ -0,0 +1,238 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate } from "react-router-dom";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { toast } from "sonner";
+import { MapPin, Clock, Briefcase, Plus } from "lucide-react";
+import { API } from "@/lib/auth";
+import RestaurantNav from "./RestaurantNav";
+
+// Restaurant Jobs
+const RestaurantJobsPage = () => {
+  const [jobs, setJobs] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const [showCreateForm, setShowCreateForm] = useState(false);
+  const [formData, setFormData] = useState({
+    title: "",
+    role: "waiter",
+    location_city: "",
+    shift_timing: "morning",
+    experience_required: "entry",
+    wage_min: 15000,
+    wage_max: 25000,
+    description: "",
+    requirements: [],
+    benefits: []
+  });
+  const navigate = useNavigate();
+
+  useEffect(() => {
+    fetchJobs();
+  }, []);
+
+  const fetchJobs = async () => {
+    try {
+      const response = await axios.get(`${API}/restaurants/jobs`);
+      setJobs(response.data);
+    } catch (error) {
+      toast.error("Failed to load jobs");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    try {
+      await axios.post(`${API}/jobs`, formData);
+      toast.success("Job posted successfully!");
+      setShowCreateForm(false);
+      fetchJobs();
+    } catch (error) {
+      toast.error(error.response?.data?.detail || "Failed to post job");
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <RestaurantNav />
+      
+      <div className="max-w-7xl mx-auto px-6 py-8">
+        <div className="flex justify-between items-center mb-8">
+          <h1 className="text-3xl font-bold text-gray-900">My Job Postings</h1>
+          <Button 
+            data-testid="create-job-btn"
+            onClick={() => setShowCreateForm(!showCreateForm)}
+            className="bg-blue-600 hover:bg-blue-700"
+          >
+            <Plus className="w-5 h-5 mr-2" />
+            Post New Job
+          </Button>
+        </div>
+
+        {showCreateForm && (
+          <Card className="mb-8">
+            <CardHeader>
+              <CardTitle>Create Job Posting</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <form onSubmit={handleSubmit} className="space-y-4">
+                <div className="grid md:grid-cols-2 gap-4">
+                  <div>
+                    <Label>Job Title</Label>
+                    <Input 
+                      data-testid="job-title-input"
+                      value={formData.title}
+                      onChange={(e) => setFormData({...formData, title: e.target.value})}
+                      required
+                    />
+                  </div>
+                  <div>
+                    <Label>Role</Label>
+                    <Select value={formData.role} onValueChange={(v) => setFormData({...formData, role: v})}>
+                      <SelectTrigger data-testid="job-role-select">
+                        <SelectValue />
+                      </SelectTrigger>
+                      <SelectContent>
+                        <SelectItem value="barista">Barista</SelectItem>
+                        <SelectItem value="waiter">Waiter</SelectItem>
+                        <SelectItem value="counter_staff">Counter Staff</SelectItem>
+                      </SelectContent>
+                    </Select>
+                  </div>
+                  <div>
+                    <Label>Location (City)</Label>
+                    <Input 
+                      data-testid="job-location-input"
+                      value={formData.location_city}
+                      onChange={(e) => setFormData({...formData, location_city: e.target.value})}
+                      required
+                    />
+                  </div>
+                  <div>
+                    <Label>Shift Timing</Label>
+                    <Select value={formData.shift_timing} onValueChange={(v) => setFormData({...formData, shift_timing: v})}>
+                      <SelectTrigger data-testid="job-shift-select">
+                        <SelectValue />
+                      </SelectTrigger>
+                      <SelectContent>
+                        <SelectItem value="morning">Morning</SelectItem>
+                        <SelectItem value="evening">Evening</SelectItem>
+                        <SelectItem value="night">Night</SelectItem>
+                      </SelectContent>
+                    </Select>
+                  </div>
+                  <div>
+                    <Label>Experience Required</Label>
+                    <Select value={formData.experience_required} onValueChange={(v) => setFormData({...formData, experience_required: v})}>
+                      <SelectTrigger data-testid="job-experience-select">
+                        <SelectValue />
+                      </SelectTrigger>
+                      <SelectContent>
+                        <SelectItem value="entry">Entry Level</SelectItem>
+                        <SelectItem value="1-2">1-2 Years</SelectItem>
+                        <SelectItem value="3-5">3-5 Years</SelectItem>
+                        <SelectItem value="5+">5+ Years</SelectItem>
+                      </SelectContent>
+                    </Select>
+                  </div>
+                  <div>
+                    <Label>Wage Range (₹/month)</Label>
+                    <div className="flex space-x-2">
+                      <Input 
+                        data-testid="wage-min-input"
+                        type="number"
+                        placeholder="Min"
+                        value={formData.wage_min}
+                        onChange={(e) => setFormData({...formData, wage_min: parseFloat(e.target.value)})}
+                      />
+                      <Input 
+                        data-testid="wage-max-input"
+                        type="number"
+                        placeholder="Max"
+                        value={formData.wage_max}
+                        onChange={(e) => setFormData({...formData, wage_max: parseFloat(e.target.value)})}
+                      />
+                    </div>
+                  </div>
+                </div>
+                <div>
+                  <Label>Job Description</Label>
+                  <textarea 
+                    data-testid="job-description-input"
+                    className="w-full p-2 border rounded-md min-h-[100px]"
+                    value={formData.description}
+                    onChange={(e) => setFormData({...formData, description: e.target.value})}
+                    required
+                  />
+                </div>
+                <div className="flex space-x-4">
+                  <Button 
+                    data-testid="submit-job-btn"
+                    type="submit" 
+                    className="bg-blue-600 hover:bg-blue-700"
+                  >
+                    Post Job
+                  </Button>
+                  <Button 
+                    data-testid="cancel-job-btn"
+                    type="button"
+                    variant="outline"
+                    onClick={() => setShowCreateForm(false)}
+                  >
+                    Cancel
+                  </Button>
+                </div>
+              </form>
+            </CardContent>
+          </Card>
+        )}
+
+        {loading ? (
+          <div className="text-center py-12">Loading jobs...</div>
+        ) : (
+          <div className="grid gap-6">
+            {jobs.map((job) => (
+              <Card key={job.id} data-testid={`restaurant-job-${job.id}`}>
+                <CardContent className="pt-6">
+                  <div className="flex justify-between items-start">
+                    <div className="flex-1">
+                      <h3 className="text-xl font-semibold text-gray-900 mb-2">{job.title}</h3>
+                      <div className="flex flex-wrap gap-3 mb-3 text-gray-600">
+                        <span><MapPin className="w-4 h-4 inline mr-1" />{job.location_city}</span>
+                        <span><Clock className="w-4 h-4 inline mr-1" />{job.shift_timing}</span>
+                        <span><Briefcase className="w-4 h-4 inline mr-1" />{job.role}</span>
+                      </div>
+                      <p className="text-gray-700 mb-3">{job.description}</p>
+                      <span className="text-lg font-bold text-green-600">
+                        ₹{job.wage_min.toLocaleString()} - ₹{job.wage_max.toLocaleString()}/month
+                      </span>
+                    </div>
+                    <Button 
+                      data-testid={`view-applicants-btn-${job.id}`}
+                      onClick={() => navigate(`/restaurant/applicants/${job.id}`)}
+                      className="bg-blue-600 hover:bg-blue-700"
+                    >
+                      View Applicants
+                    </Button>
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+            {jobs.length === 0 && (
+              <div className="text-center py-12 text-gray-500">
+                No jobs posted yet. Create your first job posting!
+              </div>
+            )}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default RestaurantJobsPage;
@@ -0,0 +1,178 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { toast } from "sonner";
+import { API } from "@/lib/auth";
+import RestaurantNav from "./RestaurantNav";
+
+// Restaurant Profile
+const RestaurantProfilePage = () => {
+  const [profile, setProfile] = useState(null);
+  const [isEditing, setIsEditing] = useState(false);
+  const [formData, setFormData] = useState({
+    company_name: "",
+    number_of_outlets: 1,
+    manager_name: "",
+    location_cities: [],
+    description: ""
+  });
+
+  useEffect(() => {
+    fetchProfile();
+  }, []);
+
+  const fetchProfile = async () => {
+    try {
+      const response = await axios.get(`${API}/restaurants/profile`);
+      setProfile(response.data);
+      setFormData(response.data);
+      setIsEditing(false);
+    } catch (error) {
+      if (error.response?.status === 404) {
+        setIsEditing(true);
+      }
+    }
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    try {
+      if (profile) {
+        await axios.put(`${API}/restaurants/profile`, formData);
+        toast.success("Profile updated successfully!");
+      } else {
+        await axios.post(`${API}/restaurants/profile`, formData);
+        toast.success("Profile created successfully!");
+      }
+      fetchProfile();
+    } catch (error) {
+      toast.error("Failed to save profile");
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <RestaurantNav />
+      
+      <div className="max-w-4xl mx-auto px-6 py-8">
+        <div className="flex justify-between items-center mb-8">
+          <h1 className="text-3xl font-bold text-gray-900">Restaurant Profile</h1>
+          {profile && !isEditing && (
+            <Button 
+              data-testid="edit-restaurant-profile-btn"
+              onClick={() => setIsEditing(true)}
+              variant="outline"
+            >
+              Edit Profile
+            </Button>
+          )}
+        </div>
+
+        <Card>
+          <CardContent className="pt-6">
+            {!isEditing && profile ? (
+              <div className="space-y-4">
+                <div>
+                  <Label className="text-gray-500">Company Name</Label>
+                  <p className="text-lg">{profile.company_name}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Manager Name</Label>
+                  <p className="text-lg">{profile.manager_name}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Number of Outlets</Label>
+                  <p className="text-lg">{profile.number_of_outlets}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Locations</Label>
+                  <p className="text-lg">{profile.location_cities.join(", ")}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Description</Label>
+                  <p className="text-lg">{profile.description}</p>
+                </div>
+              </div>
+            ) : (
+              <form onSubmit={handleSubmit} className="space-y-6">
+                <div>
+                  <Label>Company Name</Label>
+                  <Input 
+                    data-testid="company-name-input"
+                    value={formData.company_name}
+                    onChange={(e) => setFormData({...formData, company_name: e.target.value})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Manager Name</Label>
+                  <Input 
+                    data-testid="manager-name-input"
+                    value={formData.manager_name}
+                    onChange={(e) => setFormData({...formData, manager_name: e.target.value})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Number of Outlets</Label>
+                  <Input 
+                    data-testid="outlets-input"
+                    type="number"
+                    value={formData.number_of_outlets}
+                    onChange={(e) => setFormData({...formData, number_of_outlets: parseInt(e.target.value)})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Location Cities (comma-separated)</Label>
+                  <Input 
+                    data-testid="cities-input"
+                    value={formData.location_cities.join(", ")}
+                    onChange={(e) => setFormData({...formData, location_cities: e.target.value.split(",").map(c => c.trim())})}
+                    placeholder="Mumbai, Delhi, Bangalore"
+                  />
+                </div>
+                <div>
+                  <Label>Description</Label>
+                  <textarea 
+                    data-testid="description-input"
+                    className="w-full p-2 border rounded-md min-h-[100px]"
+                    value={formData.description}
+                    onChange={(e) => setFormData({...formData, description: e.target.value})}
+                  />
+                </div>
+                <div className="flex space-x-4">
+                  <Button 
+                    data-testid="save-restaurant-profile-btn"
+                    type="submit" 
+                    className="bg-blue-600 hover:bg-blue-700"
+                  >
+                    Save Profile
+                  </Button>
+                  {profile && (
+                    <Button 
+                      data-testid="cancel-restaurant-edit-btn"
+                      type="button"
+                      variant="outline"
+                      onClick={() => {
+                        setIsEditing(false);
+                        setFormData(profile);
+                      }}
+                    >
+                      Cancel
+                    </Button>
+                  )}
+                </div>
+              </form>
+            )}
+          </CardContent>
+        </Card>
+      </div>
+    </div>
+  );
+};
+
+export default RestaurantProfilePage;
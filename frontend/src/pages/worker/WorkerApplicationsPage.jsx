@@ -0,0 +1,95 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { Card, CardContent } from "@/components/ui/card";
+import { toast } from "sonner";
+import { MapPin, Clock } from "lucide-react";
+import { API } from "@/lib/auth";
+import WorkerNav from "./WorkerNav";
+
+// Worker Applications
+const WorkerApplicationsPage = () => {
+  const [applications, setApplications] = useState([]);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    fetchApplications();
+  }, []);
+
+  const fetchApplications = async () => {
+    try {
+      const response = await axios.get(`${API}/workers/applications`);
+      setApplications(response.data);
+    } catch (error) {
+      toast.error("Failed to load applications");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const getStatusClass = (status) => {
+    const classes = {
+      applied: "status-applied",
+      shortlisted: "status-shortlisted",
+      interview: "status-interview",
+      offered: "status-offered",
+      accepted: "status-accepted",
+      rejected: "status-rejected"
+    };
+    return classes[status] || "status-applied";
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <WorkerNav />
+      
+      <div className="max-w-7xl mx-auto px-6 py-8">
+        <h1 className="text-3xl font-bold text-gray-900 mb-8">My Applications</h1>
+
+        {loading ? (
+          <div className="text-center py-12">Loading applications...</div>
+        ) : (
+          <div className="grid gap-6">
+            {applications.map((app) => (
+              <Card key={app.id} data-testid={`application-card-${app.id}`}>
+                <CardContent className="pt-6">
+                  <div className="flex justify-between items-start">
+                    <div className="flex-1">
+                      <div className="flex items-center justify-between mb-3">
+                        <h3 className="text-xl font-semibold text-gray-900">
+                          {app.job_details?.title || "Job Title"}
+                        </h3>
+                        <span className={`status-badge ${getStatusClass(app.status)}`}>
+                          {app.status.charAt(0).toUpperCase() + app.status.slice(1)}
+                        </span>
+                      </div>
+                      <p className="text-lg text-blue-600 font-medium mb-2">
+                        {app.job_details?.restaurant_name}
+                      </p>
+                      <div className="flex flex-wrap gap-3 text-gray-600">
+                        <span className="flex items-center">
+                          <MapPin className="w-4 h-4 mr-1" />
+                          {app.job_details?.location_city}
+                        </span>
+                        <span className="flex items-center">
+                          <Clock className="w-4 h-4 mr-1" />
+                          Applied {new Date(app.applied_at).toLocaleDateString()}
+                        </span>
+                      </div>
+                    </div>
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+            {applications.length === 0 && (
+              <div className="text-center py-12 text-gray-500">
+                You haven't applied to any jobs yet.
+              </div>
+            )}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default WorkerApplicationsPage;
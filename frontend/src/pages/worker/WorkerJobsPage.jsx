@@ -0,0 +1,184 @@
+import React, { useState, useEffect } from "react";
+import { useNavigate } from "react-router-dom";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { toast } from "sonner";
+import { MapPin, Clock, Briefcase } from "lucide-react";
+import { API, useAuth } from "@/lib/auth";
+import WorkerNav from "./WorkerNav";
+
+// Worker Job Browse
+const WorkerJobsPage = () => {
+  const [jobs, setJobs] = useState([]);
+  const [filters, setFilters] = useState({
+    role: "",
+    location: "",
+    shift: "",
+    experience: ""
+  });
+  const [loading, setLoading] = useState(true);
+  const navigate = useNavigate();
+  const { user } = useAuth();
+
+  useEffect(() => {
+    fetchJobs();
+  }, [filters]);
+
+  const fetchJobs = async () => {
+    try {
+      const params = new URLSearchParams();
+      if (filters.role) params.append("role", filters.role);
+      if (filters.location) params.append("location", filters.location);
+      if (filters.shift) params.append("shift", filters.shift);
+      if (filters.experience) params.append("experience", filters.experience);
+
+      const response = await axios.get(`${API}/jobs?${params.toString()}`);
+      setJobs(response.data);
+    } catch (error) {
+      toast.error("Failed to load jobs");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const applyForJob = async (jobId) => {
+    try {
+      await axios.post(`${API}/applications/${jobId}`);
+      toast.success("Application submitted successfully!");
+      fetchJobs();
+    } catch (error) {
+      toast.error(error.response?.data?.detail || "Failed to apply");
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <WorkerNav />
+      
+      <div className="max-w-7xl mx-auto px-6 py-8">
+        <div className="mb-8">
+          <h1 className="text-3xl font-bold text-gray-900 mb-2">Find Your Next Opportunity</h1>
+          <p className="text-gray-600">Browse verified hospitality jobs across India</p>
+        </div>
+
+        {/* Filters */}
+        <Card className="mb-8">
+          <CardContent className="pt-6">
+            <div className="grid md:grid-cols-4 gap-4">
+              <div>
+                <Label>Role</Label>
+                <Select value={filters.role} onValueChange={(v) => setFilters({...filters, role: v})}>
+                  <SelectTrigger data-testid="filter-role">
+                    <SelectValue placeholder="All Roles" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="">All Roles</SelectItem>
+                    <SelectItem value="barista">Barista</SelectItem>
+                    <SelectItem value="waiter">Waiter</SelectItem>
+                    <SelectItem value="counter_staff">Counter Staff</SelectItem>
+                  </SelectContent>
+                </Select>
+              </div>
+              <div>
+                <Label>Location</Label>
+                <Input 
+                  data-testid="filter-location"
+                  placeholder="City"
+                  value={filters.location}
+                  onChange={(e) => setFilters({...filters, location: e.target.value})}
+                />
+              </div>
+              <div>
+                <Label>Shift</Label>
+                <Select value={filters.shift} onValueChange={(v) => setFilters({...filters, shift: v})}>
+                  <SelectTrigger data-testid="filter-shift">
+                    <SelectValue placeholder="All Shifts" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="">All Shifts</SelectItem>
+                    <SelectItem value="morning">Morning</SelectItem>
+                    <SelectItem value="evening">Evening</SelectItem>
+                    <SelectItem value="night">Night</SelectItem>
+                  </SelectContent>
+                </Select>
+              </div>
+              <div>
+                <Label>Experience</Label>
+                <Select value={filters.experience} onValueChange={(v) => setFilters({...filters, experience: v})}>
+                  <SelectTrigger data-testid="filter-experience">
+                    <SelectValue placeholder="All Levels" />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="">All Levels</SelectItem>
+                    <SelectItem value="entry">Entry Level</SelectItem>
+                    <SelectItem value="1-2">1-2 Years</SelectItem>
+                    <SelectItem value="3-5">3-5 Years</SelectItem>
+                    <SelectItem value="5+">5+ Years</SelectItem>
+                  </SelectContent>
+                </Select>
+              </div>
+            </div>
+          </CardContent>
+        </Card>
+
+        {/* Job List */}
+        {loading ? (
+          <div className="text-center py-12">Loading jobs...</div>
+        ) : (
+          <div className="grid gap-6">
+            {jobs.map((job) => (
+              <Card key={job.id} className="job-card hover:shadow-lg" data-testid={`job-card-${job.id}`}>
+                <CardContent className="pt-6">
+                  <div className="flex justify-between items-start">
+                    <div className="flex-1">
+                      <h3 className="text-xl font-semibold text-gray-900 mb-2">{job.title}</h3>
+                      <p className="text-lg text-blue-600 font-medium mb-3">{job.restaurant_name}</p>
+                      <div className="flex flex-wrap gap-3 mb-4">
+                        <span className="flex items-center text-gray-600">
+                          <MapPin className="w-4 h-4 mr-1" />
+                          {job.location_city}
+                        </span>
+                        <span className="flex items-center text-gray-600">
+                          <Clock className="w-4 h-4 mr-1" />
+                          {job.shift_timing.charAt(0).toUpperCase() + job.shift_timing.slice(1)} Shift
+                        </span>
+                        <span className="flex items-center text-gray-600">
+                          <Briefcase className="w-4 h-4 mr-1" />
+                          {job.role.replace('_', ' ').charAt(0).toUpperCase() + job.role.slice(1)}
+                        </span>
+                      </div>
+                      <p className="text-gray-700 mb-4">{job.description}</p>
+                      <div className="flex items-center space-x-4">
+                        <span className="text-lg font-bold text-green-600">
+                          ₹{job.wage_min.toLocaleString()} - ₹{job.wage_max.toLocaleString()}/month
+                        </span>
+                      </div>
+                    </div>
+                    <Button 
+                      data-testid={`apply-btn-${job.id}`}
+                      onClick={() => applyForJob(job.id)}
+                      className="bg-blue-600 hover:bg-blue-700"
+                    >
+                      Apply Now
+                    </Button>
+                  </div>
+                </CardContent>
+              </Card>
+            ))}
+            {jobs.length === 0 && (
+              <div className="text-center py-12 text-gray-500">
+                No jobs found. Try adjusting your filters.
+              </div>
+            )}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+};
+
+export default WorkerJobsPage;
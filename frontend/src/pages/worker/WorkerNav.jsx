@@ -0,0 +1,59 @@
+import React from "react";
+import { useNavigate } from "react-router-dom";
+import { Button } from "@/components/ui/button";
+import { Briefcase } from "lucide-react";
+import { useAuth } from "@/lib/auth";
+
+// Worker Navigation
+const WorkerNav = () => {
+  const navigate = useNavigate();
+  const { logout } = useAuth();
+
+  return (
+    <nav className="bg-white shadow-sm border-b">
+      <div className="max-w-7xl mx-auto px-6 py-4">
+        <div className="flex justify-between items-center">
+          <div className="flex items-center space-x-2">
+            <Briefcase className="w-6 h-6 text-blue-600" />
+            <span className="text-xl font-bold text-gray-900">HospitalityHub</span>
+          </div>
+          <div className="flex items-center space-x-6">
+            <button 
+              data-testid="nav-jobs"
+              onClick={() => navigate("/worker/jobs")}
+              className="text-gray-700 hover:text-blue-600 font-medium"
+            >
+              Jobs
+            </button>
+            <button 
+              data-testid="nav-applications"
+              onClick={() => navigate("/worker/applications")}
+              className="text-gray-700 hover:text-blue-600 font-medium"
+            >
+              My Applications
+            </button>
+            <button 
+              data-testid="nav-profile"
+              onClick={() => navigate("/worker/profile")}
+              className="text-gray-700 hover:text-blue-600 font-medium"
+            >
+              Profile
+            </button>
+            <Button 
+              data-testid="logout-btn"
+              onClick={() => {
+                logout();
+                navigate("/");
+              }}
+              variant="outline"
+            >
+              Logout
+            </Button>
+          </div>
+        </div>
+      </div>
+    </nav>
+  );
+};
+
+export default WorkerNav;
@@ -0,0 +1,224 @@
+import React, { useState, useEffect } from "react";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { Checkbox } from "@/components/ui/checkbox";
+import { toast } from "sonner";
+import { API } from "@/lib/auth";
+import WorkerNav from "./WorkerNav";
+
+// Worker Profile
+const WorkerProfilePage = () => {
+  const [profile, setProfile] = useState(null);
+  const [isEditing, setIsEditing] = useState(false);
+  const [formData, setFormData] = useState({
+    location_city: "",
+    experience_years: 0,
+    preferred_roles: [],
+    preferred_shifts: [],
+    languages: [],
+    availability: "immediate",
+    skills: []
+  });
+
+  useEffect(() => {
+    fetchProfile();
+  }, []);
+
+  const fetchProfile = async () => {
+    try {
+      const response = await axios.get(`${API}/workers/profile`);
+      setProfile(response.data);
+      setFormData(response.data);
+      setIsEditing(false);
+    } catch (error) {
+      if (error.response?.status === 404) {
+        setIsEditing(true);
+      }
+    }
+  };
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    try {
+      if (profile) {
+        await axios.put(`${API}/workers/profile`, formData);
+        toast.success("Profile updated successfully!");
+      } else {
+        await axios.post(`${API}/workers/profile`, formData);
+        toast.success("Profile created successfully!");
+      }
+      fetchProfile();
+    } catch (error) {
+      toast.error("Failed to save profile");
+    }
+  };
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <WorkerNav />
+      
+      <div className="max-w-4xl mx-auto px-6 py-8">
+        <div className="flex justify-between items-center mb-8">
+          <h1 className="text-3xl font-bold text-gray-900">My Profile</h1>
+          {profile && !isEditing && (
+            <Button 
+              data-testid="edit-profile-btn"
+              onClick={() => setIsEditing(true)}
+              variant="outline"
+            >
+              Edit Profile
+            </Button>
+          )}
+        </div>
+
+        <Card>
+          <CardContent className="pt-6">
+            {!isEditing && profile ? (
+              <div className="space-y-4">
+                <div>
+                  <Label className="text-gray-500">Location</Label>
+                  <p className="text-lg">{profile.location_city}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Experience</Label>
+                  <p className="text-lg">{profile.experience_years} years</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Preferred Roles</Label>
+                  <p className="text-lg">{profile.preferred_roles.join(", ")}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Preferred Shifts</Label>
+                  <p className="text-lg">{profile.preferred_shifts.join(", ")}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Languages</Label>
+                  <p className="text-lg">{profile.languages.join(", ")}</p>
+                </div>
+                <div>
+                  <Label className="text-gray-500">Availability</Label>
+                  <p className="text-lg">{profile.availability}</p>
+                </div>
+              </div>
+            ) : (
+              <form onSubmit={handleSubmit} className="space-y-6">
+                <div>
+                  <Label>Location (City)</Label>
+                  <Input 
+                    data-testid="location-input"
+                    value={formData.location_city}
+                    onChange={(e) => setFormData({...formData, location_city: e.target.value})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Experience (Years)</Label>
+                  <Input 
+                    data-testid="experience-input"
+                    type="number"
+                    value={formData.experience_years}
+                    onChange={(e) => setFormData({...formData, experience_years: parseInt(e.target.value)})}
+                    required
+                  />
+                </div>
+                <div>
+                  <Label>Preferred Roles</Label>
+                  <div className="space-y-2">
+                    {["barista", "waiter", "counter_staff"].map(role => (
+                      <div key={role} className="flex items-center">
+                        <Checkbox 
+                          data-testid={`role-${role}`}
+                          checked={formData.preferred_roles.includes(role)}
+                          onCheckedChange={(checked) => {
+                            const roles = checked 
+                              ? [...formData.preferred_roles, role]
+                              : formData.preferred_roles.filter(r => r !== role);
+                            setFormData({...formData, preferred_roles: roles});
+                          }}
+                        />
+                        <label className="ml-2">{role.replace('_', ' ').toUpperCase()}</label>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+                <div>
+                  <Label>Preferred Shifts</Label>
+                  <div className="space-y-2">
+                    {["morning", "evening", "night"].map(shift => (
+                      <div key={shift} className="flex items-center">
+                        <Checkbox 
+                          data-testid={`shift-${shift}`}
+                          checked={formData.preferred_shifts.includes(shift)}
+                          onCheckedChange={(checked) => {
+                            const shifts = checked 
+                              ? [...formData.preferred_shifts, shift]
+                              : formData.preferred_shifts.filter(s => s !== shift);
+                            setFormData({...formData, preferred_shifts: shifts});
+                          }}
+                        />
+                        <label className="ml-2">{shift.toUpperCase()}</label>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+                <div>
+                  <Label>Languages (comma-separated)</Label>
+                  <Input 
+                    data-testid="languages-input"
+                    value={formData.languages.join(", ")}
+                    onChange={(e) => setFormData({...formData, languages: e.target.value.split(",").map(l => l.trim())})}
+                    placeholder="Hindi, English"
+                  />
+                </div>
+                <div>
+                  <Label>Availability</Label>
+                  <Select 
+                    value={formData.availability}
+                    onValueChange={(v) => setFormData({...formData, availability: v})}
+                  >
+                    <SelectTrigger data-testid="availability-select">
+                      <SelectValue />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="immediate">Immediate</SelectItem>
+                      <SelectItem value="within_week">Within a Week</SelectItem>
+                      <SelectItem value="within_month">Within a Month</SelectItem>
+                    </SelectContent>
+                  </Select>
+                </div>
+                <div className="flex space-x-4">
+                  <Button 
+                    data-testid="save-profile-btn"
+                    type="submit" 
+                    className="bg-blue-600 hover:bg-blue-700"
+                  >
+                    Save Profile
+                  </Button>
+                  {profile && (
+                    <Button 
+                      data-testid="cancel-edit-btn"
+                      type="button"
+                      variant="outline"
+                      onClick={() => {
+                        setIsEditing(false);
+                        setFormData(profile);
+                      }}
+                    >
+                      Cancel
+                    </Button>
+                  )}
+                </div>
+              </form>
+            )}
+          </CardContent>
+        </Card>
+      </div>
+    </div>
+  );
+};
+
+export default WorkerProfilePage;